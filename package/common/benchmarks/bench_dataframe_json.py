@@ -0,0 +1,77 @@
+# DataFrame JSON 编码的峰值内存与耗时对比: JsonEncoder (default 中 to_dict) 与 JsonBackend.iterencode 分块输出
+# 峰值内存由 tracemalloc 统计, 不含 DataFrame 本身, 输出写入只计数的 sink
+import argparse
+import json
+import time
+import tracemalloc
+
+import numpy as np
+from pandas import DataFrame, date_range
+
+from common.data.encoder import JsonEncoder, get_json_backend
+
+
+class CountingSink:
+    def __init__(self) -> None:
+        self.size = 0
+
+    def write(self, text: str) -> None:
+        self.size += len(text)
+
+
+def make_frame(rows: int) -> DataFrame:
+    return DataFrame(
+        {
+            'id': np.arange(rows, dtype='int64'),
+            'value': np.random.rand(rows),
+            'flag': np.random.rand(rows) > 0.5,
+            'time': date_range('2024-01-01', periods=rows, freq='s'),
+        }
+    )
+
+
+def measure(func):
+    sink = CountingSink()
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(sink)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, sink.size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--orient', default='dict')
+    args = parser.parse_args()
+
+    frame = make_frame(args.rows)
+    print(f'rows={args.rows}, orient={args.orient}, frame={frame.memory_usage(deep=True).sum() / 2**20:.1f} MiB')
+
+    cases = {}
+    if args.orient == 'dict':
+        cases['JsonEncoder'] = lambda sink: json.dump(frame, sink, cls=JsonEncoder)
+    else:
+        cases['JsonEncoder'] = lambda sink: json.dump(frame.to_dict(orient=args.orient), sink, cls=JsonEncoder)
+    for name in ('json', 'orjson'):
+        try:
+            backend = get_json_backend(name)
+        except ImportError:
+            continue
+
+        def stream(sink, backend=backend):
+            for chunk in backend.iterencode(frame, args.orient, args.chunk_size):
+                sink.write(chunk)
+
+        cases[f'iterencode[{name}]'] = stream
+
+    for name, func in cases.items():
+        elapsed, peak, size = measure(func)
+        print(f'{name:20}: {elapsed:6.2f}s, peak {peak / 2**20:8.1f} MiB, output {size / 2**20:6.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
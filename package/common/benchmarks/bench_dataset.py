@@ -0,0 +1,43 @@
+# 合成数据集生成速度: 按 worker 数量统计 DatasetGenerator 生成 DataFrame 块与记录的行数/秒
+import argparse
+import os
+import time
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from common.data.dataset import DatasetGenerator
+
+
+class Event(BaseModel):
+    user_id: int = Field(ge=1, le=10**6)
+    name: str = Field(max_length=16)
+    value: float
+    success: bool
+    created_at: datetime
+
+
+def rate(func, count: int) -> float:
+    start = time.perf_counter()
+    for _ in func():
+        pass
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=1000000)
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    generator = DatasetGenerator(Event, seed=1, chunk_size=args.chunk_size)
+    print(f'count={args.count}, chunk_size={args.chunk_size}')
+    for workers in sorted({1, args.workers}):
+        frames = rate(lambda: generator.frames(args.count, workers), args.count)
+        batches = rate(lambda: generator.batches(args.count, workers), args.count)
+        print(f'workers={workers:2}: frames {frames:10.0f} rows/s, batches {batches:10.0f} rows/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+# 日期时间解析与格式化性能对比: datetime.strptime/strftime 与 DatetimeCodec
+# 覆盖默认格式、ISO-8601 (含微秒与时区)、日期、日/月/年与紧凑格式
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from common.data.converter import DatetimeCodec
+
+FORMATS = (
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d',
+    '%Y-%m-%dT%H:%M:%S.%f%z',
+    '%d/%m/%Y %H:%M:%S',
+    '%Y%m%d%H%M%S',
+)
+
+
+def make_datetimes(count: int):
+    start = datetime(2020, 1, 1, tzinfo=timezone(timedelta(hours=8)))
+    return [start + timedelta(seconds=random.randint(0, 10**8), microseconds=random.randint(0, 999999)) for _ in range(count)]
+
+
+def rate(func, values) -> float:
+    start = time.perf_counter()
+    for value in values:
+        func(value)
+    return len(values) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=200000)
+    args = parser.parse_args()
+
+    values = make_datetimes(args.count)
+    print(f'count={args.count}')
+    for fmt in FORMATS:
+        strings = [x.strftime(fmt) for x in values]
+        assert [DatetimeCodec.parse(x, fmt) for x in strings[:1000]] == [datetime.strptime(x, fmt) for x in strings[:1000]]
+        parse_old = rate(lambda x: datetime.strptime(x, fmt), strings)
+        parse_new = rate(lambda x: DatetimeCodec.parse(x, fmt), strings)
+        format_old = rate(lambda x: x.strftime(fmt), values)
+        format_new = rate(lambda x: DatetimeCodec.format(x, fmt), values)
+        print(
+            f'{fmt:24}: parse {parse_old:9.0f} -> {parse_new:9.0f} /s ({parse_new / parse_old:4.1f}x), '
+            f'format {format_old:9.0f} -> {format_new:9.0f} /s ({format_new / format_old:4.1f}x)'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# DataBase 引擎配置性能对比 (SQLite 文件库)
+# legacy: 原有的 create_engine(url, echo=True); unpooled: 每次会话新建连接; tuned: 按 DB 配置创建 (关闭 echo, 连接池)
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+
+from sqlalchemy import Column, Integer, String, create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from common.db.base import Base, DataBase
+
+
+class BenchItem(Base):
+    __tablename__ = 'bench_item'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(32))
+
+
+def prepare(url: str, rows: int):
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn, tables=[BenchItem.__table__])
+        conn.execute(insert(BenchItem), [{'name': f'item-{i}'} for i in range(rows)])
+    engine.dispose()
+
+
+def run(session_factory, sessions: int, rows: int) -> float:
+    """每个会话执行一次主键查询与一次范围查询"""
+    start = time.perf_counter()
+    for i in range(sessions):
+        with session_factory() as session:
+            session.get(BenchItem, i % rows + 1)
+            session.scalars(select(BenchItem).where(BenchItem.id > i % rows).limit(10)).all()
+    return sessions / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sessions', type=int, default=5000)
+    parser.add_argument('--rows', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f'sqlite:///{os.path.join(tmp, "bench.db")}'
+        prepare(url, args.rows)
+
+        # echo 日志写入 os.devnull, 只计入日志格式化与输出的开销
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            legacy = create_engine(url, echo=True)
+            legacy_rate = run(sessionmaker(legacy, autoflush=False), args.sessions, args.rows)
+            legacy.dispose()
+
+        unpooled = create_engine(url, poolclass=NullPool)
+        unpooled_rate = run(sessionmaker(unpooled, autoflush=False), args.sessions, args.rows)
+        unpooled.dispose()
+
+        db = DataBase.from_settings({'url': url, 'pool_size': 5})
+        tuned_rate = run(db.session, args.sessions, args.rows)
+        db.dispose()
+
+    print(f'sessions={args.sessions} rows={args.rows}')
+    print(f'legacy (echo)  : {legacy_rate:10.0f} sessions/s')
+    print(f'unpooled       : {unpooled_rate:10.0f} sessions/s')
+    print(f'tuned          : {tuned_rate:10.0f} sessions/s ({tuned_rate / legacy_rate:.1f}x legacy)')
+
+
+if __name__ == '__main__':
+    main()
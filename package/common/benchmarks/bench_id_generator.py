@@ -0,0 +1,76 @@
+# 主键生成性能对比: 原有的 uuid5 字符串主键与 UUIDv7 BINARY(16) 主键
+# 生成速度 (ids/s), 插入局部性 (新主键大于已有最大主键的比例), 以及 SQLite 文件库的插入速度与主键索引页数
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+from common.data.generator import SortableIdGenerator, UuidGenerator
+
+
+def legacy_id() -> str:
+    return f'{UuidGenerator.by_value(datetime.now().isoformat(), True)}'
+
+
+def sortable_id() -> bytes:
+    return SORTABLE.next_bytes()
+
+
+SORTABLE = SortableIdGenerator()
+
+
+def generate_rate(func, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return count / (time.perf_counter() - start)
+
+
+def append_ratio(ids) -> float:
+    """新主键追加在索引末尾的比例"""
+    appends, current = 0, ids[0]
+    for value in ids[1:]:
+        if value > current:
+            appends += 1
+            current = value
+    return appends / (len(ids) - 1)
+
+
+def insert_rate(path: str, column_type: str, ids, batch: int):
+    conn = sqlite3.connect(path)
+    conn.execute(f'CREATE TABLE item (id {column_type} PRIMARY KEY, name TEXT) WITHOUT ROWID')
+    start = time.perf_counter()
+    for i in range(0, len(ids), batch):
+        conn.executemany('INSERT INTO item VALUES (?, ?)', [(x, 'name') for x in ids[i:i + batch]])
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    pages = conn.execute('PRAGMA page_count').fetchone()[0]
+    conn.close()
+    return len(ids) / elapsed, pages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=200000)
+    parser.add_argument('--batch', type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f'count={args.count}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, func, column_type in (
+            ('uuid5 str    ', legacy_id, 'VARCHAR(64)'),
+            ('uuidv7 binary', sortable_id, 'BINARY(16)'),
+        ):
+            rate = generate_rate(func, args.count)
+            ids = [func() for _ in range(args.count)]
+            rows_rate, pages = insert_rate(os.path.join(tmp, f'{column_type[:6]}.db'), column_type, ids, args.batch)
+            print(
+                f'{name}: {rate:10.0f} ids/s, append {append_ratio(ids):6.1%}, '
+                f'insert {rows_rate:8.0f} rows/s, {pages} pages'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# JSON 编码性能对比: 原有的 isinstance 链 JsonEncoder、查表的 JsonEncoder 与 orjson 后端
+# 负载为接口返回的记录列表 (UUID、datetime、Decimal、numpy 标量与字符串混合) 与 DataFrame.to_dict(orient='records')
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import numpy as np
+from numpy import int64, issubdtype, number
+from pandas import DataFrame
+
+from common.data.encoder import JsonEncoder, get_json_backend
+
+
+class LegacyJsonEncoder(json.JSONEncoder):
+    def default(self, o):
+        if isinstance(o, datetime):
+            result = str(o)
+        elif isinstance(o, Decimal):
+            result = float(o)
+        elif isinstance(o, type(uuid4())):
+            result = str(o)
+        elif isinstance(o, DataFrame):
+            result = o.to_dict()
+        elif isinstance(o, bytes):
+            result = o.decode(encoding='utf-8')
+        elif issubdtype(type(o), number):
+            return float(o) if issubdtype(type(o), int64) else int(o)
+        else:
+            result = str(o)
+        return result
+
+
+def make_records(count: int):
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            'id': uuid4(),
+            'name': f'user-{i}',
+            'created_at': start + timedelta(seconds=i),
+            'amount': Decimal(f'{random.randint(0, 10**6)}.{random.randint(0, 99):02d}'),
+            'count': np.int64(random.randint(0, 1000)),
+            'score': np.float64(random.random()),
+            'tags': ['a', 'b', 'c'],
+            'active': bool(i % 2),
+        }
+        for i in range(count)
+    ]
+
+
+def make_frame_records(count: int):
+    frame = DataFrame(
+        {
+            'id': np.arange(count, dtype='int32'),
+            'value': np.random.rand(count),
+            'time': [datetime(2024, 1, 1) + timedelta(minutes=i) for i in range(count)],
+        }
+    )
+    return frame.to_dict(orient='records')
+
+
+def rate(func, data, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(data)
+    return repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    encoders = {
+        'legacy': lambda x: json.dumps(x, cls=LegacyJsonEncoder),
+        'dispatch': lambda x: json.dumps(x, cls=JsonEncoder),
+    }
+    try:
+        orjson_backend = get_json_backend('orjson')
+        encoders['orjson'] = orjson_backend.dumpb
+    except ImportError:
+        print('orjson not installed, skipped')
+
+    print(f'count={args.count}')
+    for name, data in (('records', make_records(args.count)), ('frame records', make_frame_records(args.count))):
+        expected = json.loads(encoders['legacy'](data))
+        rates = {}
+        for encoder_name, func in encoders.items():
+            assert json.loads(func(data)) == expected
+            rates[encoder_name] = rate(func, data, args.repeat)
+        for encoder_name, value in rates.items():
+            print(f'{name:14} {encoder_name:9}: {value * args.count:10.0f} rows/s ({value / rates["legacy"]:4.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+# Py4J 游标拉取性能对比: 逐单元格取值与批量 fetchBatch
+# 使用本地替身网关, 每次网关调用以忙等模拟一次 socket 往返
+import argparse
+import time
+
+from common.db import py4j_dbapi
+from common.db.py4j_codec import BatchCodec
+
+
+def spin(latency: float):
+    end = time.perf_counter() + latency
+    while time.perf_counter() < end:
+        pass
+
+
+class StandInField:
+    def __init__(self, name: str, value: int):
+        self.name = name
+        self.value = value
+
+    def getName(self):
+        return self.name
+
+    def getInt(self, obj):
+        return self.value
+
+
+class StandInGateway:
+    TYPES = {'BIGINT': -5, 'VARCHAR': 12}
+
+    def __init__(self, rows, tags, latency: float):
+        self.rows = rows
+        self.tags = tags
+        self.latency = latency
+        self.jvm = self
+        self.Class = self
+        self.java = self
+        self.sql = self
+        self.lang = self
+        self.DriverManager = self
+        self.entry_point = self
+
+    def __getattr__(self, name):
+        # java.lang.Integer 等类引用
+        return name
+
+    def forName(self, name):
+        spin(self.latency)
+        return self
+
+    def getFields(self):
+        return [StandInField(k, v) for k, v in self.TYPES.items()]
+
+    def getConnection(self, url, username, password):
+        spin(self.latency)
+        return self
+
+    def setAutoCommit(self, value):
+        spin(self.latency)
+
+    def prepareStatement(self, sql):
+        spin(self.latency)
+        return self
+
+    def execute(self):
+        spin(self.latency)
+        self.index = -1
+        return True
+
+    def getResultSet(self):
+        spin(self.latency)
+        return self
+
+    def getMetaData(self):
+        spin(self.latency)
+        return self
+
+    def getColumnCount(self):
+        spin(self.latency)
+        return len(self.tags)
+
+    def getColumnName(self, i):
+        spin(self.latency)
+        return f'c{i}'
+
+    def getColumnTypeName(self, i):
+        spin(self.latency)
+        return 'BIGINT' if self.tags[i - 1] == 'q' else 'VARCHAR'
+
+    def getColumnType(self, i):
+        spin(self.latency)
+        return self.TYPES[self.getColumnTypeName(i)]
+
+    def getColumnDisplaySize(self, i):
+        spin(self.latency)
+        return 20
+
+    def getPrecision(self, i):
+        spin(self.latency)
+        return 0
+
+    def getScale(self, i):
+        spin(self.latency)
+        return 0
+
+    def isNullable(self, i):
+        spin(self.latency)
+        return 1
+
+    def next(self):
+        spin(self.latency)
+        self.index += 1
+        return self.index < len(self.rows)
+
+    def getObject(self, i):
+        spin(self.latency)
+        return self.rows[self.index][i - 1]
+
+    def getString(self, i):
+        spin(self.latency)
+        return str(self.rows[self.index][i - 1])
+
+    def fetchBatch(self, rs, size):
+        spin(self.latency)
+        start = self.index + 1
+        batch = self.rows[start:start + size]
+        self.index = start + len(batch) - 1
+        return BatchCodec.encode_rows(self.tags, batch)
+
+    def close(self):
+        pass
+
+
+def run(rows, tags, latency: float, **kwargs) -> float:
+    gateway = StandInGateway(rows, tags, latency)
+    cursor = py4j_dbapi.connect(gateway, 'mysql', 'localhost', 3306, 'root', '', 'bench', **kwargs).cursor()
+    cursor.execute('SELECT * FROM bench')
+    start = time.perf_counter()
+    result = cursor.fetchall()
+    elapsed = time.perf_counter() - start
+    assert len(result) == len(rows)
+    return len(rows) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--cols', type=int, default=20)
+    parser.add_argument('--latency-us', type=float, default=20.0)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    tags = ['q' if i % 2 else 's' for i in range(args.cols)]
+    rows = [tuple(r if t == 'q' else f'value-{r}' for t in tags) for r in range(args.rows)]
+    latency = args.latency_us / 1e6
+
+    by_cell = run(rows, tags, latency)
+    bulk = run(rows, tags, latency, bulk_fetch=True, fetch_batch_size=args.batch_size)
+    print(f'rows={args.rows} cols={args.cols} latency={args.latency_us}us')
+    print(f'by cell   : {by_cell:12.0f} rows/s')
+    print(f'fetchBatch: {bulk:12.0f} rows/s ({bulk / by_cell:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
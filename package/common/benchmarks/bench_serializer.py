@@ -0,0 +1,60 @@
+# 模型序列化性能对比: 逐行 as_dict 与预编译的 ModelSerializer
+import argparse
+import time
+from datetime import datetime
+
+from sqlalchemy import Column, Float, Integer, String
+
+from common.db.models import BaseModel, TimeAtMixin
+
+
+class BenchRecord(TimeAtMixin, BaseModel):
+    __tablename__ = 'bench_serializer_record'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(32))
+    score = Column(Float)
+    level = Column(Integer)
+
+
+def legacy_as_dict(obj):
+    """原有实现: 每行遍历 __table__.columns"""
+    return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+
+
+def measure(func, rows) -> float:
+    start = time.perf_counter()
+    func(rows)
+    return len(rows) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    now = datetime.now()
+    rows = [
+        BenchRecord(id=i, name=f'name-{i}', score=i * 0.5, level=i % 10, created_at=now, updated_at=now)
+        for i in range(args.rows)
+    ]
+    serializer = BenchRecord.serializer()
+    partial = BenchRecord.serializer(['id', 'name'])
+
+    cases = [
+        ('as_dict loop (legacy)', lambda x: [legacy_as_dict(r) for r in x]),
+        ('to_dicts', serializer.to_dicts),
+        ('to_tuples', serializer.to_tuples),
+        ('to_columns', serializer.to_columns),
+        ('to_dicts (2 columns)', partial.to_dicts),
+    ]
+    print(f'rows={args.rows}')
+    baseline = None
+    for name, func in cases:
+        rate = measure(func, rows)
+        baseline = baseline or rate
+        print(f'{name:22}: {rate:12.0f} rows/s ({rate / baseline:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
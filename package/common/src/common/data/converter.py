@@ -5,16 +5,199 @@ __all__ = [
     'StringConverter',
     'ListConverter',
     'DatetimeConverter',
+    'DatetimeCodec',
 ]
 
-from datetime import datetime
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Any, Callable
 
-from pandas import DataFrame
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+from pandas.api.types import (
+    infer_dtype,
+    is_bool_dtype,
+    is_datetime64_any_dtype,
+    is_float_dtype,
+    is_integer_dtype,
+    is_unsigned_integer_dtype,
+)
+
+
+DEFAULT_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 可直接使用 datetime.fromisoformat 解析的格式 -> (长度, 分隔符的位置, 分隔符)
+ISO_FORMATS = {
+    '%Y-%m-%d %H:%M:%S': (19, (4, 7, 10, 13, 16), ('-', '-', ' ', ':', ':')),
+    '%Y-%m-%dT%H:%M:%S': (19, (4, 7, 10, 13, 16), ('-', '-', 'T', ':', ':')),
+    '%Y-%m-%d': (10, (4, 7), ('-', '-')),
+}
+
+# 编译解析的指令 -> (正则, datetime 参数名), 正则与 strptime 相同
+_PARSE_DIRECTIVES = {
+    '%Y': (r'\d\d\d\d', 'year'),
+    '%m': (r'1[0-2]|0[1-9]|[1-9]', 'month'),
+    '%d': (r'3[01]|[12]\d|0[1-9]|[1-9]| [1-9]', 'day'),
+    '%H': (r'2[0-3]|[0-1]\d|\d', 'hour'),
+    '%M': (r'[0-5]\d|\d', 'minute'),
+    '%S': (r'6[0-1]|[0-5]\d|\d', 'second'),
+    '%f': (r'[0-9]{1,6}', 'microsecond'),
+    '%z': (r'[+-]\d\d:?[0-5]\d(?::?[0-5]\d(?:\.\d{1,6})?)?|(?-i:Z)', 'tzinfo'),
+    '%%': ('%', None),
+}
+# 编译格式化的指令 -> (% 格式, datetime 属性名), %Y 与 glibc 的 strftime 一致不补零
+_FORMAT_DIRECTIVES = {
+    '%Y': ('%d', 'year'),
+    '%m': ('%02d', 'month'),
+    '%d': ('%02d', 'day'),
+    '%H': ('%02d', 'hour'),
+    '%M': ('%02d', 'minute'),
+    '%S': ('%02d', 'second'),
+    '%f': ('%06d', 'microsecond'),
+    '%%': ('%%', None),
+}
+_FORMAT_TOKEN = re.compile(r'%.|[^%]+|%')
 
 
 class ConvertException(Exception): ...
 
 
+class DatetimeCodec:
+    # 日期时间的解析与格式化, 按格式编译一次并缓存
+    # ISO 格式优先使用 datetime.fromisoformat, 仅含数字字段的格式使用预编译的正则与 % 模板, 其余格式回退到 strptime/strftime
+
+    @staticmethod
+    def parse(data: str, fmt: str = DEFAULT_DATETIME_FORMAT) -> datetime:
+        return _compile_parser(fmt)(data)
+
+    @staticmethod
+    def format(data: datetime, fmt: str = DEFAULT_DATETIME_FORMAT) -> str:
+        return _compile_formatter(fmt)(data)
+
+
+@lru_cache(maxsize=256)
+def _compile_parser(fmt: str) -> Callable[[str], datetime]:
+    tokens = _FORMAT_TOKEN.findall(fmt)
+    if any(x.startswith('%') and x not in _PARSE_DIRECTIVES for x in tokens):
+        return lambda data: datetime.strptime(data, fmt)
+
+    # 与 strptime 一致: 忽略大小写, 格式中的空白匹配任意个空白
+    pattern, fields = [], []
+    for token in tokens:
+        if token in _PARSE_DIRECTIVES:
+            regex, field = _PARSE_DIRECTIVES[token]
+            pattern.append(f'({regex})' if field else regex)
+            if field:
+                fields.append(field)
+        else:
+            pattern.append(r'\s+'.join(re.escape(x) for x in re.split(r'\s+', token)))
+    regex = re.compile(''.join(pattern), re.IGNORECASE)
+
+    def parse(data: str) -> datetime:
+        match = regex.fullmatch(data)
+        if match is None:
+            raise ValueError(f'time data {data!r} does not match format {fmt!r}')
+        values = {'year': 1900, 'month': 1, 'day': 1}
+        for field, value in zip(fields, match.groups()):
+            if field == 'microsecond':
+                values[field] = int(value.ljust(6, '0'))
+            elif field == 'tzinfo':
+                values[field] = _parse_offset(value)
+            else:
+                values[field] = int(value)
+        return datetime(**values)
+
+    if fmt not in ISO_FORMATS:
+        return parse
+
+    length, positions, separators = ISO_FORMATS[fmt]
+    get_separators = itemgetter(*positions)
+
+    def parse_iso(data: str) -> datetime:
+        # 长度与分隔符一致时 fromisoformat 的结果与 strptime 相同
+        if len(data) == length and get_separators(data) == separators:
+            try:
+                return datetime.fromisoformat(data)
+            except ValueError:
+                pass
+        return parse(data)
+
+    return parse_iso
+
+
+def _parse_offset(value: str) -> timezone:
+    if value == 'Z':
+        return timezone.utc
+    digits = value[1:].replace(':', '')
+    offset = timedelta(hours=int(digits[:2]), minutes=int(digits[2:4]), seconds=float(digits[4:] or 0))
+    return timezone(-offset if value[0] == '-' else offset)
+
+
+@lru_cache(maxsize=256)
+def _compile_formatter(fmt: str) -> Callable[[datetime], str]:
+    tokens = _FORMAT_TOKEN.findall(fmt)
+    if len(tokens) > 1 and tokens[-1] == '%z':
+        # 以时区偏移结尾的格式 (ISO-8601)
+        return _compile_offset_formatter(fmt)
+    if any(x.startswith('%') and x not in _FORMAT_DIRECTIVES for x in tokens):
+        return lambda data: data.strftime(fmt)
+
+    template, fields = [], []
+    for token in tokens:
+        if token in _FORMAT_DIRECTIVES:
+            spec, field = _FORMAT_DIRECTIVES[token]
+            template.append(spec)
+            if field:
+                fields.append(field)
+        else:
+            template.append(token)
+    if not fields:
+        return lambda data: data.strftime(fmt)
+    template = ''.join(template)
+    # 多个属性时 attrgetter 返回元组, 单个属性时补一个字段使其同样返回元组, 补充的字段不输出
+    if len(fields) == 1:
+        fields.append(fields[0])
+        template += '%.0s'
+    getter = attrgetter(*fields)
+
+    def format_(data: datetime) -> str:
+        if not isinstance(data, datetime):
+            # date 等类型缺少时间字段
+            return data.strftime(fmt)
+        return template % getter(data)
+
+    return format_
+
+
+def _compile_offset_formatter(fmt: str) -> Callable[[datetime], str]:
+    format_ = _compile_formatter(fmt[:-2])
+
+    def format_with_offset(data: datetime) -> str:
+        if not isinstance(data, datetime):
+            return data.strftime(fmt)
+        offset = data.utcoffset()
+        if offset is None:
+            return format_(data)
+        return format_(data) + _format_offset(offset)
+
+    return format_with_offset
+
+
+@lru_cache(maxsize=256)
+def _format_offset(offset: timedelta) -> str:
+    # 与 strftime 的 %z 一致: +HHMM, 有秒或微秒时追加
+    sign = '-' if offset < timedelta(0) else '+'
+    minutes, seconds = divmod(abs(offset), timedelta(minutes=1))
+    hours, minutes = divmod(minutes, 60)
+    text = f'{sign}{hours:02d}{minutes:02d}'
+    if seconds:
+        text += f'{seconds.seconds:02d}' + (f'.{seconds.microseconds:06d}' if seconds.microseconds else '')
+    return text
+
+
 def convert_exception(func):
     def wrapper(data, **kwargs):
         try:
@@ -27,21 +210,110 @@ def convert_exception(func):
     return wrapper
 
 
+def batch_convert_exception(func):
+    # 批量转换, 逐元素的失败由 _fill_failed 按掩码处理, 其余异常转为 ConvertException
+    def wrapper(data, **kwargs):
+        try:
+            return func(data, **kwargs)
+        except ConvertException:
+            raise
+        except Exception as e:
+            raise ConvertException(e) from e
+
+    return wrapper
+
+
+def _to_series(data: Any) -> Series:
+    # list / tuple / numpy 数组 / Series 转为 Series, Series 原样返回
+    if isinstance(data, Series):
+        return data
+    return Series(data if isinstance(data, np.ndarray) else list(data))
+
+
+def _fill_failed(result: Series, failed: Series, source: Series, kwargs: dict) -> Series:
+    # 转换失败的元素: 指定了 default 时替换为 default (None 时为缺失值), 否则抛出 ConvertException
+    if not failed.any():
+        return result
+    if 'default' not in kwargs:
+        raise ConvertException(f'{int(failed.sum())} values could not be converted, first: {source[failed].iloc[0]!r}')
+    return result.mask(failed, kwargs['default'])
+
+
 class ToIntConvertMixin:
     @convert_exception
     @staticmethod
     def to_int(data, **kwargs) -> int:
         return int(data)
 
+    @batch_convert_exception
+    @staticmethod
+    def to_ints(data, **kwargs) -> Series:
+        # 批量 to_int, 逐元素结果与 int() 一致: 浮点数向零取整, 字符串须为整数形式, 整数不经过浮点数
+        # 超出 int64 范围的元素视为转换失败
+        source = _to_series(data)
+        if is_unsigned_integer_dtype(source.dtype):
+            # 超过 int64 上限的无符号整数先置 0 再转换, 避免 astype 整体抛出异常
+            over = (source >= _INT64_LIMIT).fillna(False).astype(bool)
+            values = source.where(~over, 0).astype('Int64').mask(over)
+            failed = values.isna()
+        elif is_bool_dtype(source.dtype) or is_integer_dtype(source.dtype):
+            values = source.astype('Int64')
+            failed = values.isna()
+        elif is_float_dtype(source.dtype):
+            failed = (source.isna() | ~(source.abs() < _INT64_LIMIT)).astype(bool)
+            values = np.trunc(source.mask(failed)).astype('Int64')
+        elif infer_dtype(source, skipna=False) == 'string':
+            values, failed = _strings_to_ints(source)
+        else:
+            values = Series([_to_int_or_none(x) for x in source], index=source.index, dtype='Int64')
+            failed = values.isna()
+        if not failed.any():
+            return values.astype('int64')
+        return _fill_failed(values, failed, source, kwargs)
+
+
+_INT64_LIMIT = 2**63
+# 与 int() 接受的字符串形式一致: 可带符号与首尾空白, 数字之间可有单个下划线
+_INT_STRING = r'\s*[+-]?\d(?:_?\d)*\s*'
+
+
+def _to_int_or_none(value) -> Any:
+    try:
+        result = int(value)
+    except Exception:
+        return None
+    return result if -_INT64_LIMIT <= result < _INT64_LIMIT else None
+
+
+def _strings_to_ints(source: Series):
+    # 只对整数形式的字符串调用 pd.to_numeric, 结果为 int64 时精确, 否则 (下划线、uint64 或溢出) 逐个 int()
+    # 按掩码赋值会经过 float64, 改为先转 Int64 再按位置 reindex (原索引可能重复)
+    positions = np.flatnonzero(source.str.fullmatch(_INT_STRING).to_numpy(dtype=bool))
+    subset = source.iloc[positions]
+    parsed = pd.to_numeric(subset, errors='coerce')
+    if parsed.dtype == np.int64:
+        parsed = parsed.astype('Int64')
+    else:
+        parsed = Series([_to_int_or_none(x) for x in subset], dtype='Int64')
+    parsed.index = positions
+    values = parsed.reindex(range(len(source)))
+    values.index = source.index
+    return values, values.isna()
+
 
 class ToDataFrameConvertMixin:
     @convert_exception
     @staticmethod
     def to_dataframe(data, **kwargs) -> DataFrame:
+        # dtype 为单个类型时在构造时指定, 为 {列名: 类型} 时构造后按列转换; numpy 数组不复制
         _columns = kwargs.get('columns', [])
-        if _columns:
-            return DataFrame(data, columns=_columns)
-        return DataFrame(data)
+        _dtype = kwargs.get('dtype')
+        dataframe = DataFrame(
+            data, columns=_columns or None, dtype=None if isinstance(_dtype, dict) else _dtype, copy=False
+        )
+        if isinstance(_dtype, dict):
+            return dataframe.astype(_dtype, copy=False)
+        return dataframe
 
 
 class FloatConverter(ToIntConvertMixin): ...
@@ -51,8 +323,21 @@ class StringConverter(ToIntConvertMixin):
     @convert_exception
     @staticmethod
     def to_datetime(data: str, **kwargs) -> datetime:
-        _format = kwargs.get('format', '%Y-%m-%d %H:%M:%S')
-        return datetime.strptime(data, _format)
+        _format = kwargs.get('format', DEFAULT_DATETIME_FORMAT)
+        return DatetimeCodec.parse(data, _format)
+
+    @batch_convert_exception
+    @staticmethod
+    def to_datetimes(data, **kwargs) -> Series:
+        # 批量 to_datetime, 使用固定格式的 pd.to_datetime, 重复的字符串只解析一次
+        # 超出 datetime64[ns] 范围的合法值 (如 0001-01-01) 逐个按 to_datetime 重新解析, 此时结果为微秒精度
+        _format = kwargs.get('format', DEFAULT_DATETIME_FORMAT)
+        source = _to_series(data)
+        values = pd.to_datetime(source, format=_format, errors='coerce', cache=True)
+        retry = np.flatnonzero((values.isna() & source.notna()).to_numpy(dtype=bool))
+        if len(retry) and is_datetime64_any_dtype(values.dtype):
+            values = _set_datetimes(values, retry, [_parse_or_none(source.iloc[i], _format) for i in retry])
+        return _fill_failed(values, values.isna(), source, kwargs)
 
 
 class ListConverter(ToDataFrameConvertMixin):
@@ -67,5 +352,58 @@ class DatetimeConverter:
     @convert_exception
     @staticmethod
     def to_string(data: datetime, **kwargs) -> str:
-        _format = kwargs.get('format', '%Y-%m-%d %H:%M:%S')
-        return data.strftime(_format)
+        _format = kwargs.get('format', DEFAULT_DATETIME_FORMAT)
+        return DatetimeCodec.format(data, _format)
+
+    @batch_convert_exception
+    @staticmethod
+    def to_strings(data, **kwargs) -> Series:
+        # 批量 to_string, 与 to_string 一致只接受 datetime 或 datetime64, 字符串等其他元素视为转换失败
+        _format = kwargs.get('format', DEFAULT_DATETIME_FORMAT)
+        source = _to_series(data)
+        if is_datetime64_any_dtype(source.dtype):
+            values = source
+            failed = values.isna()
+        else:
+            datetime_like = source.map(lambda x: isinstance(x, (datetime, np.datetime64))).astype(bool)
+            values = pd.to_datetime(source.where(datetime_like), errors='coerce')
+            failed = ~datetime_like | values.isna()
+        strings = values.dt.strftime(_format).astype(object)
+        # 超出 datetime64[ns] 范围的元素为 NaT, 逐个按 to_string 格式化
+        retry = np.flatnonzero((failed & source.notna()).to_numpy(dtype=bool))
+        if len(retry):
+            retried = Series([_format_or_none(source.iloc[i], _format) for i in retry], dtype=object)
+            strings.iloc[retry] = retried.to_numpy()
+            failed = failed.copy()
+            failed.iloc[retry] = retried.isna().to_numpy()
+        return _fill_failed(strings, failed, source, kwargs)
+
+
+def _parse_or_none(value, fmt: str) -> Any:
+    try:
+        return DatetimeCodec.parse(value, fmt)
+    except Exception:
+        return None
+
+
+def _format_or_none(value, fmt: str) -> Any:
+    try:
+        if isinstance(value, np.datetime64):
+            value = value.astype('datetime64[us]').item()
+        return DatetimeCodec.format(value, fmt)
+    except Exception:
+        return None
+
+
+def _set_datetimes(values: Series, positions, parsed: list) -> Series:
+    # 按位置写入重新解析的值, 结果改为微秒精度以容纳 datetime64[ns] 范围之外的日期, 无法写入的保持 NaT
+    if all(x is None for x in parsed):
+        return values
+    array = values.array.as_unit('us').copy()
+    for i, value in zip(positions, parsed):
+        if value is not None:
+            try:
+                array[i] = value
+            except (TypeError, ValueError):
+                pass
+    return Series(array, index=values.index, name=values.name)
@@ -0,0 +1,419 @@
+# 合成数据集生成器, 按 ORM 模型或 pydantic 模型的字段生成压测数据
+# 按块生成, 每块使用由 (种子, 块序号) 派生的独立 PCG64 流, 相同种子的输出与 worker 数量无关
+
+__all__ = [
+    'DatasetGenerator',
+    'Distribution',
+    'Serial',
+    'UniformInt',
+    'Uniform',
+    'Normal',
+    'Choice',
+    'Text',
+    'DatetimeRange',
+    'Uuids',
+    'Nullable',
+    'Constant',
+]
+
+import enum
+import types
+import typing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Type, Union
+from uuid import UUID
+
+import numpy as np
+from numpy import ndarray
+from pandas import DataFrame
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.orm import Session
+
+from ..db.crud import CRUDRepository
+from ..files.extend import JsonLinesFile
+from .generator import RandomFloatGenerator, RandomIntGenerator, RandomStringGenerator, SortableIdGenerator
+
+DEFAULT_CHUNK_SIZE = 10000
+# 未指定范围时的默认取值范围
+DEFAULT_INT_RANGE = (0, (1 << 31) - 1)
+DEFAULT_FLOAT_RANGE = (0.0, 10000.0)
+DEFAULT_TEXT_LENGTH = 32
+DEFAULT_DATETIME_RANGE = (datetime(2020, 1, 1), datetime(2025, 1, 1))
+
+Values = Union[ndarray, list]
+
+
+class Distribution:
+    """
+    列的取值分布, 调用时返回 count 个值 (数组或列表)
+    :param random: 当前块的 NumPy 生成器, 所有随机数须由它产生以保证可复现
+    :param start: 当前块第一行的全局行号
+    """
+
+    def __call__(self, random: np.random.Generator, start: int, count: int) -> Values:
+        raise NotImplementedError
+
+
+Sampler = Union[Distribution, Callable[[np.random.Generator, int, int], Values]]
+
+
+class Serial(Distribution):
+    """按行号递增的整数, 适合主键与唯一列"""
+
+    def __init__(self, start: int = 1, step: int = 1) -> None:
+        self.start = start
+        self.step = step
+
+    def __call__(self, random, start, count):
+        first = self.start + start * self.step
+        return np.arange(first, first + count * self.step, self.step, dtype=np.int64)
+
+
+class UniformInt(Distribution):
+    def __init__(self, low: int = DEFAULT_INT_RANGE[0], high: int = DEFAULT_INT_RANGE[1]) -> None:
+        self.low = low
+        self.high = high
+
+    def __call__(self, random, start, count):
+        return RandomIntGenerator.by_range_array(count, self.low, self.high, random=random)
+
+
+class Uniform(Distribution):
+    def __init__(
+        self, low: float = DEFAULT_FLOAT_RANGE[0], high: float = DEFAULT_FLOAT_RANGE[1], digits: Optional[int] = None
+    ) -> None:
+        """
+        :param digits: 保留的小数位数, 如 Numeric 列的 scale
+        """
+        self.low = low
+        self.high = high
+        self.digits = digits
+
+    def __call__(self, random, start, count):
+        values = RandomFloatGenerator.by_range_array(count, self.low, self.high, random=random)
+        return values if self.digits is None else values.round(self.digits)
+
+
+class Normal(Distribution):
+    def __init__(
+        self,
+        mean: float = 0.0,
+        std: float = 1.0,
+        low: Optional[float] = None,
+        high: Optional[float] = None,
+        integer: bool = False,
+    ) -> None:
+        """
+        :param low: 下限, 超出的值截断到边界
+        :param high: 上限
+        :param integer: 四舍五入为整数
+        """
+        self.mean = mean
+        self.std = std
+        self.low = low
+        self.high = high
+        self.integer = integer
+
+    def __call__(self, random, start, count):
+        values = random.normal(self.mean, self.std, count)
+        if self.low is not None or self.high is not None:
+            values = values.clip(self.low, self.high)
+        return values.round().astype(np.int64) if self.integer else values
+
+
+class Choice(Distribution):
+    def __init__(self, values: Sequence[Any], weights: Optional[Sequence[float]] = None) -> None:
+        """
+        :param weights: 各值的权重, 无需归一化, 默认等概率
+        """
+        if not values:
+            raise ValueError('Choice values is empty')
+        if weights is not None and len(weights) != len(values):
+            raise ValueError(f'Length of weights {len(weights)} != length of values {len(values)}')
+        self.values = list(values)
+        self.weights = None if weights is None else np.asarray(weights, dtype=float) / sum(weights)
+
+    def __call__(self, random, start, count):
+        indices = random.choice(len(self.values), size=count, p=self.weights)
+        values = self.values
+        return [values[i] for i in indices.tolist()]
+
+
+class Text(Distribution):
+    """由字母和数字组成的随机字符串, 长度在 [min_length, max_length] 内均匀分布"""
+
+    def __init__(self, min_length: int = 8, max_length: int = DEFAULT_TEXT_LENGTH) -> None:
+        if not 0 <= min_length <= max_length:
+            raise ValueError(f'Invalid length range: [{min_length}, {max_length}]')
+        self.min_length = min_length
+        self.max_length = max_length
+
+    def __call__(self, random, start, count):
+        values = RandomStringGenerator.by_length_many(count, self.max_length, random=random)
+        if self.min_length == self.max_length:
+            return values
+        lengths = random.integers(self.min_length, self.max_length, size=count, endpoint=True).tolist()
+        return [x[:n] for x, n in zip(values, lengths)]
+
+
+class DatetimeRange(Distribution):
+    """[start, end) 内均匀分布的时间, start 为 date 时生成日期"""
+
+    def __init__(
+        self,
+        start: Union[datetime, date] = DEFAULT_DATETIME_RANGE[0],
+        end: Union[datetime, date] = DEFAULT_DATETIME_RANGE[1],
+    ) -> None:
+        self.unit = 'us' if isinstance(start, datetime) else 'D'
+        self.start = np.datetime64(start, self.unit)
+        self.end = np.datetime64(end, self.unit)
+        if self.end <= self.start:
+            raise ValueError(f'Empty range: [{start}, {end})')
+
+    def __call__(self, random, start, count):
+        span = int((self.end - self.start) / np.timedelta64(1, self.unit))
+        offsets = random.integers(0, span, size=count, dtype=np.int64)
+        # datetime64[us] / [D] 的 tolist 分别返回 datetime / date
+        return (self.start + offsets.astype(f'timedelta64[{self.unit}]')).tolist()
+
+
+class Uuids(Distribution):
+    """随机 UUIDv4, sortable 为 True 时使用 SortableIdGenerator 生成 UUIDv7 (不受种子控制)"""
+
+    def __init__(self, sortable: bool = False) -> None:
+        self.sortable = sortable
+        self._generator = SortableIdGenerator() if sortable else None
+
+    def __call__(self, random, start, count):
+        if self._generator is not None:
+            return self._generator.batch(count)
+        data = np.frombuffer(random.bytes(count * 16), dtype=np.uint8).reshape(count, 16).copy()
+        data[:, 6] = data[:, 6] & 0x0F | 0x40
+        data[:, 8] = data[:, 8] & 0x3F | 0x80
+        raw = data.tobytes()
+        return [UUID(bytes=raw[i:i + 16]) for i in range(0, len(raw), 16)]
+
+    def __getstate__(self):
+        # SortableIdGenerator 持有锁, 不可序列化, 在 worker 进程中重新创建
+        return {'sortable': self.sortable}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+class Nullable(Distribution):
+    """以 rate 的概率将 inner 生成的值替换为 None"""
+
+    def __init__(self, inner: Sampler, rate: float = 0.1) -> None:
+        self.inner = inner
+        self.rate = rate
+
+    def __call__(self, random, start, count):
+        values = self.inner(random, start, count)
+        values = values.tolist() if isinstance(values, ndarray) else list(values)
+        for i in np.flatnonzero(random.random(count) < self.rate).tolist():
+            values[i] = None
+        return values
+
+
+class Constant(Distribution):
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __call__(self, random, start, count):
+        return [self.value] * count
+
+
+class DatasetGenerator:
+    """
+    按模型字段生成合成数据, 未指定分布的字段按类型推断:
+    - ORM 模型 (含 __table__): 整数主键与唯一列为 Serial, 字符串长度不超过列长度, Enum 列取枚举值
+    - pydantic 模型: 读取 ge/gt/le/lt 与 min_length/max_length 约束, Optional 字段不生成 None
+    外键等有业务约束的列须通过 columns 指定分布, 无法推断类型的字段抛出 TypeError
+    用法: DatasetGenerator(User, {'age': UniformInt(18, 60)}, seed=1).frames(10**6, workers=4)
+    """
+
+    def __init__(
+        self,
+        model: Type,
+        columns: Optional[Dict[str, Sampler]] = None,
+        seed: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        exclude: Sequence[str] = (),
+        validate: bool = False,
+    ) -> None:
+        """
+        :param columns: 字段名 -> 分布 (Distribution 或 (random, start, count) -> 值的函数), 多进程时须可序列化
+        :param seed: 随机种子, 默认由系统熵生成
+        :param chunk_size: 每块的行数
+        :param exclude: 不生成的字段, 如自增主键或由数据库默认值填充的列
+        :param validate: pydantic 模型逐行校验并返回 model_dump 的结果, 使字段校验器生效
+        """
+        columns = dict(columns or {})
+        if hasattr(model, '__table__'):
+            names = [x.name for x in model.__table__.columns]
+            infer = {x.name: x for x in model.__table__.columns}
+            infer_func = _column_distribution
+        elif hasattr(model, 'model_fields'):
+            names = list(model.model_fields)
+            infer = model.model_fields
+            infer_func = _field_distribution
+        else:
+            raise TypeError(f'Unsupported model: {model!r}, expected an ORM model or a pydantic model')
+        unknown = set(columns) - set(names)
+        if unknown:
+            raise KeyError(f'Unknown columns for {model.__name__}: {sorted(unknown)}')
+
+        self.model = model
+        self.chunk_size = max(chunk_size, 1)
+        self.validate = validate and hasattr(model, 'model_validate')
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+        self.columns: Dict[str, Sampler] = {
+            name: columns[name] if name in columns else infer_func(infer[name])
+            for name in names
+            if name not in exclude
+        }
+
+    def chunk(self, index: int, count: Optional[int] = None) -> Dict[str, Values]:
+        """第 index 块的数据, 列名 -> 值, 相同种子与块序号的结果相同"""
+        count = self.chunk_size if count is None else count
+        random = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(index,)))
+        start = index * self.chunk_size
+        return {name: sampler(random, start, count) for name, sampler in self.columns.items()}
+
+    def iter_chunks(self, count: int, workers: int = 1) -> Iterator[Dict[str, Values]]:
+        """
+        按块生成共 count 行, workers 大于 1 时由多个进程并行生成, 结果顺序不变
+        同时提交的块不超过 workers 的两倍, 内存占用与 count 无关
+        """
+        tasks = [(i, min(self.chunk_size, count - start)) for i, start in enumerate(range(0, count, self.chunk_size))]
+        if workers <= 1:
+            yield from (self.chunk(*x) for x in tasks)
+            return
+        executor = ProcessPoolExecutor(workers)
+        pending = deque()
+        try:
+            for task in tasks:
+                pending.append(executor.submit(self.chunk, *task))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def frames(self, count: int, workers: int = 1) -> Iterator[DataFrame]:
+        """按块返回 DataFrame"""
+        for i, chunk in enumerate(self.iter_chunks(count, workers)):
+            frame = DataFrame(chunk)
+            frame.index += i * self.chunk_size
+            yield frame
+
+    def batches(self, count: int, workers: int = 1) -> Iterator[List[Dict[str, Any]]]:
+        """按块返回记录列表, 值为 Python 原生类型, 可直接用于批量插入"""
+        for chunk in self.iter_chunks(count, workers):
+            names = list(chunk)
+            values = [x.tolist() if isinstance(x, ndarray) else x for x in chunk.values()]
+            rows = [dict(zip(names, x)) for x in zip(*values)]
+            if self.validate:
+                rows = [self.model.model_validate(x).model_dump() for x in rows]
+            yield rows
+
+    def records(self, count: int, workers: int = 1) -> Iterator[Dict[str, Any]]:
+        for rows in self.batches(count, workers):
+            yield from rows
+
+    def dump_jsonl(self, path: Union[str, Path], count: int, workers: int = 1, **kwargs) -> int:
+        """
+        流式写入 JSON Lines 文件, kwargs 传给 JsonLinesFile.dump_stream
+        :return: 写入的记录数
+        """
+        return JsonLinesFile(path).dump_stream(self.records(count, workers), **kwargs)
+
+    def bulk_insert(self, session: Session, count: int, workers: int = 1) -> int:
+        """
+        通过 CRUDRepository.bulk_insert 分块插入, 不提交事务
+        :return: 插入的行数
+        """
+        if not hasattr(self.model, '__table__'):
+            raise TypeError(f'{self.model.__name__} is not an ORM model')
+        repository = CRUDRepository(self.model, chunk_size=self.chunk_size)
+        return repository.bulk_insert(session, self.records(count, workers))
+
+
+def _column_distribution(column) -> Distribution:
+    column_type = column.type
+    if isinstance(column_type, SAEnum):
+        return Choice(list(column_type.enum_class) if column_type.enum_class else column_type.enums)
+    try:
+        python_type = column_type.python_type
+    except NotImplementedError:
+        python_type = None
+
+    if python_type is int and (column.primary_key or column.unique):
+        return Serial()
+    if python_type is str:
+        length = getattr(column_type, 'length', None) or DEFAULT_TEXT_LENGTH
+        return Text(min(8, length), min(length, DEFAULT_TEXT_LENGTH))
+    if python_type is Decimal:
+        return Uniform(digits=getattr(column_type, 'scale', None))
+    distribution = _type_distribution(python_type)
+    if distribution is None:
+        raise TypeError(f'Cannot infer distribution for column {column.name}: {column_type!r}, set it in columns')
+    return distribution
+
+
+def _field_distribution(field) -> Distribution:
+    annotation = field.annotation
+    if typing.get_origin(annotation) in (Union, types.UnionType):
+        args = [x for x in typing.get_args(annotation) if x is not type(None)]
+        annotation = args[0] if len(args) == 1 else annotation
+    if typing.get_origin(annotation) is typing.Literal:
+        return Choice(typing.get_args(annotation))
+
+    bounds = {}
+    for item in field.metadata:
+        for name in ('ge', 'gt', 'le', 'lt', 'min_length', 'max_length'):
+            value = getattr(item, name, None)
+            if value is not None:
+                bounds[name] = value
+
+    if annotation is int:
+        low = bounds['gt'] + 1 if 'gt' in bounds else bounds.get('ge', DEFAULT_INT_RANGE[0])
+        high = bounds['lt'] - 1 if 'lt' in bounds else bounds.get('le', max(DEFAULT_INT_RANGE[1], low))
+        return UniformInt(low, high)
+    if annotation in (float, Decimal):
+        low = float(np.nextafter(bounds['gt'], np.inf)) if 'gt' in bounds else bounds.get('ge', DEFAULT_FLOAT_RANGE[0])
+        high = bounds.get('lt', bounds.get('le', max(DEFAULT_FLOAT_RANGE[1], low + 1)))
+        return Uniform(low, high)
+    if annotation is str:
+        max_length = bounds.get('max_length', max(bounds.get('min_length', 0), DEFAULT_TEXT_LENGTH))
+        return Text(bounds.get('min_length', min(8, max_length)), max_length)
+    distribution = _type_distribution(annotation)
+    if distribution is None:
+        raise TypeError(f'Cannot infer distribution for field of type {annotation!r}, set it in columns')
+    return distribution
+
+
+def _type_distribution(python_type) -> Optional[Distribution]:
+    if python_type is bool:
+        return Choice([True, False])
+    if python_type is int:
+        return UniformInt()
+    if python_type in (float, Decimal):
+        return Uniform()
+    if python_type is str:
+        return Text()
+    if python_type is datetime:
+        return DatetimeRange()
+    if python_type is date:
+        return DatetimeRange(*(x.date() for x in DEFAULT_DATETIME_RANGE))
+    if python_type is UUID:
+        return Uuids()
+    if isinstance(python_type, type) and issubclass(python_type, enum.Enum):
+        return Choice(list(python_type))
+    return None
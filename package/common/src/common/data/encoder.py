@@ -1,28 +1,384 @@
-__all__ = ['JsonEncoder']
+__all__ = [
+    'JsonEncoder',
+    'JsonBackend',
+    'StdJsonBackend',
+    'OrjsonBackend',
+    'get_json_backend',
+    'encode_default',
+    'DATAFRAME_ORIENTS',
+    'JsonStreamWriter',
+    'iter_dataframe_records',
+]
 
 import json
 from datetime import datetime
 from decimal import Decimal
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional
 from uuid import UUID
 
-from numpy import int64, issubdtype, number
-from pandas import DataFrame
+from numpy import int64, issubdtype, ndarray, number
+from pandas import NA, DataFrame, Series
+from pandas.api.extensions import ExtensionDtype
+
+try:
+    import orjson
+except ImportError:  # 可选依赖
+    orjson = None
+
+# 流式编码 DataFrame 的布局, 与 DataFrame.to_dict 的 orient 含义相同
+DATAFRAME_ORIENTS = ('dict', 'list', 'split', 'records')
+# 流式编码时每块的行数
+DEFAULT_CHUNK_SIZE = 10000
+# 流式写入的缓冲区大小 (字符数)
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+
+def _to_str(o) -> str:
+    return str(o)
+
+
+def _decode_bytes(o: bytes) -> str:
+    return o.decode(encoding='utf-8')
+
+
+def _dataframe_to_dict(o: DataFrame) -> Dict:
+    # default 须返回完整的对象, 仍构造嵌套 dict; 流式编码见 JsonBackend.iterencode
+    return o.to_dict()
+
+
+def _ndarray_to_list(o: ndarray) -> list:
+    return o.tolist()
+
+
+# 类型 -> 转换函数, 首次遇到的类型按 _resolve 的规则解析后加入
+_DISPATCH: Dict[type, Callable[[Any], Any]] = {
+    datetime: _to_str,
+    Decimal: float,
+    UUID: _to_str,
+    DataFrame: _dataframe_to_dict,
+    ndarray: _ndarray_to_list,
+    bytes: _decode_bytes,
+}
+
+
+def _resolve(cls: type) -> Callable[[Any], Any]:
+    # 与 JsonEncoder 原有的 isinstance 判断顺序一致
+    if issubclass(cls, datetime):
+        return _to_str
+    if issubclass(cls, Decimal):
+        return float
+    if issubclass(cls, UUID):
+        return _to_str
+    if issubclass(cls, DataFrame):
+        return _dataframe_to_dict
+    if issubclass(cls, ndarray):
+        return _ndarray_to_list
+    if issubclass(cls, bytes):
+        return _decode_bytes
+    if issubclass(cls, float):
+        # numpy.float64 等 float 子类, 标准库直接编码, orjson 会交给 default
+        return float
+    if issubdtype(cls, number):
+        return float if issubdtype(cls, int64) else int
+    return _to_str
+
+
+def encode_default(o):
+    """json default 函数, 按类型查表, 每种类型只解析一次"""
+    func = _DISPATCH.get(type(o))
+    if func is None:
+        func = _DISPATCH[type(o)] = _resolve(type(o))
+    return func(o)
 
 
 class JsonEncoder(json.JSONEncoder):
     def default(self, o):
-        if isinstance(o, datetime):
-            result = str(o)
-        elif isinstance(o, Decimal):
-            result = float(o)
-        elif isinstance(o, UUID):
-            result = str(o)
-        elif isinstance(o, DataFrame):
-            result = o.to_dict()
-        elif isinstance(o, bytes):
-            result = o.decode(encoding='utf-8')
-        elif issubdtype(type(o), number):
-            return float(o) if issubdtype(type(o), int64) else int(o)
+        return encode_default(o)
+
+
+class JsonBackend:
+    """JSON 编码后端, 各后端对 JsonEncoder 支持的类型输出相同的值"""
+
+    NAME = ''
+    # 是否转义非 ASCII 字符, 与 dumps 的输出一致
+    ENSURE_ASCII = True
+
+    def dumps(self, data: Any, indent: Optional[int] = None, compact: bool = False) -> str:
+        """compact 为 True 时不输出分隔符后的空格, 有 indent 时忽略"""
+        raise NotImplementedError
+
+    def dump(self, data: Any, fp: IO[str], indent: Optional[int] = None) -> None:
+        """data 为 DataFrame / ndarray 时按 iterencode 分块写入, 忽略 indent"""
+        if isinstance(data, (DataFrame, ndarray)):
+            for chunk in self.iterencode(data):
+                fp.write(chunk)
+            return
+        fp.write(self.dumps(data, indent))
+
+    def dumpb(self, data: Any) -> bytes:
+        """紧凑的 UTF-8 字节, 用于 API 响应"""
+        raise NotImplementedError
+
+    def iterencode(
+        self, data: Any, orient: str = 'dict', chunk_size: int = DEFAULT_CHUNK_SIZE, compact: bool = False
+    ) -> Iterator[str]:
+        """
+        分块编码, DataFrame 与 ndarray 按列切片后逐块输出, 不构造完整的嵌套 dict
+        data 本身或其直接包含的 DataFrame / ndarray 流式输出, 其余值整体编码
+        :param orient: DataFrame 的布局, dict / list (按列) / split / records, 解码后与 to_dict(orient) 编码的结果相同
+        :param chunk_size: 每块的行数
+        :param compact: 同 dumps, 分隔符后不输出空格
+        """
+        item_sep, key_sep = (',', ':') if compact else (', ', ': ')
+        if isinstance(data, DataFrame):
+            yield from self._iter_dataframe(data, orient, chunk_size, compact)
+        elif isinstance(data, ndarray):
+            yield from self._iter_ndarray(data, chunk_size, compact)
+        elif isinstance(data, dict) and any(isinstance(x, (DataFrame, ndarray)) for x in data.values()):
+            yield '{'
+            for i, (key, value) in enumerate(data.items()):
+                yield f'{item_sep if i else ""}{self._encode_key(key)}{key_sep}'
+                yield from self.iterencode(value, orient, chunk_size, compact)
+            yield '}'
+        elif isinstance(data, (list, tuple)) and any(isinstance(x, (DataFrame, ndarray)) for x in data):
+            yield '['
+            for i, value in enumerate(data):
+                if i:
+                    yield item_sep
+                yield from self.iterencode(value, orient, chunk_size, compact)
+            yield ']'
+        else:
+            yield self.dumps(data, compact=compact)
+
+    def _iter_dataframe(self, frame: DataFrame, orient: str, chunk_size: int, compact: bool) -> Iterator[str]:
+        if orient not in DATAFRAME_ORIENTS:
+            raise ValueError(f'Unknown orient: {orient}, expected one of {DATAFRAME_ORIENTS}')
+        if orient == 'dict' and not frame.index.is_unique:
+            # 与 to_dict 一致, 否则会输出重复的键
+            raise ValueError("DataFrame index must be unique for orient='dict'.")
+        item_sep, key_sep = (',', ':') if compact else (', ', ': ')
+        labels = frame.columns.tolist()
+
+        if orient in ('dict', 'list'):
+            chunks = range(0, len(frame), max(chunk_size, 1))
+            yield '{'
+            for i, label in enumerate(labels):
+                column = frame.iloc[:, i]
+                yield f'{item_sep if i else ""}{self._encode_key(label)}{key_sep}' + ('{' if orient == 'dict' else '[')
+                for j, start in enumerate(chunks):
+                    values = _column_values(column.iloc[start:start + chunk_size])
+                    if orient == 'dict':
+                        values = dict(zip(frame.index[start:start + chunk_size].tolist(), values))
+                    yield (item_sep if j else '') + self._encode_items(values, compact)
+                yield '}' if orient == 'dict' else ']'
+            yield '}'
+            return
+
+        if orient == 'split':
+            index, columns = self.dumps(frame.index.tolist(), compact=compact), self.dumps(labels, compact=compact)
+            yield f'{{"index"{key_sep}{index}{item_sep}"columns"{key_sep}{columns}{item_sep}"data"{key_sep}['
         else:
-            result = str(o)
-        return result
+            yield '['
+        for j, rows in enumerate(_iter_rows(frame, chunk_size)):
+            if orient == 'split':
+                values = [list(x) for x in rows]
+            else:
+                values = [dict(zip(labels, x)) for x in rows]
+            yield (item_sep if j else '') + self._encode_items(values, compact)
+        yield ']}' if orient == 'split' else ']'
+
+    def _iter_ndarray(self, array: ndarray, chunk_size: int, compact: bool) -> Iterator[str]:
+        if array.ndim == 0:
+            yield self.dumps(array.tolist(), compact=compact)
+            return
+        item_sep = ',' if compact else ', '
+        yield '['
+        for j, start in enumerate(range(0, len(array), max(chunk_size, 1))):
+            yield (item_sep if j else '') + self._encode_items(array[start:start + chunk_size].tolist(), compact)
+        yield ']'
+
+    def _encode_items(self, values: Any, compact: bool = False) -> str:
+        """编码 list / dict 并去掉外层括号, 用于拼接分块"""
+        return self.dumps(values, compact=compact)[1:-1] if values else ''
+
+    def _encode_key(self, key: Any) -> str:
+        """与标准库一致, 对象的键转为字符串, 非 ASCII 字符按后端的 ENSURE_ASCII 转义"""
+        if not isinstance(key, str):
+            key = json.dumps(key) if isinstance(key, (int, float, bool)) or key is None else str(key)
+        return json.dumps(key, ensure_ascii=self.ENSURE_ASCII)
+
+
+class StdJsonBackend(JsonBackend):
+    NAME = 'json'
+
+    def dumps(self, data: Any, indent: Optional[int] = None, compact: bool = False) -> str:
+        separators = (',', ':') if compact and indent is None else None
+        return json.dumps(data, indent=indent, separators=separators, cls=JsonEncoder)
+
+    def dump(self, data: Any, fp: IO[str], indent: Optional[int] = None) -> None:
+        if isinstance(data, (DataFrame, ndarray)):
+            return super().dump(data, fp, indent)
+        json.dump(data, fp, indent=indent, cls=JsonEncoder)
+
+    def dumpb(self, data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=encode_default).encode('utf-8')
+
+
+class OrjsonBackend(JsonBackend):
+    """
+    orjson 后端, 原生编码 UUID 与基础类型, datetime、date、time、dataclass 与 numpy 标量交给 encode_default 以保持与 JsonEncoder 一致
+    与标准库的差异: 缩进固定为 2 个空格, 非 ASCII 字符不转义, NaN/Infinity 输出为 null, 整数不能超过 64 位,
+    未继承 str/int 的 Enum 输出其值而不是 str(o)
+    """
+
+    NAME = 'orjson'
+    ENSURE_ASCII = False
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError('orjson is not installed')
+        self.options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, data: Any, indent: Optional[int] = None, compact: bool = False) -> str:
+        option = self.options | orjson.OPT_INDENT_2 if indent else self.options
+        return orjson.dumps(data, default=encode_default, option=option).decode('utf-8')
+
+    def dumpb(self, data: Any) -> bytes:
+        return orjson.dumps(data, default=encode_default, option=self.options)
+
+
+def iter_dataframe_records(frame: DataFrame, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Dict]]:
+    """按块返回 DataFrame 的记录, 值与 to_dict('records') 相同"""
+    labels = frame.columns.tolist()
+    for rows in _iter_rows(frame, chunk_size):
+        yield [dict(zip(labels, x)) for x in rows]
+
+
+def _iter_rows(frame: DataFrame, chunk_size: int) -> Iterator[Iterator[tuple]]:
+    columns = [frame.iloc[:, i] for i in range(frame.shape[1])]
+    for start in range(0, len(frame), max(chunk_size, 1)):
+        yield zip(*(_column_values(x.iloc[start:start + chunk_size]) for x in columns))
+
+
+def _column_values(column: Series) -> list:
+    # 与 to_dict 一致, 可空整数等扩展类型的缺失值 pd.NA 转为 None
+    values = column.tolist()
+    if isinstance(column.dtype, ExtensionDtype) and column.hasnans:
+        return [None if x is NA else x for x in values]
+    return values
+
+
+class JsonStreamWriter:
+    """
+    逐条写入记录, 输出 JSON 数组或 JSON Lines, fp 为文本流, 如 File.open 打开的文件或 socket.makefile('w')
+    写入内容先进入缓冲区, 超过 buffer_size 个字符时写出, 内存占用与记录总数无关
+    用法: with JsonStreamWriter(fp) as writer: writer.write_many(records)
+    """
+
+    def __init__(
+        self,
+        fp: IO[str],
+        backend: Optional[JsonBackend] = None,
+        lines: bool = False,
+        indent: Optional[int] = 4,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        """
+        :param backend: 编码后端, 默认为 get_json_backend('json')
+        :param lines: 输出 JSON Lines, 每行一条记录, 忽略 indent
+        :param indent: JSON 数组的缩进, 为 None 时输出不含空白的紧凑格式
+        """
+        self.fp = fp
+        self.backend = backend or get_json_backend('json')
+        self.lines = lines
+        self.indent = None if lines else indent
+        self.buffer_size = buffer_size
+        self.count = 0
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._closed = False
+        if self.indent is None:
+            self._prefix, self._separator = '', ','
+        else:
+            self._prefix = '\n' + ' ' * self.indent
+            self._separator = ',' + self._prefix
+
+    def __enter__(self) -> 'JsonStreamWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def write(self, record: Any) -> None:
+        """写入一条记录, DataFrame / ndarray 按 iterencode 分块写入, 不缩进"""
+        if isinstance(record, (DataFrame, ndarray)):
+            if not self.lines:
+                self._append(self._separator if self.count else '[' + self._prefix)
+            for chunk in self.backend.iterencode(record, compact=self.indent is None):
+                self._append(chunk)
+            if self.lines:
+                self._append('\n')
+        elif self.lines:
+            self._append(self.backend.dumps(record, compact=True) + '\n')
+        else:
+            text = self.backend.dumps(record, self.indent, compact=self.indent is None)
+            if self.indent is not None:
+                text = text.replace('\n', self._prefix)
+            self._append((self._separator if self.count else '[' + self._prefix) + text)
+        self.count += 1
+
+    def write_many(self, records: Iterable[Any], chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        写入多条记录, records 中的 DataFrame 按行展开, 可传入 DataFrame 分块或游标批次的生成器
+        :return: 写入的记录数
+        """
+        count = self.count
+        for record in records:
+            if isinstance(record, DataFrame):
+                for chunk in iter_dataframe_records(record, chunk_size):
+                    for row in chunk:
+                        self.write(row)
+            else:
+                self.write(record)
+        return self.count - count
+
+    def flush(self) -> None:
+        if self._buffer:
+            self.fp.write(''.join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+        self.fp.flush()
+
+    def close(self) -> None:
+        """写入数组的结束符并写出缓冲区, 不关闭 fp"""
+        if self._closed:
+            return
+        self._closed = True
+        if not self.lines:
+            self._append(('\n]' if self.indent is not None else ']') if self.count else '[]')
+        self.flush()
+
+    def _append(self, text: str) -> None:
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self.buffer_size:
+            self.fp.write(''.join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+
+
+JSON_BACKENDS = {x.NAME: x for x in (StdJsonBackend, OrjsonBackend)}
+_BACKEND_CACHE: Dict[str, JsonBackend] = {}
+
+
+def get_json_backend(name: Optional[str] = None) -> JsonBackend:
+    """
+    获取 JSON 编码后端
+    :param name: json / orjson, 为 None 时已安装 orjson 则使用 orjson, 否则使用标准库
+    """
+    name = name or ('orjson' if orjson is not None else 'json')
+    if name not in _BACKEND_CACHE:
+        if name not in JSON_BACKENDS:
+            raise ValueError(f'Unknown json backend: {name}')
+        _BACKEND_CACHE[name] = JSON_BACKENDS[name]()
+    return _BACKEND_CACHE[name]
@@ -4,26 +4,77 @@ __all__ = [
     "RandomFloatGenerator",
     "RandomIntGenerator",
     "UuidGenerator",
+    "SortableIdGenerator",
 ]
 
+import os
 import secrets
 import string
+import threading
 import time
+import weakref
+from datetime import datetime, timezone
+from typing import List, Optional
 from uuid import NAMESPACE_DNS, UUID, uuid5
 
+import numpy as np
+from numpy import ndarray
+
+ALPHABET = string.ascii_letters + string.digits
+_ALPHABET_BYTES = np.frombuffer(ALPHABET.encode("ascii"), dtype=np.uint8)
+_SYSTEM_RANDOM = secrets.SystemRandom()
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
 
 class RandomIntGenerator:
     @staticmethod
     def by_range(start: int = 0, end: int = 10) -> int:
-        secrets_generator = secrets.SystemRandom()
-        return secrets_generator.randint(start, end)
+        return _SYSTEM_RANDOM.randint(start, end)
+
+    @staticmethod
+    def by_range_array(
+        count: int, start: int = 0, end: int = 10, secure: bool = True, random: Optional[np.random.Generator] = None
+    ) -> ndarray:
+        """
+        批量生成 [start, end] 内的随机整数, 返回 int64 数组
+        :param secure: True 时由 os.urandom 生成 (密码学安全), False 时使用 PCG64, 不可用于令牌等安全场景
+        :param random: 指定的 NumPy 生成器, 用于可复现的结果, 此时忽略 secure
+        """
+        if start > end:
+            raise ValueError(f"Empty range: [{start}, {end}]")
+        if start < _INT64_MIN or end > _INT64_MAX:
+            raise ValueError(f"Range [{start}, {end}] out of int64")
+        if random is not None or not secure:
+            return (random or _fast_random()).integers(start, end, size=count, dtype=np.int64, endpoint=True)
+        # 在 uint64 上计算偏移, 溢出回绕后按 int64 解释即为 start + offset
+        offsets = _secure_below(count, end - start + 1)
+        return (offsets.astype(np.uint64) + np.uint64(start & 0xFFFF_FFFF_FFFF_FFFF)).view(np.int64)
 
 
 class RandomStringGenerator:
     @staticmethod
     def by_length(length: int = 10) -> str:
-        alphabet = string.ascii_letters + string.digits
-        return "".join(secrets.choice(alphabet) for _ in range(length))
+        return "".join(secrets.choice(ALPHABET) for _ in range(length))
+
+    @staticmethod
+    def by_length_many(
+        count: int, length: int = 10, secure: bool = True, random: Optional[np.random.Generator] = None
+    ) -> List[str]:
+        """
+        批量生成由字母和数字组成的随机字符串
+        :param secure: True 时由 os.urandom 生成 (密码学安全), False 时使用 PCG64, 不可用于令牌等安全场景
+        :param random: 指定的 NumPy 生成器, 用于可复现的结果, 此时忽略 secure
+        """
+        if length <= 0:
+            return [""] * count
+        size = count * length
+        if random is not None or not secure:
+            indices = (random or _fast_random()).integers(0, len(ALPHABET), size=size, dtype=np.uint8)
+        else:
+            indices = _secure_below(size, len(ALPHABET))
+        # 每行 length 个 ASCII 字节视为一个定长字节串, 再整体转为 str
+        chars = _ALPHABET_BYTES[indices].reshape(count, length)
+        return chars.view(f"S{length}").ravel().astype(f"U{length}").tolist()
 
 
 class RandomFloatGenerator:
@@ -31,8 +82,64 @@ class RandomFloatGenerator:
 
     @staticmethod
     def by_range(start: float = 0.0, end: float = 1.0) -> float:
-        secrets_generator = secrets.SystemRandom()
-        return secrets_generator.uniform(start, end)
+        return _SYSTEM_RANDOM.uniform(start, end)
+
+    @staticmethod
+    def by_range_array(
+        count: int,
+        start: float = 0.0,
+        end: float = 1.0,
+        secure: bool = True,
+        random: Optional[np.random.Generator] = None,
+    ) -> ndarray:
+        """
+        批量生成 [start, end) 内的随机浮点数, 返回 float64 数组
+        :param secure: True 时由 os.urandom 生成 (密码学安全), False 时使用 PCG64
+        :param random: 指定的 NumPy 生成器, 用于可复现的结果, 此时忽略 secure
+        """
+        if random is not None or not secure:
+            values = (random or _fast_random()).random(count)
+        else:
+            # 与 random.random 相同, 取 53 位随机数映射到 [0, 1)
+            values = np.frombuffer(os.urandom(count * 8), dtype=np.uint64) >> np.uint64(11)
+            values = values * (1.0 / (1 << 53))
+        return start + (end - start) * values
+
+
+_LOCAL = threading.local()
+
+
+def _fast_random() -> np.random.Generator:
+    """线程级的 PCG64 生成器, 由系统熵初始化, fork 后的子进程重新初始化, 避免与父进程产生相同序列"""
+    pid = os.getpid()
+    if getattr(_LOCAL, "pid", None) != pid:
+        _LOCAL.pid = pid
+        _LOCAL.generator = np.random.Generator(np.random.PCG64())
+    return _LOCAL.generator
+
+
+def _secure_below(size: int, bound: int) -> ndarray:
+    """size 个 [0, bound) 内均匀分布的整数, 一次读取 os.urandom 并拒绝采样, 避免取模偏差"""
+    if not 0 < bound <= 1 << 64:
+        raise ValueError(f"Invalid bound: {bound}")
+    dtype = np.uint8 if bound <= 1 << 8 else np.uint64
+    bits = np.iinfo(dtype).bits
+    limit = (1 << bits) // bound * bound
+    result = np.empty(size, dtype=dtype)
+    filled = 0
+    while filled < size:
+        need = size - filled
+        # 按接受率多读取一些, 通常一次即可填满
+        draw = need * (1 << bits) // limit + 16
+        values = np.frombuffer(os.urandom(draw * (bits // 8)), dtype=dtype)
+        if limit < 1 << bits:
+            values = values[values < dtype(limit)]
+        values = values[:need]
+        result[filled:filled + len(values)] = values
+        filled += len(values)
+    if bound < 1 << bits:
+        result %= dtype(bound)
+    return result
 
 
 class UuidGenerator:
@@ -45,3 +152,80 @@ class UuidGenerator:
     def by_time(random: bool = False) -> UUID:
         random_num = RandomIntGenerator.by_range(0, 10000) if random else 0
         return uuid5(NAMESPACE_DNS, f"{time.time()}{random_num}")
+
+    @staticmethod
+    def by_sortable() -> UUID:
+        """按时间有序且不重复的 UUIDv7, 见 SortableIdGenerator"""
+        return _SORTABLE_ID_GENERATOR.next()
+
+
+class SortableIdGenerator:
+    """
+    按时间有序的 UUIDv7 (RFC 9562) 生成器, 线程安全, 同一进程内严格递增
+    128 位布局: unix_ts_ms(48) | ver(4) | counter 高 12 位 | var(2) | counter 低 14 位 | node(16) | random(32)
+    - counter: 同一毫秒内递增, 每毫秒从随机值开始 (保留最高位避免溢出), 溢出时时间戳借用下一毫秒
+    - node: 进程级随机节点位, fork 后子进程重新生成, 区分同一毫秒内的多个进程
+    """
+
+    COUNTER_BITS = 26
+    NODE_BITS = 16
+    RANDOM_BITS = 32
+
+    def __init__(self, node: Optional[int] = None) -> None:
+        """
+        :param node: 节点位 (0 ~ 65535), 默认为进程级随机值
+        """
+        self._fixed_node = node
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            # 弱引用, 避免 fork 钩子使生成器无法回收
+            reset = weakref.WeakMethod(self._reset)
+            os.register_at_fork(after_in_child=lambda: reset() and reset()())
+
+    def _reset(self) -> None:
+        # fork 时其他线程可能持有锁, 子进程中重新创建
+        self._lock = threading.Lock()
+        self.node = self._fixed_node if self._fixed_node is not None else secrets.randbits(self.NODE_BITS)
+        self._last_ms = 0
+        self._counter = 0
+
+    def _next_int(self) -> int:
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._counter = secrets.randbits(self.COUNTER_BITS - 1)
+            else:
+                # 同一毫秒或系统时钟回拨: 沿用上次的时间戳并递增计数器
+                self._counter += 1
+                if self._counter >> self.COUNTER_BITS:
+                    self._last_ms += 1
+                    self._counter = 0
+            ms, counter = self._last_ms, self._counter
+
+        value = (ms & 0xFFFF_FFFF_FFFF) << 80
+        value |= 0x7 << 76
+        value |= (counter >> 14) << 64
+        value |= 0b10 << 62
+        value |= (counter & 0x3FFF) << 48
+        value |= self.node << self.RANDOM_BITS
+        value |= secrets.randbits(self.RANDOM_BITS)
+        return value
+
+    def next(self) -> UUID:
+        return UUID(int=self._next_int())
+
+    def next_bytes(self) -> bytes:
+        """16 字节大端形式, 字节序与时间顺序一致, 适合存储为 BINARY(16)"""
+        return self._next_int().to_bytes(16, "big")
+
+    def batch(self, count: int) -> List[UUID]:
+        return [UUID(int=self._next_int()) for _ in range(count)]
+
+    @staticmethod
+    def timestamp(value: UUID) -> datetime:
+        """UUIDv7 中的毫秒时间戳"""
+        return datetime.fromtimestamp((value.int >> 80) / 1000, tz=timezone.utc)
+
+
+_SORTABLE_ID_GENERATOR = SortableIdGenerator()
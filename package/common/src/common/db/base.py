@@ -1,29 +1,236 @@
+import itertools
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import event
 from sqlalchemy.engine import Engine, create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.sql.dml import UpdateBase
+
+from .cache import QueryCache
+from .profiler import QueryProfiler
+from .schema import SchemaManager
+
+# DB 配置中可直接传给 create_engine 的连接池参数
+ENGINE_OPTIONS = ('pool_size', 'max_overflow', 'pool_recycle', 'pool_pre_ping', 'pool_timeout', 'pool_use_lifo')
+# 未配置时的默认值, 对所有连接池类型均有效
+ENGINE_DEFAULTS: Dict[str, Any] = {'echo': False, 'pool_pre_ping': True, 'pool_recycle': 3600}
+
+# 后端名 -> 设置语句超时的 SQL, 未列出的后端忽略 statement_timeout
+STATEMENT_TIMEOUT_SQL = {
+    'mysql': 'SET SESSION max_execution_time = {ms}',  # 仅对 SELECT 生效
+    'mariadb': 'SET SESSION max_statement_time = {seconds}',
+    'postgresql': 'SET statement_timeout = {ms}',
+}
 
 
 class Base(DeclarativeBase): ...
 
 
+class RoutingSession(Session):
+    """只读会话的查询发往只读副本, flush 与 INSERT/UPDATE/DELETE 始终发往主库"""
+
+    def __init__(self, *args, replica: Optional[Engine] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+
+    @property
+    def readonly(self) -> bool:
+        return self.replica is not None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.replica is not None and not self._flushing and not isinstance(clause, UpdateBase):
+            return self.replica
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
 class DataBase:
-    def __init__(self, url: str):
+    def __init__(
+        self,
+        url: str,
+        replicas: Sequence[str] = (),
+        statement_timeout: int = 0,
+        query_cache: Optional[QueryCache] = None,
+        schema: Optional[SchemaManager] = None,
+        profiler: Optional[QueryProfiler] = None,
+        **kwargs,
+    ):
+        """
+        :param url: 主库连接地址
+        :param replicas: 只读副本连接地址, 只读会话按顺序轮流使用
+        :param statement_timeout: 语句超时时间 (毫秒), 0 表示不限制, 仅 MySQL / MariaDB / PostgreSQL 生效
+        :param query_cache: 查询结果缓存, 为 None 时不缓存
+        :param schema: 表结构管理, 默认为 SchemaManager(Base.metadata), 表结构指纹未变化时 init/create 跳过建表
+        :param profiler: SQL 耗时统计, 在主库与只读副本上计时, 为 None 时不统计
+        :param kwargs: create_engine 参数, 未指定时使用 ENGINE_DEFAULTS
+        """
         self._url = url
-        self.engine: Engine = create_engine(self._url, echo=True)
-        self.session_factory = sessionmaker(self.engine, autoflush=False)
+        self.statement_timeout = statement_timeout
+        self.schema = schema or SchemaManager(Base.metadata)
+        self.profiler = profiler
+        self.engine_options = {**ENGINE_DEFAULTS, **kwargs}
+        self.engine: Engine = self._create_engine(url)
+        self.replicas: List[Engine] = [self._create_engine(x) for x in replicas]
+        self.session_factory = sessionmaker(self.engine, class_=RoutingSession, autoflush=False)
+        self.query_cache = query_cache
+        # 统计先于缓存注册, 缓存命中的查询也计入 N+1 检测
+        if profiler is not None:
+            profiler.install_session(self.session_factory)
+        if query_cache is not None:
+            query_cache.install(self.session_factory)
+        self._replica_counter = itertools.count()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any], logger: Any = None) -> 'DataBase':
+        """
+        根据 DB 配置创建
+        :param logger: 慢查询日志, 配置了 DB.profiler 时使用
+        """
+        return cls(settings['url'], **_settings_kwargs(settings, logger))
 
-    def session(self) -> Session:
+    def session(self, readonly: bool = False) -> RoutingSession:
+        """
+        创建会话
+        :param readonly: 只读会话, 配置了只读副本时查询发往副本, 会话内始终使用同一副本
+        """
+        if readonly and self.replicas:
+            replica = self.replicas[next(self._replica_counter) % len(self.replicas)]
+            return self.session_factory(replica=replica)
         return self.session_factory()
 
-    def init(self, drop: bool = False):
-        with self.engine.begin() as conn:
-            if drop:
-                Base.metadata.drop_all(conn)
-            Base.metadata.create_all(conn)
+    def init(self, drop: bool = False) -> bool:
+        """建表, 返回是否执行了建表, drop 为 True 时先删除全部表"""
+        return self.schema.sync(self.engine, drop=drop)
 
-    def create(self):
-        with self.engine.begin() as conn:
-            Base.metadata.create_all(conn)
+    def create(self, force: bool = False) -> bool:
+        """建表, force 为 True 时忽略表结构指纹"""
+        return self.schema.sync(self.engine, force=force)
 
     def drop(self):
         with self.engine.begin() as conn:
-            Base.metadata.drop_all(conn)
+            self.schema.drop(conn)
+
+    def dispose(self):
+        """关闭主库及只读副本的连接池"""
+        self.engine.dispose()
+        for replica in self.replicas:
+            replica.dispose()
+
+    def _create_engine(self, url: str) -> Engine:
+        engine = create_engine(url, **self.engine_options)
+        _set_statement_timeout(engine, self.statement_timeout)
+        if self.profiler is not None:
+            self.profiler.install(engine)
+        return engine
+
+
+class AsyncDataBase:
+    def __init__(
+        self,
+        url: str,
+        replicas: Sequence[str] = (),
+        statement_timeout: int = 0,
+        query_cache: Optional[QueryCache] = None,
+        schema: Optional[SchemaManager] = None,
+        profiler: Optional[QueryProfiler] = None,
+        **kwargs,
+    ):
+        """
+        异步数据库, 参数同 DataBase, 连接地址需使用异步驱动, 如 mysql+aiomysql、sqlite+aiosqlite
+        会话关闭 expire_on_commit, 避免提交后访问属性时隐式触发数据库 I/O
+        建表在同一连接中串行执行, 不使用 SchemaManager 的并行建表
+        """
+        self._url = url
+        self.statement_timeout = statement_timeout
+        self.schema = schema or SchemaManager(Base.metadata)
+        self.profiler = profiler
+        self.engine_options = {**ENGINE_DEFAULTS, **kwargs}
+        self.engine: AsyncEngine = self._create_engine(url)
+        self.replicas: List[AsyncEngine] = [self._create_engine(x) for x in replicas]
+        session_cls = RoutingSession
+        self.query_cache = query_cache
+        if profiler is not None or query_cache is not None:
+            # 事件注册在本实例专用的子类上, 不影响其他数据库的会话
+            session_cls = type('RoutingSession', (RoutingSession,), {})
+        if profiler is not None:
+            profiler.install_session(session_cls)
+        if query_cache is not None:
+            query_cache.install(session_cls)
+        self.session_factory = async_sessionmaker(
+            self.engine, sync_session_class=session_cls, autoflush=False, expire_on_commit=False
+        )
+        self._replica_counter = itertools.count()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any], logger: Any = None) -> 'AsyncDataBase':
+        """根据 DB 配置创建, 参数同 DataBase.from_settings"""
+        return cls(settings['url'], **_settings_kwargs(settings, logger))
+
+    def session(self, readonly: bool = False) -> AsyncSession:
+        """
+        创建会话, 用法为 async with db.session() as session
+        :param readonly: 同 DataBase.session
+        """
+        if readonly and self.replicas:
+            replica = self.replicas[next(self._replica_counter) % len(self.replicas)]
+            return self.session_factory(replica=replica.sync_engine)
+        return self.session_factory()
+
+    async def init(self, drop: bool = False) -> bool:
+        async with self.engine.begin() as conn:
+            return await conn.run_sync(self.schema.sync_connection, drop)
+
+    async def create(self, force: bool = False) -> bool:
+        async with self.engine.begin() as conn:
+            return await conn.run_sync(self.schema.sync_connection, False, force)
+
+    async def drop(self):
+        async with self.engine.begin() as conn:
+            await conn.run_sync(self.schema.drop)
+
+    async def dispose(self):
+        """关闭主库及只读副本的连接池"""
+        await self.engine.dispose()
+        for replica in self.replicas:
+            await replica.dispose()
+
+    def _create_engine(self, url: str) -> AsyncEngine:
+        engine = create_async_engine(url, **self.engine_options)
+        _set_statement_timeout(engine.sync_engine, self.statement_timeout)
+        if self.profiler is not None:
+            self.profiler.install(engine.sync_engine)
+        return engine
+
+
+def _settings_kwargs(settings: Dict[str, Any], logger: Any = None) -> Dict[str, Any]:
+    """DB 配置 -> DataBase / AsyncDataBase 的参数 (不含 url)"""
+    kwargs = {key: settings[key] for key in ENGINE_OPTIONS + ('echo',) if key in settings}
+    kwargs['replicas'] = settings.get('replicas') or ()
+    kwargs['statement_timeout'] = int(settings.get('statement_timeout', 0))
+    if settings.get('query_cache'):
+        kwargs['query_cache'] = QueryCache.from_settings(settings['query_cache'])
+    if settings.get('schema'):
+        kwargs['schema'] = SchemaManager.from_settings(Base.metadata, settings['schema'])
+    if settings.get('profiler'):
+        kwargs['profiler'] = QueryProfiler.from_settings(settings['profiler'], logger)
+    return kwargs
+
+
+def _set_statement_timeout(engine: Engine, timeout: int) -> None:
+    """新建连接时设置语句超时 (毫秒)"""
+    sql = STATEMENT_TIMEOUT_SQL.get(engine.dialect.name)
+    if timeout > 0 and sql:
+        event.listen(engine, 'connect', _make_timeout_listener(sql.format(ms=int(timeout), seconds=timeout / 1000)))
+
+
+def _make_timeout_listener(sql: str):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(sql)
+        finally:
+            cursor.close()
+        # PostgreSQL 中未提交事务里的 SET 会随连接池归还时的回滚一起撤销
+        dbapi_connection.commit()
+
+    return on_connect
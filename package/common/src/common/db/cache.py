@@ -0,0 +1,214 @@
+# 查询结果缓存
+# 挂载在 DataBase 的会话上, 缓存 ORM 会话中执行的 SELECT 结果, 以编译后的 SQL 与参数为键
+# 会话中的写操作 (flush、INSERT/UPDATE/DELETE 语句) 按涉及的表使缓存失效, text() 等无法解析表的语句不会触发失效
+
+__all__ = [
+    'CacheStats',
+    'CacheBackend',
+    'MemoryCacheBackend',
+    'QueryCache',
+]
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import Table, event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session, loading
+from sqlalchemy.sql.util import find_tables
+from sqlalchemy.util import LRUCache
+
+# 会话 info 中记录当前事务写过的表
+SESSION_TABLES_KEY = 'query_cache_tables'
+
+
+class CacheStats:
+    """缓存计数器"""
+
+    def __init__(self) -> None:
+        self.hits = 0  # 命中次数
+        self.misses = 0  # 未命中次数
+        self.stores = 0  # 写入缓存次数
+        self.skips = 0  # 事务中有未提交写入, 不写入缓存的次数
+        self.invalidations = 0  # 因写操作失效的缓存条目数
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+class CacheBackend:
+    """缓存后端接口, 值为 sqlalchemy FrozenResult"""
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float, tables: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    def invalidate(self, tables: Iterable[str]) -> int:
+        """删除涉及指定表的条目, 返回删除的条目数"""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """进程内 LRU 缓存, 条目过期后在访问时删除"""
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[str, Tuple[float, Tuple[str, ...], Any]] = OrderedDict()  # 键 -> (过期时间, 表, 值)
+        self._tables: Dict[str, Set[str]] = {}  # 表 -> 键
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key: str, value: Any, ttl: float, tables: Iterable[str]) -> None:
+        tables = tuple(tables)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, tables, value)
+            for table in tables:
+                self._tables.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tables: Iterable[str]) -> int:
+        with self._lock:
+            keys = set()
+            for table in tables:
+                keys |= self._tables.get(table, set())
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tables.clear()
+
+    def _remove(self, key: str) -> None:
+        """删除条目, 需持有锁调用"""
+        _, tables, _ = self._entries.pop(key)
+        for table in tables:
+            keys = self._tables.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tables[table]
+
+
+class QueryCache:
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl: float = 60.0, max_size: int = 1024) -> None:
+        """
+        :param backend: 缓存后端, 默认为 MemoryCacheBackend(max_size)
+        :param ttl: 默认过期时间 (秒), 单条语句可通过 execution_options(query_cache_ttl=...) 指定
+        """
+        self.backend = backend or MemoryCacheBackend(max_size)
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._sql_cache = LRUCache(max_size)  # 语句缓存键 -> 编译后的 SQL
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> 'QueryCache':
+        """根据 DB.query_cache 配置创建"""
+        return cls(ttl=float(settings.get('ttl', 60.0)), max_size=int(settings.get('max_size', 1024)))
+
+    def install(self, target: Any) -> None:
+        """在 sessionmaker 或 Session 子类上注册缓存与失效事件"""
+        event.listen(target, 'do_orm_execute', self._on_execute)
+        event.listen(target, 'after_flush', self._on_flush)
+        event.listen(target, 'after_commit', self._on_commit)
+        event.listen(target, 'after_rollback', self._on_rollback)
+
+    def invalidate(self, *tables: str) -> int:
+        """手动使涉及指定表的缓存失效, 如在会话外执行写操作后"""
+        count = self.backend.invalidate(tables)
+        with self._lock:
+            self.stats.invalidations += count
+        return count
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def make_key(self, state: ORMExecuteState) -> str:
+        """编译后的 SQL 与参数的摘要"""
+        cache_key = state.statement._generate_cache_key()
+        text = cache_key.to_offline_string(self._sql_cache, state.statement, state.parameters or {})
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def _on_execute(self, state: ORMExecuteState):
+        if state.is_insert or state.is_update or state.is_delete:
+            self._track(state.session, _table_names(state.statement))
+            return None
+        if not state.is_select or not state.execution_options.get('query_cache', True):
+            return None
+
+        key = self.make_key(state)
+        frozen = self.backend.get(key)
+        if frozen is not None:
+            with self._lock:
+                self.stats.hits += 1
+            return loading.merge_frozen_result(state.session, state.statement, frozen, load=False)()
+
+        result = state.invoke_statement()
+        with self._lock:
+            self.stats.misses += 1
+        if state.session.info.get(SESSION_TABLES_KEY):
+            # 事务中有未提交的写入, 查询结果可能包含未提交的数据
+            with self._lock:
+                self.stats.skips += 1
+            return result
+
+        frozen = result.freeze()
+        ttl = state.execution_options.get('query_cache_ttl', self.ttl)
+        self.backend.set(key, frozen, ttl, _table_names(state.statement))
+        with self._lock:
+            self.stats.stores += 1
+        return frozen()
+
+    def _on_flush(self, session: Session, flush_context) -> None:
+        tables = set()
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            tables.update(x.fullname for x in inspect(obj).mapper.tables)
+        self._track(session, tables)
+
+    def _on_commit(self, session: Session) -> None:
+        # 提交后再次失效, 清除其他会话在提交前写入的旧结果
+        tables = session.info.pop(SESSION_TABLES_KEY, None)
+        if tables:
+            self.invalidate(*tables)
+
+    def _on_rollback(self, session: Session) -> None:
+        session.info.pop(SESSION_TABLES_KEY, None)
+
+    def _track(self, session: Session, tables: Iterable[str]) -> None:
+        """记录事务写过的表并立即失效, 保证本会话随后的查询读到最新数据"""
+        tables = set(tables)
+        if not tables:
+            return
+        session.info.setdefault(SESSION_TABLES_KEY, set()).update(tables)
+        self.invalidate(*tables)
+
+
+def _table_names(statement) -> Set[str]:
+    """语句涉及的表名 (含子查询、JOIN 与 DML 的目标表)"""
+    tables = find_tables(statement, include_aliases=True, include_joins=True, include_crud=True)
+    return {x.fullname for x in tables if isinstance(x, Table)}
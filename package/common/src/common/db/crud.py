@@ -0,0 +1,192 @@
+# 通用数据访问层
+# 批量写入均使用 Core 的 insert/update 语句按块执行, 不逐个构造 ORM 对象加入会话
+
+__all__ = [
+    'CRUDRepository',
+]
+
+from typing import Any, Dict, Generic, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, Union
+
+from pydantic import BaseModel as SchemaModel
+from sqlalchemy import ColumnElement, insert, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..data.schemes import AddSchemaType, SetSchemaType
+from .models import ModelType
+
+# 单条语句的绑定参数上限, 未列出的后端按 DEFAULT_MAX_PARAMS 计算
+MAX_PARAMS = {
+    'sqlite': 32766,
+    'mysql': 65535,
+    'mariadb': 65535,
+    'postgresql': 32767,
+}
+DEFAULT_MAX_PARAMS = 2000
+
+# 后端名 -> 支持 upsert 的 insert 构造函数
+UPSERT_INSERTS = {
+    'mysql': mysql.insert,
+    'mariadb': mysql.insert,
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+Values = Dict[str, Any]
+
+
+class CRUDRepository(Generic[ModelType, AddSchemaType, SetSchemaType]):
+    def __init__(self, model: Type[ModelType], chunk_size: int = 1000) -> None:
+        """
+        :param model: ORM 模型类
+        :param chunk_size: 批量写入时每条语句的最大行数, 实际行数还受后端绑定参数上限限制
+        """
+        self.model = model
+        self.chunk_size = chunk_size
+        self.table = model.__table__
+        self.columns = set(self.table.columns.keys())
+        self.primary_key = [x.name for x in self.table.primary_key.columns]
+
+    def get(self, session: Session, pk: Any) -> Optional[ModelType]:
+        return session.get(self.model, pk)
+
+    def add(self, session: Session, schema: Union[AddSchemaType, Values]) -> ModelType:
+        """新增单条记录并 flush, 返回 ORM 对象"""
+        obj = self.model(**self._to_values(schema))
+        session.add(obj)
+        session.flush()
+        return obj
+
+    def bulk_insert(self, session: Session, items: Iterable[Union[AddSchemaType, Values]]) -> int:
+        """分块执行多行 INSERT ... VALUES, 返回插入行数"""
+        count = 0
+        for rows in self._chunks(session, items):
+            session.execute(insert(self.table).values(rows))
+            count += len(rows)
+        return count
+
+    def upsert(
+        self,
+        session: Session,
+        items: Iterable[Union[AddSchemaType, Values]],
+        index_elements: Optional[Sequence[str]] = None,
+        update_columns: Optional[Sequence[str]] = None,
+    ) -> int:
+        """
+        分块执行插入或更新, MySQL 使用 ON DUPLICATE KEY UPDATE, PostgreSQL / SQLite 使用 ON CONFLICT DO UPDATE
+        :param index_elements: 冲突判断的唯一键, 默认为主键, 仅 PostgreSQL / SQLite 使用
+        :param update_columns: 冲突时更新的列, 默认为除唯一键外本次写入的全部列, 为空时忽略冲突行
+        :return: 写入的行数 (含更新的行)
+        """
+        dialect = session.get_bind().dialect.name
+        if dialect not in UPSERT_INSERTS:
+            raise NotImplementedError(f'Upsert is not supported for dialect: {dialect}')
+        index_elements = list(index_elements or self.primary_key)
+
+        count = 0
+        for rows in self._chunks(session, items):
+            stmt = UPSERT_INSERTS[dialect](self.table).values(rows)
+            columns = [x for x in rows[0] if x not in index_elements] if update_columns is None else update_columns
+            if dialect in ('mysql', 'mariadb'):
+                if columns:
+                    stmt = stmt.on_duplicate_key_update({x: stmt.inserted[x] for x in columns})
+                else:
+                    # 主键赋值为自身, 等价于 DO NOTHING; INSERT IGNORE 会把截断、外键等所有错误降为警告
+                    key = self.primary_key[0]
+                    stmt = stmt.on_duplicate_key_update({key: self.table.c[key]})
+            elif columns:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=index_elements, set_={x: stmt.excluded[x] for x in columns}
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+            session.execute(stmt)
+            count += len(rows)
+        return count
+
+    def bulk_update(self, session: Session, items: Iterable[Union[SetSchemaType, Values]]) -> int:
+        """
+        按主键批量更新, 每条数据须包含主键, 未设置的字段不更新
+        相同字段集合的行以 executemany 执行一条 UPDATE ... WHERE pk = ?
+        :return: 提交更新的行数
+        """
+        count = 0
+        for rows in self._chunks(session, items, exclude_unset=True):
+            missing = [x for x in self.primary_key if x not in rows[0]]
+            if missing:
+                raise ValueError(f'Primary key is required for bulk update: {missing}')
+            session.execute(update(self.model), rows)
+            count += len(rows)
+        return count
+
+    def page(
+        self,
+        session: Session,
+        size: int = 100,
+        after: Any = None,
+        where: Sequence[ColumnElement[bool]] = (),
+        key: Optional[str] = None,
+    ) -> Tuple[List[ModelType], Any]:
+        """
+        键集分页, 按 key 升序取 after 之后的 size 条记录, 不使用 OFFSET
+        :param after: 上一页返回的游标, None 表示第一页
+        :param where: 额外的过滤条件
+        :param key: 排序键, 须唯一, 默认为单列主键
+        :return: (记录列表, 下一页游标), 没有下一页时游标为 None
+        """
+        column = self.table.columns[key or self._single_key()]
+        stmt = select(self.model).where(*where).order_by(column).limit(size)
+        if after is not None:
+            stmt = stmt.where(column > after)
+        items = list(session.scalars(stmt))
+        next_after = getattr(items[-1], column.key) if len(items) == size else None
+        return items, next_after
+
+    def iter_pages(
+        self,
+        session: Session,
+        size: int = 100,
+        where: Sequence[ColumnElement[bool]] = (),
+        key: Optional[str] = None,
+    ) -> Iterator[List[ModelType]]:
+        """按键集分页依次返回每一页"""
+        after = None
+        while True:
+            items, after = self.page(session, size, after, where, key)
+            if items:
+                yield items
+            if after is None:
+                break
+
+    def _single_key(self) -> str:
+        if len(self.primary_key) != 1:
+            raise ValueError(f'Keyset pagination requires a single column key, got {self.primary_key}')
+        return self.primary_key[0]
+
+    def _to_values(self, item: Union[SchemaModel, Values], exclude_unset: bool = False) -> Values:
+        """schema 或 dict 转为列值, 忽略模型中不存在的字段"""
+        values = item.model_dump(exclude_unset=exclude_unset) if isinstance(item, SchemaModel) else item
+        return {k: v for k, v in values.items() if k in self.columns}
+
+    def _chunks(
+        self,
+        session: Session,
+        items: Iterable[Union[SchemaModel, Values]],
+        exclude_unset: bool = False,
+    ) -> Iterator[List[Values]]:
+        """
+        将数据分块, 同一块内各行的字段集合相同 (多行 VALUES 与 executemany 的要求)
+        每块行数不超过 chunk_size, 且绑定参数总数不超过后端上限
+        """
+        max_params = MAX_PARAMS.get(session.get_bind().dialect.name, DEFAULT_MAX_PARAMS)
+        # 列默认值也占用绑定参数, 按全部列数估算
+        size = max(min(self.chunk_size, max_params // len(self.columns)), 1)
+        groups: Dict[Tuple[str, ...], List[Values]] = {}
+        for item in items:
+            values = self._to_values(item, exclude_unset)
+            fields = tuple(sorted(values))
+            rows = groups.setdefault(fields, [])
+            rows.append(values)
+            if len(rows) >= size:
+                yield groups.pop(fields)
+        yield from (rows for rows in groups.values() if rows)
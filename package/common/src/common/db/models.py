@@ -1,18 +1,48 @@
+import uuid
 from datetime import datetime
-from typing import TypeVar
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
 
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import BINARY, Column, DateTime
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.types import TypeDecorator
 
 from common.data.generator import UuidGenerator
 from .base import Base
 
 
+class BinaryUuid(TypeDecorator):
+    """UUID 存储为 BINARY(16), PostgreSQL 使用原生 UUID, Python 侧为 uuid.UUID"""
+
+    impl = BINARY(16)
+    cache_ok = True
+
+    @property
+    def python_type(self):
+        return uuid.UUID
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(PG_UUID(as_uuid=True))
+        return dialect.type_descriptor(BINARY(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == 'postgresql':
+            return value
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        return value.bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        return uuid.UUID(bytes=bytes(value))
+
+
 class PKMixin:
-    id = Column(
-        String(length=64),
-        primary_key=True,
-        default=lambda: f'{UuidGenerator.by_value(datetime.now().isoformat(), True)}',
-    )
+    # UUIDv7 按时间递增, 新记录追加在主键索引末尾
+    id = Column(BinaryUuid(), primary_key=True, default=UuidGenerator.by_sortable)
 
 
 class TimeAtMixin:
@@ -20,11 +50,64 @@ class TimeAtMixin:
     updated_at = Column(DateTime(), default=datetime.now, onupdate=datetime.now)
 
 
+class ModelSerializer:
+    """
+    预编译的模型序列化器, 列名与取值函数只计算一次, 批量转换 ORM 对象或 Core Row
+    通过 BaseModel.serializer() 获取, 按 (模型, 列) 缓存
+    """
+
+    def __init__(self, model: Type['BaseModel'], columns: Optional[Sequence[str]] = None) -> None:
+        names = [c.name for c in model.__table__.columns]
+        if columns is not None:
+            unknown = set(columns) - set(names)
+            if unknown:
+                raise KeyError(f'Unknown columns for {model.__name__}: {sorted(unknown)}')
+            names = list(columns)
+        self.model = model
+        self.keys: Tuple[str, ...] = tuple(names)
+        # attrgetter 对 ORM 对象与 Core Row 均适用, 单列时返回标量, 统一包装为元组
+        getter = attrgetter(*self.keys)
+        self._getter = getter if len(self.keys) > 1 else lambda x: (getter(x),)
+
+    def to_tuple(self, obj: Any) -> Tuple[Any, ...]:
+        return self._getter(obj)
+
+    def to_dict(self, obj: Any) -> Dict[str, Any]:
+        return dict(zip(self.keys, self._getter(obj)))
+
+    def to_tuples(self, rows: Iterable[Any]) -> List[Tuple[Any, ...]]:
+        return list(map(self._getter, rows))
+
+    def to_dicts(self, rows: Iterable[Any]) -> List[Dict[str, Any]]:
+        keys = self.keys
+        return [dict(zip(keys, x)) for x in map(self._getter, rows)]
+
+    def to_columns(self, rows: Iterable[Any]) -> Dict[str, List[Any]]:
+        """按列转换, 返回 列名 -> 值列表"""
+        values = list(map(self._getter, rows))
+        if not values:
+            return {key: [] for key in self.keys}
+        return {key: list(column) for key, column in zip(self.keys, zip(*values))}
+
+
+@lru_cache(maxsize=None)
+def get_serializer(model: Type['BaseModel'], columns: Optional[Tuple[str, ...]] = None) -> ModelSerializer:
+    return ModelSerializer(model, columns)
+
+
 class BaseModel(Base):
     __abstract__ = True
 
     def as_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return self.serializer().to_dict(self)
+
+    @classmethod
+    def serializer(cls, columns: Optional[Sequence[str]] = None) -> ModelSerializer:
+        """
+        模型的序列化器, 每个模型与列组合只创建一次
+        :param columns: 只输出的列, 默认为全部列
+        """
+        return get_serializer(cls, None if columns is None else tuple(columns))
 
 
 ModelType = TypeVar('ModelType', bound=BaseModel)
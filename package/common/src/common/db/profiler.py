@@ -0,0 +1,188 @@
+# SQL 语句耗时统计
+# 在引擎的 before/after_cursor_execute 事件中计时, 按归一化后的 SQL 汇总耗时直方图与影响行数
+# 慢查询与会话中的 N+1 查询输出到日志 (通常为 AppSettings.run_logger)
+
+__all__ = [
+    'StatementStats',
+    'QueryProfiler',
+    'normalize_sql',
+]
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState
+
+# 直方图桶的上界 (毫秒), 最后一个桶为 +inf
+LATENCY_BUCKETS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+# 超出 max_statements 后新语句归入此键
+OTHER_SQL = '<other>'
+# 会话 info 中记录各查询的执行次数
+SESSION_COUNTER_KEY = 'query_profiler_counter'
+# 连接 info 中记录语句开始时间
+START_TIME_KEY = 'query_profiler_start'
+
+_SQL_PATTERNS = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),  # 字符串常量
+    (re.compile(r'%s|%\(\w+\)s|(?<!:):\w+|\$\d+'), '?'),  # 各驱动的占位符
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),  # 数字常量
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(?)'),  # IN (?, ?, ...) 与多行 VALUES
+    (re.compile(r'\(\?\)(?:\s*,\s*\(\?\))+'), '(?)'),
+    (re.compile(r'\s+'), ' '),
+)
+
+
+@lru_cache(maxsize=4096)
+def normalize_sql(sql: str) -> str:
+    """常量与占位符替换为 ?, 合并 IN 列表与多行 VALUES, 压缩空白"""
+    for pattern, repl in _SQL_PATTERNS:
+        sql = pattern.sub(repl, sql)
+    return sql.strip()
+
+
+class StatementStats:
+    """单条归一化 SQL 的统计"""
+
+    __slots__ = ('count', 'total', 'max', 'affected_rows', 'buckets')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0  # 总耗时 (毫秒)
+        self.max = 0.0
+        # 无结果集语句 (INSERT/UPDATE/DELETE 等) 的累计影响行数, 取自 cursor.rowcount, 查询语句不计入
+        self.affected_rows = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, elapsed: float, affected_rows: int = -1) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.affected_rows += max(affected_rows, 0)
+        self.buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        labels = [f'<={x}ms' for x in LATENCY_BUCKETS] + [f'>{LATENCY_BUCKETS[-1]}ms']
+        return {
+            'count': self.count,
+            'total_ms': round(self.total, 3),
+            'mean_ms': round(self.total / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max, 3),
+            'affected_rows': self.affected_rows,
+            'histogram': dict(zip(labels, self.buckets)),
+        }
+
+
+class QueryProfiler:
+    def __init__(
+        self,
+        logger: Any = None,
+        slow_threshold: float = 1000,
+        n_plus_one: int = 10,
+        max_statements: int = 1000,
+    ) -> None:
+        """
+        :param logger: 慢查询与 N+1 查询的日志, 需提供 warning 方法, 为 None 时只计数
+        :param slow_threshold: 慢查询阈值 (毫秒)
+        :param n_plus_one: 同一会话中同一查询执行达到此次数时视为 N+1 查询, 0 表示不检测
+        :param max_statements: 统计的不同 SQL 数量上限
+        """
+        self.logger = logger
+        self.slow_threshold = slow_threshold
+        self.n_plus_one = n_plus_one
+        self.max_statements = max_statements
+        self.statements: Dict[str, StatementStats] = {}
+        self.slow_queries = 0
+        self.n_plus_one_queries = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any], logger: Any = None) -> 'QueryProfiler':
+        """根据 DB.profiler 配置创建"""
+        return cls(
+            logger,
+            slow_threshold=float(settings.get('slow_threshold', 1000)),
+            n_plus_one=int(settings.get('n_plus_one', 10)),
+            max_statements=int(settings.get('max_statements', 1000)),
+        )
+
+    def install(self, engine: Engine) -> None:
+        """在引擎上注册计时事件"""
+        event.listen(engine, 'before_cursor_execute', self._before_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_execute)
+        event.listen(engine, 'handle_error', self._on_error)
+
+    def install_session(self, target: Any) -> None:
+        """在 sessionmaker 或 Session 子类上注册 N+1 查询检测"""
+        if self.n_plus_one > 0:
+            event.listen(target, 'do_orm_execute', self._on_orm_execute)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """当前统计, 语句按总耗时降序"""
+        with self._lock:
+            statements = [{'sql': sql, **stats.as_dict()} for sql, stats in self.statements.items()]
+            slow_queries, n_plus_one_queries = self.slow_queries, self.n_plus_one_queries
+        statements.sort(key=lambda x: x['total_ms'], reverse=True)
+        return {'statements': statements, 'slow_queries': slow_queries, 'n_plus_one_queries': n_plus_one_queries}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.statements.clear()
+            self.slow_queries = 0
+            self.n_plus_one_queries = 0
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault(START_TIME_KEY, []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        starts: List[float] = conn.info.get(START_TIME_KEY)
+        if not starts:
+            return
+        elapsed = (time.perf_counter() - starts.pop()) * 1000
+        # 有结果集的语句 (查询) 执行后尚未取数, rowcount 无意义, 只统计无结果集语句的影响行数
+        rows = cursor.rowcount if cursor is not None and cursor.description is None else -1
+        sql = normalize_sql(statement)
+        with self._lock:
+            stats = self.statements.get(sql)
+            if stats is None:
+                if len(self.statements) >= self.max_statements:
+                    sql = OTHER_SQL
+                stats = self.statements.setdefault(sql, StatementStats())
+            stats.add(elapsed, rows)
+            slow = elapsed >= self.slow_threshold
+            if slow:
+                self.slow_queries += 1
+        if slow and self.logger is not None:
+            self.logger.warning('slow query {:.1f}ms, affected rows: {}, sql: {}', elapsed, max(rows, 0), sql)
+
+    def _on_error(self, context) -> None:
+        # 执行失败时不会触发 after_cursor_execute, 在此丢弃开始时间, 避免在池化连接上累积
+        conn = context.connection
+        if conn is None or context.execution_context is None:
+            return
+        starts: List[float] = conn.info.get(START_TIME_KEY)
+        if starts:
+            starts.pop()
+
+    def _on_orm_execute(self, state: ORMExecuteState) -> None:
+        if not state.is_select:
+            return
+        cache_key = state.statement._generate_cache_key()
+        if cache_key is None:
+            return
+        # 缓存键不含参数值, 仅参数不同的查询 (如逐个加载关联对象) 计为同一查询
+        counter: Counter = state.session.info.setdefault(SESSION_COUNTER_KEY, Counter())
+        counter[cache_key.key] += 1
+        if counter[cache_key.key] != self.n_plus_one:
+            return
+        with self._lock:
+            self.n_plus_one_queries += 1
+        if self.logger is not None:
+            sql = normalize_sql(str(state.statement))
+            self.logger.warning('N+1 query, executed {} times in one session, sql: {}', self.n_plus_one, sql)
@@ -0,0 +1,204 @@
+# Py4J DB-API 的 asyncio 封装
+# 网关调用均为阻塞的 socket 调用, 此处将其放入有界线程池执行, 避免阻塞事件循环
+# Py4J 网关为每个线程分配独立的网关连接, 线程池的大小即同时使用的网关连接数
+
+__all__ = [
+    'AsyncConnection',
+    'AsyncCursor',
+    'connect',
+    'get_executor',
+    'set_executor',
+]
+
+import asyncio
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from pandas import DataFrame
+from py4j.java_gateway import JavaGateway
+
+from . import py4j_dbapi, py4j_pool
+from .py4j_gateway import BalancedConnection, GatewayBalancer, open_connection
+
+DEFAULT_MAX_WORKERS = 8
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> Executor:
+    """默认的有界线程池, 首次使用时创建"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix='py4j-aio')
+        return _executor
+
+
+def set_executor(executor: Executor) -> None:
+    """替换默认线程池, 已创建的连接不受影响"""
+    global _executor
+    with _executor_lock:
+        _executor = executor
+
+
+class AsyncConnection:
+    def __init__(
+        self,
+        connection: Union[py4j_dbapi.Connection, py4j_pool.PooledConnection, BalancedConnection],
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self.connection = connection
+        self._executor = executor or get_executor()
+        # DB-API 连接不能被多个线程同时使用, 同一连接上的调用串行执行
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> 'AsyncConnection':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self.connection.closed
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """在线程池中执行阻塞调用"""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    def cursor(self, stream: bool = False) -> 'AsyncCursor':
+        """创建游标对象, 参数同 py4j_dbapi.Connection.cursor"""
+        return AsyncCursor(self, self.connection.cursor(stream=stream))
+
+    async def commit(self) -> None:
+        await self.run(self.connection.commit)
+
+    async def rollback(self) -> None:
+        await self.run(self.connection.rollback)
+
+    async def close(self) -> None:
+        await self.run(self.connection.close)
+
+    async def ping(self, timeout: int = 2) -> bool:
+        return await self.run(self.connection.ping, timeout)
+
+
+class AsyncCursor:
+    def __init__(self, connection: AsyncConnection, cursor: py4j_dbapi.Cursor) -> None:
+        self.connection = connection
+        self.cursor = cursor
+
+    async def __aenter__(self) -> 'AsyncCursor':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    def __aiter__(self):
+        return self._iter_rows()
+
+    async def _iter_rows(self):
+        async for batch in self.iter_batches():
+            for row in batch:
+                yield row
+
+    @property
+    def description(self):
+        return self.cursor.description
+
+    @property
+    def rowcount(self) -> int:
+        return self.cursor.rowcount
+
+    @property
+    def arraysize(self) -> int:
+        return self.cursor.arraysize
+
+    @arraysize.setter
+    def arraysize(self, value: int) -> None:
+        self.cursor.arraysize = value
+
+    @property
+    def row_factory(self) -> str:
+        return self.cursor.row_factory
+
+    @row_factory.setter
+    def row_factory(self, value: str) -> None:
+        self.cursor.row_factory = value
+
+    @property
+    def lastrowid(self) -> None:
+        return None
+
+    async def execute(self, sql: str, parameters: Optional[Sequence[Any]] = None) -> None:
+        # 结果集元数据在 execute 中一次性读取, 之后在事件循环中访问 description 不会阻塞
+        await self.connection.run(self.cursor.execute, sql, list(parameters) if parameters else None)
+
+    async def executemany(self, sql: str, seq_of_parameters: Sequence[Sequence[Any]]) -> None:
+        await self.connection.run(self.cursor.executemany, sql, seq_of_parameters)
+
+    async def fetchone(self) -> Optional[Tuple[Any, ...]]:
+        return await self.connection.run(self.cursor.fetchone)
+
+    async def fetchmany(self, size: Optional[int] = None) -> List[Tuple[Any, ...]]:
+        return await self.connection.run(self.cursor.fetchmany, size)
+
+    async def fetchall(self) -> List[Tuple[Any, ...]]:
+        return await self.connection.run(self.cursor.fetchall)
+
+    async def iter_batches(self, size: Optional[int] = None):
+        """按批迭代结果, 同 py4j_dbapi.Cursor.iter_batches"""
+        size = size or self.cursor.connection.fetch_batch_size
+        while True:
+            batch = await self.fetchmany(size)
+            if batch:
+                yield batch
+            if len(batch) < size:
+                break
+
+    async def fetch_arrays(self, size: Optional[int] = None) -> Dict[str, np.ndarray]:
+        return await self.connection.run(self.cursor.fetch_arrays, size)
+
+    async def fetch_dataframe(self, size: Optional[int] = None) -> DataFrame:
+        return await self.connection.run(self.cursor.fetch_dataframe, size)
+
+    async def close(self) -> None:
+        await self.connection.run(self.cursor.close)
+
+
+async def connect(
+    gateway: Union[JavaGateway, GatewayBalancer],
+    db_type: str,
+    host: str,
+    port: int,
+    username: str,
+    password: str,
+    database: str,
+    executor: Optional[Executor] = None,
+    pool_options: Optional[Dict[str, Any]] = None,
+    **kwargs,
+) -> AsyncConnection:
+    """
+    创建异步数据库连接
+    :param gateway: Py4J 网关或网关负载均衡器
+    :param executor: 执行网关调用的线程池, 默认使用 get_executor()
+    :param pool_options: JDBC 连接池参数, 不为 None 时从 py4j_pool 获取连接
+    """
+    executor = executor or get_executor()
+    if pool_options is None:
+        func = partial(open_connection, gateway, db_type, host, port, username, password, database, **kwargs)
+    else:
+        func = partial(
+            py4j_pool.connect,
+            gateway, db_type, host, port, username, password, database,
+            pool_options=pool_options,
+            **kwargs,
+        )
+    connection = await asyncio.get_running_loop().run_in_executor(executor, func)
+    return AsyncConnection(connection, executor)
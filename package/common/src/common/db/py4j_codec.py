@@ -0,0 +1,199 @@
+# Py4J 批量数据编解码
+# 与 Py4jdbcAgentServer 入口对象约定的打包格式, 一次网关调用传输一批行 (结果集或批处理参数), 避免逐单元格调用
+#
+# 格式 (大端, 与 Java ByteBuffer 默认字节序一致):
+#   batch  := rows:int32 cols:int32 column{cols}
+#   column := tag:uint8 nulls:uint8{rows} payload
+#   payload:
+#     'q' int64{rows}                      整数
+#     'd' float64{rows}                    浮点数
+#     '?' uint8{rows}                      布尔值
+#     'D' int32{rows}                      日期, 距 1970-01-01 的天数
+#     'T' int64{rows}                      时间戳, 距 1970-01-01 00:00:00 的微秒数 (无时区)
+#     's' int32{rows} + utf8 bytes         字符串
+#     'N' int32{rows} + utf8 bytes         定点数, 以文本传输
+#     'b' int32{rows} + raw bytes          二进制
+# 空值所在位置的 payload 填 0 或长度 0
+
+__all__ = [
+    'CodecError',
+    'BatchCodec',
+]
+
+import struct
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+EPOCH_DATE = date(1970, 1, 1)
+EPOCH_DATETIME = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH_DATE.toordinal()
+
+HEADER = struct.Struct('>ii')
+
+# 定长列: tag -> numpy dtype
+FIXED_DTYPES: Dict[str, str] = {
+    'q': '>i8',
+    'd': '>f8',
+    '?': 'u1',
+    'D': '>i4',
+    'T': '>i8',
+}
+# 变长列: tag -> 字节解码函数
+VARLEN_DECODERS: Dict[str, Callable[[bytes], Any]] = {
+    's': lambda x: x.decode('utf-8'),
+    'N': lambda x: Decimal(x.decode('ascii')),
+    'b': bytes,
+}
+
+# Python 类型 -> 列类型标记
+TYPE_TAGS: Dict[type, str] = {
+    bool: '?',
+    int: 'q',
+    float: 'd',
+    date: 'D',
+    datetime: 'T',
+    Decimal: 'N',
+    str: 's',
+    bytes: 'b',
+    bytearray: 'b',
+}
+
+
+class CodecError(Exception): ...
+
+
+class BatchCodec:
+    @staticmethod
+    def decode_columns(buffer: bytes) -> Tuple[int, List[Tuple[str, np.ndarray, Any]]]:
+        """
+        解析打包缓冲区, 返回行数及每列的 (tag, 空值掩码, 数据)
+        定长列的数据为 numpy 数组, 变长列的数据为 bytes 列表
+        """
+        view = memoryview(buffer)
+        try:
+            rows, cols = HEADER.unpack_from(view, 0)
+            offset = HEADER.size
+            columns = []
+            for _ in range(cols):
+                tag = chr(view[offset])
+                offset += 1
+                nulls = np.frombuffer(view, dtype=np.bool_, count=rows, offset=offset)
+                offset += rows
+                if tag in FIXED_DTYPES:
+                    dtype = np.dtype(FIXED_DTYPES[tag])
+                    data = np.frombuffer(view, dtype=dtype, count=rows, offset=offset)
+                    offset += rows * dtype.itemsize
+                elif tag in VARLEN_DECODERS:
+                    lengths = np.frombuffer(view, dtype='>i4', count=rows, offset=offset)
+                    offset += rows * 4
+                    ends = np.cumsum(lengths, dtype=np.int64) + offset
+                    starts = ends - lengths
+                    data = [view[s:e].tobytes() for s, e in zip(starts.tolist(), ends.tolist())]
+                    offset = int(ends[-1]) if rows else offset
+                else:
+                    raise CodecError(f'Unknown column tag: {tag!r}')
+                columns.append((tag, nulls, data))
+        except (struct.error, ValueError, IndexError) as e:
+            raise CodecError(f'Invalid batch buffer: {e}') from e
+        return rows, columns
+
+    @staticmethod
+    def decode_rows(buffer: bytes) -> List[Tuple[Any, ...]]:
+        """将打包缓冲区解析为行元组列表"""
+        rows, columns = BatchCodec.decode_columns(buffer)
+        if not rows:
+            return []
+        values = [BatchCodec._to_python(tag, nulls, data) for tag, nulls, data in columns]
+        return list(zip(*values))
+
+    @staticmethod
+    def to_array(tag: str, nulls: np.ndarray, data: Any) -> np.ndarray:
+        """将单列数据转为本机字节序的 numpy 数组, 变长列为 object 数组 (空值为 None)"""
+        if tag == 'D':
+            return data.astype(np.int64).view('datetime64[D]')
+        if tag == 'T':
+            return data.astype(np.int64).view('datetime64[us]')
+        if tag == '?':
+            return data.astype(np.bool_)
+        if tag in FIXED_DTYPES:
+            return data.astype(data.dtype.newbyteorder('='))
+        array = np.empty(len(data), dtype=object)
+        array[:] = BatchCodec._to_python(tag, nulls, data)
+        return array
+
+    @staticmethod
+    def _to_python(tag: str, nulls: np.ndarray, data: Any) -> List[Any]:
+        if tag in VARLEN_DECODERS:
+            func = VARLEN_DECODERS[tag]
+            values = [func(x) for x in data]
+        elif tag == 'D':
+            values = [date.fromordinal(EPOCH_ORDINAL + x) for x in data.tolist()]
+        elif tag == 'T':
+            values = [EPOCH_DATETIME + timedelta(microseconds=x) for x in data.tolist()]
+        elif tag == '?':
+            values = data.astype(np.bool_).tolist()
+        else:
+            values = data.tolist()
+
+        if nulls.any():
+            for i in np.flatnonzero(nulls).tolist():
+                values[i] = None
+        return values
+
+    @staticmethod
+    def infer_tags(rows: Sequence[Sequence[Any]]) -> List[str]:
+        """根据各列非空值的 Python 类型推断列类型标记, 类型不一致的列按字符串传输"""
+        if not rows:
+            return []
+        tags = []
+        for i in range(len(rows[0])):
+            kinds = {type(row[i]) for row in rows if row[i] is not None}
+            if kinds and kinds <= {int, float}:
+                tags.append('d' if float in kinds else 'q')
+            elif len(kinds) == 1:
+                tags.append(TYPE_TAGS.get(kinds.pop(), 's'))
+            elif kinds and kinds <= {bytes, bytearray}:
+                tags.append('b')
+            else:
+                tags.append('s')
+        return tags
+
+    @staticmethod
+    def encode_rows(tags: Sequence[str], rows: Sequence[Sequence[Any]]) -> bytes:
+        """按列类型标记将行数据打包, 与 decode_rows 互逆"""
+        n_rows = len(rows)
+        parts = [HEADER.pack(n_rows, len(tags))]
+        try:
+            for i, tag in enumerate(tags):
+                BatchCodec._encode_column(parts, tag, [row[i] for row in rows])
+        except (TypeError, ValueError, OverflowError) as e:
+            raise CodecError(f'Invalid column values: {e}') from e
+        return b''.join(parts)
+
+    @staticmethod
+    def _encode_column(parts: List[bytes], tag: str, values: List[Any]) -> None:
+        nulls = bytes(x is None for x in values)
+        parts.append(tag.encode('ascii'))
+        parts.append(nulls)
+        if tag in FIXED_DTYPES:
+            if tag == 'D':
+                values = [0 if x is None else x.toordinal() - EPOCH_ORDINAL for x in values]
+            elif tag == 'T':
+                values = [0 if x is None else (x - EPOCH_DATETIME) // timedelta(microseconds=1) for x in values]
+            else:
+                values = [0 if x is None else x for x in values]
+            parts.append(np.asarray(values, dtype=FIXED_DTYPES[tag]).tobytes())
+        elif tag in VARLEN_DECODERS:
+            if tag == 's':
+                chunks = [b'' if x is None else str(x).encode('utf-8') for x in values]
+            elif tag == 'N':
+                chunks = [b'' if x is None else str(x).encode('ascii') for x in values]
+            else:
+                chunks = [b'' if x is None else bytes(x) for x in values]
+            parts.append(np.asarray([len(x) for x in chunks], dtype='>i4').tobytes())
+            parts.extend(chunks)
+        else:
+            raise CodecError(f'Unknown column tag: {tag!r}')
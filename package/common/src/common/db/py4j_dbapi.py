@@ -1,20 +1,86 @@
-from datetime import date
-from typing import Any, List, Optional, Tuple
-
+from collections import OrderedDict, deque, namedtuple
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pandas import DataFrame
+from pandas.arrays import BooleanArray, IntegerArray
 from py4j.java_gateway import JavaGateway
 
+from .py4j_codec import BatchCodec, CodecError
+
 # DB-API 2.0 Module
 apilevel = '2.0'  # 支持 DB-API 2.0
 threadsafety = 1  # 线程安全级别（1 表示线程可以共享模块，但不能共享连接）
 paramstyle = 'qmark'  # 参数风格，使用问号占位符（如 "SELECT * FROM table WHERE id = ?"）
 
+# 按列获取的单列结果: (数据, 空值掩码)
+Column = Tuple[np.ndarray, np.ndarray]
+# 单列解码方案: (ResultSet 取值方法名, 非空值的解码函数, None 表示 Py4J 已转换为 Python 类型)
+Decoder = Tuple[str, Optional[Callable[[Any], Any]]]
+# 单列描述: (name, type_code, display_size, internal_size, precision, scale, null_ok)
+ColumnDescription = Tuple[str, str, Optional[int], Optional[int], Optional[int], Optional[int], Optional[bool]]
+
+# 行工厂类型
+ROW_FACTORIES = ('tuple', 'namedtuple', 'dict', 'record')
+# ResultSetMetaData.isNullable 返回值 -> null_ok
+NULLABLE = {0: False, 1: True}
+
 
 class TypeConverter:
+    # JDBC 类型名 -> numpy 列类型, 未列出的类型使用 object
+    DTYPES = {
+        'TINYINT': 'int64',
+        'SMALLINT': 'int64',
+        'INTEGER': 'int64',
+        'BIGINT': 'int64',
+        'FLOAT': 'float64',
+        'REAL': 'float64',
+        'DOUBLE': 'float64',
+        'BIT': 'bool',
+        'BOOLEAN': 'bool',
+        'DATE': 'datetime64[D]',
+        'TIMESTAMP': 'datetime64[us]',
+    }
+
+    # JDBC 类型名 -> 解码方案, 选用可直接返回 Python 基本类型的取值方法, 避免对 Java 对象的二次调用
+    DECODERS: Dict[str, Decoder] = {
+        'BIT': ('getObject', None),
+        'BOOLEAN': ('getObject', None),
+        'TINYINT': ('getObject', None),
+        'SMALLINT': ('getObject', None),
+        'INTEGER': ('getObject', None),
+        'BIGINT': ('getString', int),  # 兼容 BIGINT UNSIGNED 返回的 BigInteger
+        'FLOAT': ('getObject', None),
+        'REAL': ('getObject', None),
+        'DOUBLE': ('getObject', None),
+        'NUMERIC': ('getString', Decimal),
+        'DECIMAL': ('getString', Decimal),
+        'CHAR': ('getString', None),
+        'VARCHAR': ('getString', None),
+        'LONGVARCHAR': ('getString', None),
+        'NCHAR': ('getString', None),
+        'NVARCHAR': ('getString', None),
+        'LONGNVARCHAR': ('getString', None),
+        'CLOB': ('getString', None),
+        'NCLOB': ('getString', None),
+        'DATE': ('getString', date.fromisoformat),
+        'TIME': ('getString', time.fromisoformat),
+        'TIMESTAMP': ('getString', datetime.fromisoformat),
+        'TIMESTAMP_WITH_TIMEZONE': ('getString', datetime.fromisoformat),
+        'BINARY': ('getBytes', None),
+        'VARBINARY': ('getBytes', None),
+        'LONGVARBINARY': ('getBytes', None),
+        'BLOB': ('getBytes', None),
+    }
+
     def __init__(self, gateway: JavaGateway) -> None:
         self.gateway = gateway
         self._jvm = gateway.jvm
         _j_types = self._jvm.Class.forName('java.sql.Types').getFields()  # type: ignore
         self._types = {x.getName(): x.getInt(None) for x in _j_types}
+        self._type_names = {v: k for k, v in self._types.items()}
 
         self.strategies = {
             gateway.jvm.java.lang.Integer: int,  # type: ignore
@@ -23,7 +89,7 @@ class TypeConverter:
             gateway.jvm.java.lang.Boolean: bool,  # type: ignore
             gateway.jvm.java.lang.Double: float,  # type: ignore
             gateway.jvm.java.lang.Float: float,  # type: ignore
-            gateway.jvm.java.sql.Date: date.fromisoformat,  # type: ignore
+            gateway.jvm.java.sql.Date: lambda x: date.fromisoformat(str(x)),  # type: ignore
         }
 
     def convert(self, java_obj) -> Any:
@@ -37,6 +103,131 @@ class TypeConverter:
                 return strategy_func(java_obj)  # 调用策略函数并返回结果
         return str(java_obj)
 
+    def plan(self, type_codes: Sequence[int]) -> List[Decoder]:
+        """
+        根据各列的 JDBC 类型码生成解码方案, 每个结果集只需计算一次
+        未知类型使用 getObject 并回退到 convert
+        """
+        return [self.DECODERS.get(self._type_names.get(x, ''), ('getObject', self.convert)) for x in type_codes]
+
+    def to_dtype(self, type_code: int) -> np.dtype:
+        """将 JDBC 类型码转换为 numpy 列类型"""
+        return np.dtype(self.DTYPES.get(self._type_names.get(type_code, ''), 'object'))
+
+
+class StatementCache:
+    """预处理语句 LRU 缓存, 以 SQL 文本为键, 归属于单个连接"""
+
+    def __init__(self, size: int = 64) -> None:
+        self.size = size
+        self._stmts: OrderedDict[str, Tuple[Any, int]] = OrderedDict()  # SQL -> (语句, fetch size)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._stmts)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            'size': self.size,
+            'count': len(self._stmts),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate,
+        }
+
+    def acquire(self, sql: str, prepare: Callable[[str], Any]) -> Tuple[Any, int]:
+        """
+        取出缓存的预处理语句及其已设置的 fetch size, 未命中时调用 prepare 创建
+        使用期间语句不在缓存中, 不会被其他游标共用
+        """
+        entry = self._stmts.pop(sql, None)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return prepare(sql), 0
+
+    def release(self, sql: str, stmt: Any, reset: bool = False, fetch_size: int = 0) -> None:
+        """
+        归还预处理语句, 超出容量时关闭最久未使用的语句
+        :param reset: 是否清除已绑定的参数
+        :param fetch_size: 语句当前的 fetch size, 下次取出时据此避免重复设置
+        """
+        if self.size <= 0 or sql in self._stmts:
+            stmt.close()
+            return
+        if reset:
+            stmt.clearParameters()
+        self._stmts[sql] = (stmt, fetch_size)
+        while len(self._stmts) > self.size:
+            _, (evicted, _) = self._stmts.popitem(last=False)
+            self.evictions += 1
+            evicted.close()
+
+    def clear(self) -> None:
+        """关闭所有缓存的预处理语句"""
+        while self._stmts:
+            _, (stmt, _) = self._stmts.popitem(last=False)
+            try:
+                stmt.close()
+            except Exception:
+                pass
+
+
+class Record:
+    """定长行记录基类, 子类由 make_row_factory 按结果集列名生成并声明 __slots__"""
+
+    __slots__ = ()
+
+    def __init__(self, *values: Any) -> None:
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __iter__(self):
+        return (getattr(self, name) for name in self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Record):
+            return self.__slots__ == other.__slots__ and tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        values = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({values})'
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def make_row_factory(kind: str, names: Sequence[str]) -> Optional[Callable[[Tuple[Any, ...]], Any]]:
+    """
+    根据结果集列名生成行工厂, 每次执行只生成一次
+    :param kind: tuple 返回 None (不转换), namedtuple / record 的字段名不合法或重复时按位置重命名 (_0, _1 ...)
+    """
+    if kind == 'tuple':
+        return None
+    if kind == 'dict':
+        keys = tuple(names)
+        return lambda row: dict(zip(keys, row))
+    fields = namedtuple('Row', names, rename=True)._fields
+    if kind == 'namedtuple':
+        return namedtuple('Row', fields)._make
+    if kind == 'record':
+        record_cls = type('Row', (Record,), {'__slots__': fields})
+        return lambda row: record_cls(*row)
+    raise ProgrammingError(f'Invalid row factory: {kind}, must be one of {ROW_FACTORIES}')
+
 
 # DB-API 2.0 Module Interface Exceptions
 # 异常类
@@ -92,19 +283,32 @@ class Connection:
         self.password = password
         self.database = database
         self.kwargs = kwargs
-
-        self.jdbc_url = f'jdbc:{self.db_type}://{self.host}:{self.port}/{self.database}'
+        # 批量拉取模式, 依赖 Py4jdbcAgentServer 入口对象提供 fetchBatch(ResultSet, int) -> byte[]
+        self.bulk_fetch = bool(kwargs.get('bulk_fetch', False))
+        self.fetch_batch_size = int(kwargs.get('fetch_batch_size', 1000))
+        # 批量绑定模式, 依赖 Py4jdbcAgentServer 入口对象提供 executeBatch(PreparedStatement, byte[]) -> long
+        self.bulk_execute = bool(kwargs.get('bulk_execute', False))
+        self.execute_batch_size = int(kwargs.get('execute_batch_size', 1000))
+        # 普通游标的 JDBC fetch size, 0 表示使用驱动默认值
+        self.fetch_size = int(kwargs.get('fetch_size', 0))
+        # 预处理语句缓存容量, 0 表示不缓存
+        self.statement_cache = StatementCache(int(kwargs.get('statement_cache_size', 64)))
+        # 新建游标的行工厂, 见 ROW_FACTORIES
+        self.row_factory = kwargs.get('row_factory', 'tuple')
+
+        self.jdbc_url = make_jdbc_url(self.db_type, self.host, self.port, self.database)
 
         self.closed = False
         self.j_connection = None
+        self._converter: Optional[TypeConverter] = None
         self._init_j_connection()
 
     def _init_j_connection(self) -> None:
         """初始化 Java 连接"""
         try:
-            # 加载 MySQL JDBC 驱动
+            # 加载 JDBC 驱动, 默认为 MySQL 驱动
             driver_class = self.gateway.jvm.Class
-            driver_class.forName('com.mysql.cj.jdbc.Driver')  # type: ignore
+            driver_class.forName(self.kwargs.get('driver', 'com.mysql.cj.jdbc.Driver'))  # type: ignore
 
             # 通过 Py4J 调用 Java 的 JDBC 接口
             self.j_connection = self.gateway.jvm.java.sql.DriverManager.getConnection(  # type: ignore
@@ -114,10 +318,23 @@ class Connection:
             )
             self.j_connection.setAutoCommit(False)  # type: ignore
         except Exception as e:
-            raise OperationalError(f'Failed to connect to database: {e}')
+            raise OperationalError(f'Failed to connect to database: {e}') from e
+
+    @property
+    def converter(self) -> TypeConverter:
+        """类型转换器, 首次使用时加载 java.sql.Types"""
+        if self._converter is None:
+            self._converter = TypeConverter(self.gateway)
+        return self._converter
+
+    @property
+    def agent(self):
+        """Py4jdbcAgentServer 入口对象"""
+        return self.gateway.entry_point
 
     def close(self) -> None:
         """关闭连接"""
+        self.statement_cache.clear()
         if self.j_connection:
             self.j_connection.close()  # type: ignore
         self.closed = True
@@ -138,41 +355,64 @@ class Connection:
             raise InterfaceError('Connection is not established')
         self.j_connection.rollback()  # type: ignore
 
-    def cursor(self) -> 'Cursor':
-        """创建游标对象"""
+    def ping(self, timeout: int = 2) -> bool:
+        """检测连接是否可用"""
+        if self.closed or self.j_connection is None:
+            return False
+        try:
+            return bool(self.j_connection.isValid(timeout))  # type: ignore
+        except Exception:
+            return False
+
+    def cursor(self, stream: bool = False) -> 'Cursor':
+        """
+        创建游标对象
+        :param stream: 是否为流式游标, 结果集由驱动按 fetch size 分批读取, 不在内存中整体缓存
+        """
         if self.closed:
             raise InterfaceError('Connection is closed')
-        return Cursor(self)
+        cursor = Cursor(self, stream=stream)
+        cursor.row_factory = self.row_factory
+        return cursor
 
 
 # 游标对象
 class Cursor:
-    def __init__(self, connection: Connection):
+    # JDBC 流式读取 MySQL 结果集需将 fetch size 设为 Integer.MIN_VALUE
+    MYSQL_STREAM_FETCH_SIZE = -(2**31)
+
+    def __init__(self, connection: Connection, stream: bool = False):
         self.connection = connection
+        self.stream = stream
 
         self.closed = False
         self._rs = None  # 结果集
-        self._description: Optional[List[Tuple[str, str, None, None, None, None, None]]] = None  # 结果集的描述
+        self._description: Optional[List[ColumnDescription]] = None  # 结果集的描述
+        self._type_codes: List[int] = []  # 结果集各列的 JDBC 类型码
         self._rowcount = -1  # 最近一次 execute 返回数据的行数或影响行数
         self._meta = None  # 元数据
         self._prep_stmt = None  # 预处理语句
+        self._prep_sql: Optional[str] = None  # 预处理语句对应的 SQL
+        self._prep_bound = False  # 预处理语句是否绑定了参数
+        self._prep_fetch_size = 0  # 预处理语句已设置的 fetch size
+        self.arraysize = 1  # fetchmany 默认获取行数
+        self._rows_buffer: Deque[Tuple[Any, ...]] = deque()  # 批量拉取的行缓冲
+        self._rs_exhausted = False  # 结果集是否已拉取完毕
+        self._dtypes: Optional[List[np.dtype]] = None  # 结果集各列的 numpy 类型
+        self._plan: Optional[List[Decoder]] = None  # 结果集各列的解码方案
+        self.row_factory = 'tuple'  # 行工厂, 见 ROW_FACTORIES, 在下次执行时生效
+        self._row_factory: Optional[Callable[[Tuple[Any, ...]], Any]] = None  # 本次执行的行工厂, None 表示返回元组
 
     @property
-    def description(self) -> Optional[List[Tuple[str, str, None, None, None, None, None]]]:
-        """获取结果集的描述信息"""
-        if self._description:
-            return self._description
-
-        descriptions = []
-        if self._meta:
-            meta_count = self._meta.getColumnCount()
-            for i in range(1, meta_count + 1):
-                column_name = self._meta.getColumnName(i)
-                column_type = self._meta.getColumnTypeName(i)
-                descriptions.append((column_name, column_type, None, None, None, None, None))
-        self._description = descriptions
+    def description(self) -> Optional[List[ColumnDescription]]:
+        """结果集的描述信息, 执行时一次性读取, 非查询语句为 None"""
         return self._description
 
+    @property
+    def rowcount(self) -> int:
+        """最近一次执行影响的行数, 查询语句或未知时为 -1"""
+        return self._rowcount
+
     def close(self) -> None:
         """关闭游标"""
         if not self.closed:
@@ -183,15 +423,11 @@ class Cursor:
     def execute(self, sql: str, parameters: Optional[List[Any]] = None) -> None:
         """执行 SQL 语句"""
         self._before_execute()
-
-        if self.closed:
-            raise InterfaceError('Cursor is closed')
-        if not sql.strip().upper().startswith(('SELECT', 'INSERT', 'UPDATE', 'DELETE')):
-            raise ProgrammingError('Unsupported SQL statement')
+        self._check_sql(sql)
 
         try:
-            # 创建 PreparedStatement
-            self._prep_stmt = self.connection.j_connection.prepareStatement(sql)  # type: ignore
+            self._prepare(sql)
+            self._set_fetch_size(self._fetch_size())
             # 设置超时时间
             # if self.timeout > 0:
             #     self._prep_stmt.setQueryTimeout(self.timeout)
@@ -203,50 +439,342 @@ class Cursor:
             if is_rs:
                 self._rs = self._prep_stmt.getResultSet()
                 self._meta = self._rs.getMetaData()
+                self._load_meta()
                 self._rowcount = -1
             else:
                 self._rowcount = self._prep_stmt.getUpdateCount()
 
+        except ProgrammingError:
+            self._close_rs()
+            self._close_prep_stmt()
+            raise
         except Exception as e:
+            # 执行失败的语句不再复用
+            self._close_prep_stmt(discard=True)
             raise DatabaseError(f'Failed to execute SQL: {e}')
 
-    def fetchone(self) -> Optional[Tuple[Any, ...]]:
+    def executemany(self, sql: str, seq_of_parameters: Sequence[Sequence[Any]]) -> None:
+        """
+        以 JDBC 批处理 (addBatch/executeBatch) 执行多组参数, 每 execute_batch_size 组提交一次
+        bulk_execute 模式下每批参数打包后通过一次网关调用绑定并执行
+        """
+        self._before_execute()
+        self._check_sql(sql)
+
+        rows = list(seq_of_parameters)
+        batch_size = max(self.connection.execute_batch_size, 1)
+        try:
+            self._prepare(sql)
+            rowcount = 0
+            for start in range(0, len(rows), batch_size):
+                chunk = rows[start:start + batch_size]
+                if self.connection.bulk_execute:
+                    count = self._execute_batch_bulk(chunk)
+                else:
+                    count = self._execute_batch(chunk)
+                rowcount = -1 if count < 0 or rowcount < 0 else rowcount + count
+            self._rowcount = rowcount
+        except CodecError as e:
+            self._close_prep_stmt(discard=True)
+            raise InterfaceError(f'Failed to encode parameters: {e}')
+        except Exception as e:
+            self._close_prep_stmt(discard=True)
+            raise DatabaseError(f'Failed to execute SQL: {e}')
+
+    def __iter__(self):
+        """逐行迭代结果, 每次按 fetch_batch_size 拉取"""
+        for batch in self.iter_batches():
+            yield from batch
+
+    def iter_batches(self, size: Optional[int] = None):
+        """
+        按批迭代结果, 每批为至多 size 行的列表, 内存占用与结果集大小无关
+        :param size: 每批行数, 默认为 fetch_batch_size
+        """
+        if self.closed or not self._rs:
+            raise InterfaceError('Cursor is closed or no result set')
+        size = size or self.connection.fetch_batch_size
+        while True:
+            batch = self._fetch_rows(size)
+            if batch:
+                yield self._make_rows(batch)
+            if len(batch) < size:
+                break
+
+    def fetchone(self) -> Optional[Any]:
         """获取一条结果"""
         if self.closed or not self._rs:
             raise InterfaceError('Cursor is closed or no result set')
-        if self._rs.next():
-            return tuple(self._rs.getObject(i) for i in range(1, len(self.description) + 1))  # type: ignore
-        return None
+        rows = self._fetch_rows(1)
+        return self._make_rows(rows)[0] if rows else None
 
-    def fetchall(self) -> List[Tuple[Any, ...]]:
+    def fetchall(self) -> List[Any]:
         """获取所有结果"""
         if self.closed or not self._rs:
             raise InterfaceError('Cursor is closed or no result set')
         rows = []
-        while self._rs.next():
-            rows.append(tuple(self._rs.getObject(i) for i in range(1, len(self.description) + 1)))  # type: ignore
-        return rows
+        size = self.connection.fetch_batch_size
+        while True:
+            batch = self._fetch_rows(size)
+            rows.extend(batch)
+            if len(batch) < size:
+                break
+        return self._make_rows(rows)
 
-    def fetchmany(self, size: Optional[int] = None) -> List[Tuple[Any, ...]]:
+    def fetchmany(self, size: Optional[int] = None) -> List[Any]:
         """获取多条结果"""
         if self.closed or not self._rs:
             raise InterfaceError('Cursor is closed or no result set')
         if size is None:
-            size = 1
+            size = self.arraysize
+        return self._make_rows(self._fetch_rows(size))
+
+    def fetch_arrays(self, size: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        按列获取结果, 每列为一个 numpy 数组, 不构造行元组
+        含空值的整数列转为 float64 并以 NaN 表示空值, 含空值的布尔列转为 object
+        :param size: 获取的最大行数, 默认获取全部
+        """
+        names, columns = self._fetch_columns(size)
+        arrays = {}
+        for name, (values, mask) in zip(names, columns):
+            if mask.any():
+                if values.dtype.kind in 'iu':
+                    values = values.astype(np.float64)
+                elif values.dtype.kind == 'b':
+                    values = values.astype(object)
+                values[mask] = None
+            arrays[name] = values
+        return arrays
+
+    def fetch_dataframe(self, size: Optional[int] = None) -> DataFrame:
+        """
+        按列获取结果并直接构造 DataFrame
+        含空值的整数列、布尔列使用 pandas 可空类型 (Int64, boolean)
+        :param size: 获取的最大行数, 默认获取全部
+        """
+        names, columns = self._fetch_columns(size)
+        data = {}
+        for i, (values, mask) in enumerate(columns):
+            if mask.any():
+                if values.dtype.kind in 'iu':
+                    values = IntegerArray(values, mask)
+                elif values.dtype.kind == 'b':
+                    values = BooleanArray(values, mask)
+                else:
+                    values[mask] = None
+            data[i] = values
+        df = DataFrame(data, copy=False)
+        df.columns = names
+        return df
+
+    def _fetch_columns(self, size: Optional[int] = None) -> Tuple[List[str], List[Column]]:
+        """按列获取至多 size 行结果, 返回列名及每列的 (数据, 空值掩码)"""
+        if self.closed or not self._rs:
+            raise InterfaceError('Cursor is closed or no result set')
+
+        names = [x[0] for x in self.description]  # type: ignore
+        dtypes = self._column_dtypes()
+        batch_size = self.connection.fetch_batch_size
+        remaining = -1 if size is None else size
+        chunks = []
+
+        # 先消费行缓冲中已拉取的行
+        if self._rows_buffer:
+            count = len(self._rows_buffer) if remaining < 0 else min(remaining, len(self._rows_buffer))
+            chunks.append(self._rows_to_columns([self._rows_buffer.popleft() for _ in range(count)], dtypes))
+            remaining = remaining - count if remaining > 0 else remaining
+
+        while remaining != 0:
+            count = batch_size if remaining < 0 else min(remaining, batch_size)
+            if self.connection.bulk_fetch:
+                if self._rs_exhausted:
+                    break
+                chunk, fetched = self._fetch_batch_columns(count, dtypes)
+            else:
+                rows = self._fetch_rows_by_cell(count)
+                chunk, fetched = self._rows_to_columns(rows, dtypes), len(rows)
+            chunks.append(chunk)
+            remaining = remaining - fetched if remaining > 0 else remaining
+            if fetched < count:
+                break
+
+        columns = []
+        for i, dtype in enumerate(dtypes):
+            if not chunks:
+                columns.append((np.empty(0, dtype=dtype), np.empty(0, dtype=np.bool_)))
+            elif len(chunks) == 1:
+                columns.append(chunks[0][i])
+            else:
+                values = np.concatenate([chunk[i][0] for chunk in chunks])
+                mask = np.concatenate([chunk[i][1] for chunk in chunks])
+                columns.append((values, mask))
+        return names, columns
+
+    def _column_dtypes(self) -> List[np.dtype]:
+        """根据结果集各列的类型码计算 numpy 类型"""
+        if self._dtypes is None:
+            converter = self.connection.converter
+            self._dtypes = [converter.to_dtype(x) for x in self._type_codes]
+        return self._dtypes
+
+    def _rows_to_columns(self, rows: List[Tuple[Any, ...]], dtypes: List[np.dtype]) -> List[Column]:
+        """将行元组转为按列的 (数据, 空值掩码)"""
+        columns = []
+        for i, dtype in enumerate(dtypes):
+            values = [row[i] for row in rows]
+            mask = np.fromiter((x is None for x in values), dtype=np.bool_, count=len(values))
+            if dtype.kind in 'iub' and mask.any():
+                values = [0 if x is None else x for x in values]
+            array = np.empty(len(values), dtype=dtype)
+            array[:] = values
+            columns.append((array, mask))
+        return columns
+
+    def _fetch_batch_columns(self, size: int, dtypes: List[np.dtype]) -> Tuple[List[Column], int]:
+        """通过一次网关调用拉取一批行, 直接解析为按列的 (数据, 空值掩码)"""
+        try:
+            buffer = self.connection.agent.fetchBatch(self._rs, size)
+            rows, columns = BatchCodec.decode_columns(buffer)
+            chunk = [
+                (BatchCodec.to_array(tag, nulls, data).astype(dtype, copy=False), nulls)
+                for (tag, nulls, data), dtype in zip(columns, dtypes)
+            ]
+        except CodecError as e:
+            raise InterfaceError(f'Failed to decode rows: {e}')
+        except Exception as e:
+            raise DatabaseError(f'Failed to fetch rows: {e}')
+        if rows < size:
+            self._rs_exhausted = True
+        return chunk, rows
+
+    def _fetch_rows(self, size: int) -> List[Tuple[Any, ...]]:
+        """获取至多 size 行结果"""
+        if not self.connection.bulk_fetch:
+            return self._fetch_rows_by_cell(size)
+
+        while len(self._rows_buffer) < size and not self._rs_exhausted:
+            self._fetch_batch(max(size - len(self._rows_buffer), self.connection.fetch_batch_size))
+        return [self._rows_buffer.popleft() for _ in range(min(size, len(self._rows_buffer)))]
+
+    def _fetch_rows_by_cell(self, size: int) -> List[Tuple[Any, ...]]:
+        """逐单元格按解码方案获取结果"""
+        getters = [(i, getattr(self._rs, name), decoder) for i, (name, decoder) in enumerate(self._decoder_plan(), 1)]
         rows = []
         for _ in range(size):
-            if self._rs.next():
-                rows.append(tuple(self._rs.getObject(i) for i in range(1, len(self.description) + 1)))  # type: ignore
-            else:
+            if not self._rs.next():  # type: ignore
                 break
+            row = []
+            for i, getter, decoder in getters:
+                value = getter(i)
+                if value is not None and decoder is not None:
+                    value = decoder(value)
+                row.append(value)
+            rows.append(tuple(row))
         return rows
 
+    def _decoder_plan(self) -> List[Decoder]:
+        """结果集各列的解码方案, 每次执行只计算一次"""
+        if self._plan is None:
+            self._plan = self.connection.converter.plan(self._type_codes)
+        return self._plan
+
+    def _load_meta(self) -> None:
+        """读取结果集元数据, 生成描述与行工厂, 之后的取数不再访问 ResultSetMetaData"""
+        meta = self._meta
+        type_codes = []
+        description = []
+        for i in range(1, meta.getColumnCount() + 1):  # type: ignore
+            type_codes.append(meta.getColumnType(i))  # type: ignore
+            description.append((
+                meta.getColumnName(i),  # type: ignore
+                meta.getColumnTypeName(i),  # type: ignore
+                meta.getColumnDisplaySize(i),  # type: ignore
+                None,
+                meta.getPrecision(i),  # type: ignore
+                meta.getScale(i),  # type: ignore
+                NULLABLE.get(meta.isNullable(i)),  # type: ignore
+            ))
+        self._row_factory = make_row_factory(self.row_factory, [x[0] for x in description])
+        self._type_codes = type_codes
+        self._description = description
+
+    def _make_rows(self, rows: List[Tuple[Any, ...]]) -> List[Any]:
+        """按行工厂转换行元组"""
+        factory = self._row_factory
+        if factory is None:
+            return rows
+        return [factory(row) for row in rows]
+
+    def _fetch_batch(self, size: int) -> None:
+        """通过一次网关调用拉取一批行, 存入行缓冲"""
+        try:
+            buffer = self.connection.agent.fetchBatch(self._rs, size)
+            rows = BatchCodec.decode_rows(buffer)
+        except CodecError as e:
+            raise InterfaceError(f'Failed to decode rows: {e}')
+        except Exception as e:
+            raise DatabaseError(f'Failed to fetch rows: {e}')
+        self._rows_buffer.extend(rows)
+        if len(rows) < size:
+            self._rs_exhausted = True
+
+    def _prepare(self, sql: str) -> None:
+        """从连接的缓存中获取 PreparedStatement"""
+        self._prep_stmt, self._prep_fetch_size = self.connection.statement_cache.acquire(
+            sql, self.connection.j_connection.prepareStatement  # type: ignore
+        )
+        self._prep_sql = sql
+
+    def _fetch_size(self) -> int:
+        """本次执行使用的 JDBC fetch size"""
+        if not self.stream:
+            return self.connection.fetch_size
+        if self.connection.db_type == 'mysql':
+            return self.MYSQL_STREAM_FETCH_SIZE
+        return self.connection.fetch_size or self.connection.fetch_batch_size
+
+    def _set_fetch_size(self, fetch_size: int) -> None:
+        """设置 fetch size, 与语句当前值相同时跳过"""
+        if fetch_size != self._prep_fetch_size:
+            self._prep_stmt.setFetchSize(fetch_size)  # type: ignore
+            self._prep_fetch_size = fetch_size
+
+    def _check_sql(self, sql: str) -> None:
+        """执行 SQL 前的检查"""
+        if self.closed:
+            raise InterfaceError('Cursor is closed')
+        if not sql.strip().upper().startswith(('SELECT', 'INSERT', 'UPDATE', 'DELETE')):
+            raise ProgrammingError('Unsupported SQL statement')
+
+    def _execute_batch(self, rows: List[Sequence[Any]]) -> int:
+        """逐值绑定参数并加入批处理, 执行后返回影响行数, 未知时为 -1"""
+        for parameters in rows:
+            self._set_prep_stmt(list(parameters))
+            self._prep_stmt.addBatch()  # type: ignore
+        counts = self._prep_stmt.executeBatch()  # type: ignore
+        # 一次调用取回全部计数, 避免逐元素访问 Java 数组
+        text = self.connection.gateway.jvm.java.util.Arrays.toString(counts)  # type: ignore
+        values = [int(x) for x in text.strip('[]').split(',') if x.strip()]
+        return -1 if any(x < 0 for x in values) else sum(values)
+
+    def _execute_batch_bulk(self, rows: List[Sequence[Any]]) -> int:
+        """将一批参数打包, 通过一次网关调用完成绑定与执行, 返回影响行数, 未知时为 -1"""
+        buffer = BatchCodec.encode_rows(BatchCodec.infer_tags(rows), rows)
+        return int(self.connection.agent.executeBatch(self._prep_stmt, buffer))
+
     def _before_execute(self) -> None:
         """执行 SQL 前的清理工作"""
         self._close_rs()
         self._close_prep_stmt()
         self._meta = None
         self._description = None
+        self._type_codes = []
+        self._row_factory = None
+        self._rows_buffer.clear()
+        self._rs_exhausted = False
+        self._dtypes = None
+        self._plan = None
 
     def _close_rs(self) -> None:
         """关闭结果集"""
@@ -254,18 +782,32 @@ class Cursor:
             self._rs.close()
         self._rs = None
 
-    def _close_prep_stmt(self) -> None:
-        """关闭预处理语句"""
+    def _close_prep_stmt(self, discard: bool = False) -> None:
+        """归还预处理语句至连接的缓存, discard 为 True 时直接关闭"""
         if self._prep_stmt:
-            self._prep_stmt.close()
+            if discard or self._prep_sql is None:
+                self._prep_stmt.close()
+            else:
+                self.connection.statement_cache.release(
+                    self._prep_sql, self._prep_stmt, reset=self._prep_bound, fetch_size=self._prep_fetch_size
+                )
         self._prep_stmt = None
+        self._prep_sql = None
+        self._prep_bound = False
+        self._prep_fetch_size = 0
 
     def _set_prep_stmt(self, parameters: List[Any]) -> None:
         """设置预处理语句的参数"""
+        self._prep_bound = True
         for i, param in enumerate(parameters, start=1):
             self._prep_stmt.setObject(i, param)  # type: ignore
 
 
+def make_jdbc_url(db_type: str, host: str, port: int, database: str) -> str:
+    """拼接 JDBC 连接地址"""
+    return f'jdbc:{db_type}://{host}:{port}/{database}'
+
+
 def connect(gateway: JavaGateway, db_type: str, host: str, port: int,
             username: str, password: str, database: str, **kwargs) -> Connection:
     """创建数据库连接"""
@@ -1,11 +1,26 @@
 import json
+from typing import Any, Dict, Optional, Union
 
 from py4j.java_gateway import JavaGateway
+from sqlalchemy import pool
+from sqlalchemy.connectors.asyncio import (
+    AsyncAdapt_dbapi_connection,
+    AsyncAdapt_dbapi_cursor,
+    AsyncAdapt_dbapi_ss_cursor,
+)
 from sqlalchemy.dialects import registry
-from sqlalchemy.engine.default import DefaultDialect
+from sqlalchemy.engine.default import DefaultDialect, DefaultExecutionContext
 from sqlalchemy.engine.url import URL
+from sqlalchemy.util.concurrency import await_only
 
-import py4j_dbapi
+from . import py4j_aio, py4j_dbapi, py4j_pool
+from .py4j_gateway import GatewayBalancer, open_connection
+
+
+class Py4jExecutionContext(DefaultExecutionContext):
+    def create_server_side_cursor(self):
+        # stream_results=True 时使用流式游标
+        return self._dbapi_connection.cursor(stream=True)
 
 
 # 自定义Dialect
@@ -14,16 +29,35 @@ class Py4jDialect(DefaultDialect):
     driver = 'py4j'
 
     paramstyle = 'qmark'
+    supports_statement_cache = True
+    supports_server_side_cursors = True
+    execution_ctx_cls = Py4jExecutionContext
+
+    # 多行 INSERT 与 ORM 批量插入, 无 RETURNING 时由 cursor.executemany 走 JDBC 批处理
+    supports_multivalues_insert = True
+    use_insertmanyvalues = True
+    use_insertmanyvalues_wo_returning = False
 
-    def __init__(self, gateway: JavaGateway, **kwargs):
+    def __init__(
+        self,
+        gateway: Union[JavaGateway, GatewayBalancer],
+        jdbc_pool: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ):
+        """
+        :param gateway: Py4J 网关, 或在多个网关间分配连接的 GatewayBalancer
+        :param jdbc_pool: JDBC 连接池参数 (见 py4j_pool.ConnectionPool), 为 None 时不使用 JDBC 连接池;
+            与 SQLAlchemy 连接池叠加使用时, SQLAlchemy 关闭连接即归还 JDBC 连接池
+        """
         super().__init__(**kwargs)
 
         self.gateway = gateway
+        self.jdbc_pool = jdbc_pool
         self._json_deserializer = json.loads
 
     def create_connect_args(self, url: URL):
         name, db_type = url.drivername.split('+')
-        if name != self.name:
+        if name != self.driver:
             raise ValueError
 
         return (
@@ -39,6 +73,14 @@ class Py4jDialect(DefaultDialect):
             },
         )
 
+    def connect(self, *cargs, **cparams):
+        if self.jdbc_pool is not None:
+            return py4j_pool.connect(*cargs, pool_options=self.jdbc_pool, **cparams)
+        return open_connection(*cargs, **cparams)
+
+    def do_ping(self, dbapi_connection) -> bool:
+        return dbapi_connection.ping()
+
     def do_begin(self, dbapi_connection):
         return super().do_begin(dbapi_connection)
 
@@ -46,12 +88,108 @@ class Py4jDialect(DefaultDialect):
         return super().do_commit(dbapi_connection)
 
     @classmethod
-    def dbapi(cls):
+    def import_dbapi(cls):
         # 返回自定义的 DB-API 2.0 模块
         return py4j_dbapi
 
 
+# 异步 DB-API 适配, 供 SQLAlchemy 异步引擎在 greenlet 中调用 py4j_aio
+class AsyncAdaptPy4jCursor(AsyncAdapt_dbapi_cursor):
+    __slots__ = ()
+
+    # 基类 close 只清空缓冲行, 且可能在 greenlet 之外调用 (如同步的 result.fetchall), 不能在其中执行 I/O;
+    # 结果已在执行时全部缓冲, 执行后即在 greenlet 中关闭底层游标, 预处理语句归还语句缓存
+    async def _execute_async(self, operation, parameters):
+        self._reopen()
+        try:
+            return await super()._execute_async(operation, parameters)
+        finally:
+            await self._cursor.close()
+
+    async def _executemany_async(self, operation, seq_of_parameters):
+        self._reopen()
+        try:
+            return await super()._executemany_async(operation, seq_of_parameters)
+        finally:
+            await self._cursor.close()
+
+    def _reopen(self) -> None:
+        """同一游标再次执行时替换已关闭的底层游标"""
+        if self._cursor.cursor.closed:
+            self._cursor = self._connection.cursor()
+
+
+class AsyncAdaptPy4jSSCursor(AsyncAdapt_dbapi_ss_cursor):
+    __slots__ = ()
+
+    def __init__(self, adapt_connection):
+        self._adapt_connection = adapt_connection
+        self._connection = adapt_connection._connection
+        self.await_ = adapt_connection.await_
+
+        cursor = self._connection.cursor(stream=True)
+        self._cursor = self.await_(cursor.__aenter__())
+
+
+class AsyncAdaptPy4jConnection(AsyncAdapt_dbapi_connection):
+    _cursor_cls = AsyncAdaptPy4jCursor
+    _ss_cursor_cls = AsyncAdaptPy4jSSCursor
+
+    __slots__ = ()
+
+    def ping(self, timeout: int = 2) -> bool:
+        return self.await_(self._connection.ping(timeout))
+
+
+class AsyncAdaptPy4jDbapi:
+    """异步 DB-API 模块适配, 异常类型及模块属性与 py4j_dbapi 一致"""
+
+    def __init__(self) -> None:
+        for name in (
+            'apilevel', 'threadsafety', 'paramstyle',
+            'Error', 'Warning', 'InterfaceError', 'DatabaseError', 'DataError', 'OperationalError',
+            'IntegrityError', 'InternalError', 'ProgrammingError', 'NotSupportedError',
+        ):
+            setattr(self, name, getattr(py4j_dbapi, name))
+
+    def connect(self, *args, **kwargs) -> AsyncAdaptPy4jConnection:
+        return AsyncAdaptPy4jConnection(self, await_only(py4j_aio.connect(*args, **kwargs)))
+
+
+class AsyncPy4jExecutionContext(DefaultExecutionContext):
+    def create_server_side_cursor(self):
+        return self._dbapi_connection.cursor(server_side=True)
+
+
+class AsyncPy4jDialect(Py4jDialect):
+    """Py4jDialect 的异步版本, 用于 create_async_engine, 如 py4j_async+mysql://..."""
+
+    driver = 'py4j_async'
+    is_async = True
+    supports_statement_cache = True
+    execution_ctx_cls = AsyncPy4jExecutionContext
+
+    @classmethod
+    def import_dbapi(cls):
+        return AsyncAdaptPy4jDbapi()
+
+    @classmethod
+    def get_pool_class(cls, url: URL):
+        return pool.AsyncAdaptedQueuePool
+
+    def connect(self, *cargs, **cparams):
+        if self.jdbc_pool is not None:
+            cparams['pool_options'] = self.jdbc_pool
+        return self.loaded_dbapi.connect(*cargs, **cparams)
+
+    def get_driver_connection(self, connection):
+        return connection._connection
+
+
 # 注册 Dialect
 registry.register('py4j.mysql', __name__, 'Py4jDialect')
 registry.register('py4j.gauss', __name__, 'Py4jDialect')
 registry.register('py4j.oracle', __name__, 'Py4jDialect')
+registry.register('py4j_async.mysql', __name__, 'AsyncPy4jDialect')
+registry.register('py4j_async.gauss', __name__, 'AsyncPy4jDialect')
+registry.register('py4j_async.oracle', __name__, 'AsyncPy4jDialect')
@@ -0,0 +1,250 @@
+# Py4J 网关负载均衡
+# 将数据库连接分散到多个 Py4jdbcAgentServer 网关 (JVM 进程) 上, 支持轮询与最少连接两种策略, 网关不可用时自动切换
+#
+# 配置示例 (Services.Py4jdbcAgentServer.<name>):
+#   host: "localhost"
+#   port: 38801
+#   driver: "com.mysql.cj.jdbc.Driver"
+#   strategy: "least_busy"        # round_robin (默认) / least_busy
+#   retry_interval: 30            # 网关不可用后, 再次尝试前的等待时间 (秒)
+#   endpoints:                    # 可选, 多个网关地址, 未配置时使用 host/port
+#     - host: "localhost"
+#       port: 38801
+#     - host: "localhost"
+#       port: 38811
+
+__all__ = [
+    'GatewayEndpoint',
+    'GatewayBalancer',
+    'BalancedConnection',
+    'open_connection',
+]
+
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from py4j.java_gateway import GatewayParameters, JavaGateway
+from py4j.protocol import Py4JNetworkError
+
+from . import py4j_dbapi
+from .py4j_dbapi import Connection, InterfaceError, OperationalError
+
+STRATEGIES = ('round_robin', 'least_busy')
+
+
+def default_gateway_factory(host: str, port: int) -> JavaGateway:
+    return JavaGateway(gateway_parameters=GatewayParameters(address=host, port=port))
+
+
+class GatewayEndpoint:
+    def __init__(self, host: str, port: int, factory: Callable[[str, int], Any]) -> None:
+        self.host = host
+        self.port = port
+        self._factory = factory
+        self._gateway = None
+        self.active = 0  # 当前打开的连接数
+        self.failures = 0  # 累计失败次数
+        self.down_until = 0.0  # 不可用截止时间 (time.monotonic)
+
+    def __str__(self) -> str:
+        return f'{self.host}:{self.port}'
+
+    @property
+    def gateway(self):
+        """网关对象, 首次使用时创建"""
+        if self._gateway is None:
+            self._gateway = self._factory(self.host, self.port)
+        return self._gateway
+
+    def available(self, now: float) -> bool:
+        return now >= self.down_until
+
+    def close(self) -> None:
+        if self._gateway is not None:
+            try:
+                self._gateway.close()
+            except Exception:
+                pass
+            self._gateway = None
+
+
+class BalancedConnection:
+    """负载均衡器分配的连接, close 时释放所在网关的连接计数"""
+
+    def __init__(self, balancer: 'GatewayBalancer', endpoint: GatewayEndpoint, conn: Connection) -> None:
+        self._balancer = balancer
+        self.endpoint = endpoint
+        self._conn: Optional[Connection] = conn
+
+    @property
+    def connection(self) -> Connection:
+        if self._conn is None:
+            raise InterfaceError('Connection is closed')
+        return self._conn
+
+    @property
+    def closed(self) -> bool:
+        return self._conn is None or self._conn.closed
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.connection, name)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            try:
+                conn.close()
+            finally:
+                self._balancer.release(self.endpoint)
+
+    def commit(self) -> None:
+        self.connection.commit()
+
+    def rollback(self) -> None:
+        self.connection.rollback()
+
+    def ping(self, timeout: int = 2) -> bool:
+        return self._conn is not None and self._conn.ping(timeout)
+
+    def cursor(self, stream: bool = False) -> py4j_dbapi.Cursor:
+        return self.connection.cursor(stream=stream)
+
+
+class GatewayBalancer:
+    def __init__(
+        self,
+        endpoints: List[Tuple[str, int]],
+        strategy: str = 'round_robin',
+        retry_interval: float = 30.0,
+        gateway_factory: Optional[Callable[[str, int], Any]] = None,
+        **connect_kwargs,
+    ) -> None:
+        """
+        :param endpoints: 网关地址列表 [(host, port), ...]
+        :param strategy: 选择策略, round_robin 轮询, least_busy 选择打开连接数最少的网关
+        :param retry_interval: 网关不可用后, 再次尝试前的等待时间 (秒)
+        :param gateway_factory: 创建网关的函数, 默认创建 JavaGateway
+        :param connect_kwargs: 创建连接时的默认参数, 如 driver
+        """
+        if not endpoints:
+            raise ValueError('No gateway endpoints configured')
+        if strategy not in STRATEGIES:
+            raise ValueError(f'Invalid strategy: {strategy}, must be one of {STRATEGIES}')
+
+        factory = gateway_factory or default_gateway_factory
+        self.endpoints = [GatewayEndpoint(host, int(port), factory) for host, port in endpoints]
+        self.strategy = strategy
+        self.retry_interval = retry_interval
+        self.connect_kwargs = connect_kwargs
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any], **kwargs) -> 'GatewayBalancer':
+        """根据 Services.Py4jdbcAgentServer 下单个服务的配置创建"""
+        endpoints = settings.get('endpoints') or [{'host': settings.get('host'), 'port': settings.get('port')}]
+        connect_kwargs = {'driver': settings['driver']} if settings.get('driver') else {}
+        connect_kwargs.update(kwargs)
+        return cls(
+            [(x['host'], x['port']) for x in endpoints],
+            strategy=settings.get('strategy', 'round_robin'),
+            retry_interval=float(settings.get('retry_interval', 30.0)),
+            **connect_kwargs,
+        )
+
+    def candidates(self) -> List[GatewayEndpoint]:
+        """按策略排列的候选网关, 不可用的网关排在最后"""
+        now = time.monotonic()
+        with self._lock:
+            up = [x for x in self.endpoints if x.available(now)]
+            down = [x for x in self.endpoints if not x.available(now)]
+            if self.strategy == 'least_busy':
+                up.sort(key=lambda x: x.active)
+            elif up:
+                # 只在可用网关之间轮询, 避免不可用网关的份额全部落到下一个网关上
+                start = next(self._counter) % len(up)
+                up = up[start:] + up[:start]
+        return up + down
+
+    def connect(
+        self,
+        db_type: str,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        database: str,
+        **kwargs,
+    ) -> BalancedConnection:
+        """在候选网关上依次尝试创建连接, 网关网络异常时切换到下一个网关"""
+        errors = []
+        for endpoint in self.candidates():
+            with self._lock:
+                endpoint.active += 1
+            try:
+                conn = py4j_dbapi.connect(
+                    endpoint.gateway, db_type, host, port, username, password, database,
+                    **{**self.connect_kwargs, **kwargs},
+                )
+            except Exception as e:
+                self.release(endpoint)
+                if not self._is_network_error(e):
+                    raise
+                self._mark_down(endpoint)
+                errors.append(f'{endpoint}: {e}')
+                continue
+            self._mark_up(endpoint)
+            return BalancedConnection(self, endpoint, conn)
+        raise OperationalError(f'All gateways are unavailable: {errors}')
+
+    def release(self, endpoint: GatewayEndpoint) -> None:
+        with self._lock:
+            endpoint.active -= 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """各网关的连接数与可用状态"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                str(x): {'active': x.active, 'failures': x.failures, 'available': x.available(now)}
+                for x in self.endpoints
+            }
+
+    def close(self) -> None:
+        for endpoint in self.endpoints:
+            endpoint.close()
+
+    def _mark_down(self, endpoint: GatewayEndpoint) -> None:
+        with self._lock:
+            endpoint.failures += 1
+            endpoint.down_until = time.monotonic() + self.retry_interval
+
+    def _mark_up(self, endpoint: GatewayEndpoint) -> None:
+        with self._lock:
+            endpoint.down_until = 0.0
+
+    @staticmethod
+    def _is_network_error(e: Optional[BaseException]) -> bool:
+        while e is not None:
+            if isinstance(e, (Py4JNetworkError, ConnectionError)):
+                return True
+            e = e.__cause__ or e.__context__
+        return False
+
+
+def open_connection(
+    gateway: Union[JavaGateway, GatewayBalancer],
+    db_type: str,
+    host: str,
+    port: int,
+    username: str,
+    password: str,
+    database: str,
+    **kwargs,
+) -> Union[Connection, BalancedConnection]:
+    """创建数据库连接, gateway 为负载均衡器时由其选择网关"""
+    if isinstance(gateway, GatewayBalancer):
+        return gateway.connect(db_type, host, port, username, password, database, **kwargs)
+    return py4j_dbapi.connect(gateway, db_type, host, port, username, password, database, **kwargs)
@@ -0,0 +1,326 @@
+# Py4J JDBC 连接池
+# 复用 py4j_dbapi.Connection, 避免每次连接都执行 Class.forName 与 DriverManager.getConnection
+# 连接池按 (jdbc_url, username, password, 连接参数) 区分, 相同配置的连接在多个引擎之间共享
+
+__all__ = [
+    'PoolStats',
+    'ConnectionPool',
+    'PooledConnection',
+    'PoolManager',
+    'POOL_MANAGER',
+    'connect',
+]
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, Union
+
+from py4j.java_gateway import JavaGateway
+
+from . import py4j_dbapi
+from .py4j_dbapi import Connection, InterfaceError, OperationalError
+from .py4j_gateway import GatewayBalancer, open_connection
+
+
+class PoolStats:
+    """连接池计数器"""
+
+    def __init__(self) -> None:
+        self.hits = 0  # 复用空闲连接次数
+        self.misses = 0  # 新建连接次数
+        self.waits = 0  # 连接池已满需等待次数
+        self.timeouts = 0  # 等待超时次数
+        self.invalid = 0  # 校验失败被丢弃的连接数
+        self.expired = 0  # 空闲超时被关闭的连接数
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        creator: Callable[[], Connection],
+        min_size: int = 0,
+        max_size: int = 10,
+        idle_timeout: float = 300.0,
+        timeout: float = 30.0,
+        validate: bool = True,
+        validate_timeout: int = 2,
+    ) -> None:
+        """
+        :param creator: 新建连接的函数
+        :param min_size: 保留的最小连接数, 空闲超时不会关闭这部分连接
+        :param max_size: 最大连接数 (含已借出的连接)
+        :param idle_timeout: 空闲超时时间 (秒), 小于等于 0 表示不超时
+        :param timeout: 连接池已满时的最长等待时间 (秒)
+        :param validate: 借出前是否校验连接
+        :param validate_timeout: 校验连接的超时时间 (秒)
+        """
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(f'Invalid pool size: min_size={min_size}, max_size={max_size}')
+
+        self._creator = creator
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.validate = validate
+        self.validate_timeout = validate_timeout
+
+        self.stats = PoolStats()
+        self._idle: Deque[Tuple[Connection, float]] = deque()  # (连接, 归还时间)
+        self._size = 0  # 已创建且未关闭的连接数
+        self._cond = threading.Condition()
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def fill(self) -> None:
+        """预先创建 min_size 个连接"""
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            conn = self._create()
+            self._put(conn)
+
+    def acquire(self) -> Connection:
+        """借出连接"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            conn = None
+            with self._cond:
+                if self._closed:
+                    raise InterfaceError('Connection pool is closed')
+                self._expire()
+                if self._idle:
+                    conn, _ = self._idle.pop()  # 后进先出, 优先复用最近使用的连接
+                elif self._size < self.max_size:
+                    self._size += 1
+                    self.stats.misses += 1
+                else:
+                    self.stats.waits += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._cond.wait(remaining):
+                        self.stats.timeouts += 1
+                        raise OperationalError(f'Connection pool exhausted, max_size={self.max_size}')
+                    continue
+
+            if conn is None:
+                return self._create()
+            if not self.validate or conn.ping(self.validate_timeout):
+                with self._cond:
+                    self.stats.hits += 1
+                return conn
+
+            with self._cond:
+                self.stats.invalid += 1
+            self._discard(conn)
+
+    def release(self, conn: Connection) -> None:
+        """归还连接, 未提交的事务会被回滚"""
+        if not conn.closed:
+            try:
+                conn.rollback()
+            except Exception:
+                self._discard(conn)
+                return
+        if conn.closed or self._closed:
+            self._discard(conn)
+            return
+        self._put(conn)
+
+    def close(self) -> None:
+        """关闭连接池及所有空闲连接, 已借出的连接在归还时关闭"""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+        for conn in idle:
+            self._discard(conn)
+
+    def _create(self) -> Connection:
+        try:
+            return self._creator()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def _put(self, conn: Connection) -> None:
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def _discard(self, conn: Connection) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _expire(self) -> None:
+        """关闭空闲超时的连接, 需持有锁调用"""
+        if self.idle_timeout <= 0:
+            return
+        now = time.monotonic()
+        # 队首为最久未使用的连接
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+            conn, _ = self._idle.popleft()
+            self._size -= 1
+            self.stats.expired += 1
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+class PooledConnection:
+    """连接池借出的连接, close 时归还连接池而非关闭 JDBC 连接"""
+
+    def __init__(self, pool: ConnectionPool, conn: Connection) -> None:
+        self._pool = pool
+        self._conn: Optional[Connection] = conn
+
+    @property
+    def connection(self) -> Connection:
+        if self._conn is None:
+            raise InterfaceError('Connection is closed')
+        return self._conn
+
+    @property
+    def closed(self) -> bool:
+        return self._conn is None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.connection, name)
+
+    def close(self) -> None:
+        """归还连接池"""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+    def commit(self) -> None:
+        self.connection.commit()
+
+    def rollback(self) -> None:
+        self.connection.rollback()
+
+    def ping(self, timeout: int = 2) -> bool:
+        return self._conn is not None and self._conn.ping(timeout)
+
+    def cursor(self, stream: bool = False) -> py4j_dbapi.Cursor:
+        return self.connection.cursor(stream=stream)
+
+
+class PoolManager:
+    """按 (jdbc_url, username, password, 连接参数) 管理连接池, row_factory 等参数不同的连接不会混用"""
+
+    def __init__(self) -> None:
+        self._pools: Dict[Tuple, Tuple[ConnectionPool, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get_pool(
+        self,
+        gateway: Union[JavaGateway, GatewayBalancer],
+        db_type: str,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        database: str,
+        pool_options: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> ConnectionPool:
+        """
+        获取连接池, 不存在时按 pool_options 创建并预先创建 min_size 个连接
+        已存在时 pool_options 须为空或与创建时相同, 否则抛出 ValueError
+        """
+        key = (py4j_dbapi.make_jdbc_url(db_type, host, port, database), username, password, _freeze(kwargs))
+        options = dict(pool_options or {})
+        with self._lock:
+            item = self._pools.get(key)
+            if item is not None:
+                pool, created_options = item
+                if options and options != created_options:
+                    raise ValueError(
+                        f'Pool for {username}@{key[0]} already exists with options {created_options}, got {options}'
+                    )
+                return pool
+            pool = ConnectionPool(
+                lambda: open_connection(gateway, db_type, host, port, username, password, database, **kwargs),
+                **options,
+            )
+            self._pools[key] = (pool, options)
+        pool.fill()
+        return pool
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """各连接池的计数器, 键为 username@jdbc_url, 有连接参数时附加在 ? 之后"""
+        with self._lock:
+            pools = [(key, pool) for key, (pool, _) in self._pools.items()]
+        result = {}
+        for (url, username, _, params), pool in pools:
+            name = f'{username}@{url}' + ('?' + '&'.join(f'{k}={v}' for k, v in params) if params else '')
+            # 仅密码不同的连接池名称相同, 追加序号区分
+            label, index = name, 1
+            while label in result:
+                index += 1
+                label = f'{name}#{index}'
+            result[label] = {**pool.stats.as_dict(), 'size': pool.size, 'idle': pool.idle}
+        return result
+
+    def dispose(self) -> None:
+        """关闭并移除所有连接池"""
+        with self._lock:
+            pools = [pool for pool, _ in self._pools.values()]
+            self._pools.clear()
+        for pool in pools:
+            pool.close()
+
+
+def _freeze(value: Any) -> Any:
+    """将连接参数转换为可哈希且与顺序无关的形式, 作为连接池的键"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(x) for x in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(map(repr, value)))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+POOL_MANAGER = PoolManager()
+
+
+def connect(
+    gateway: Union[JavaGateway, GatewayBalancer],
+    db_type: str,
+    host: str,
+    port: int,
+    username: str,
+    password: str,
+    database: str,
+    pool_options: Optional[Dict[str, Any]] = None,
+    **kwargs,
+) -> PooledConnection:
+    """从连接池获取数据库连接, 接口与 py4j_dbapi.connect 一致"""
+    pool = POOL_MANAGER.get_pool(gateway, db_type, host, port, username, password, database, pool_options, **kwargs)
+    return PooledConnection(pool, pool.acquire())
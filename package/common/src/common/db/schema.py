@@ -0,0 +1,154 @@
+# 表结构初始化与增量迁移
+# 以模型生成的 DDL 计算表结构指纹并记录在版本表中, 指纹未变化时跳过 create_all, 避免每次启动反射全部表
+
+__all__ = [
+    'SchemaManager',
+]
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select
+from sqlalchemy.engine import Connection, Dialect, Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+
+# 版本表不属于模型的 MetaData, 不计入指纹
+VERSION_METADATA = MetaData()
+SCHEMA_VERSION = Table(
+    'schema_version',
+    VERSION_METADATA,
+    Column('name', String(64), primary_key=True),
+    Column('fingerprint', String(64), nullable=False),
+    Column('updated_at', DateTime, nullable=False),
+)
+
+
+class SchemaManager:
+    def __init__(self, metadata: MetaData, name: str = 'default', workers: int = 1, migrate: bool = False) -> None:
+        """
+        :param metadata: 模型的 MetaData
+        :param name: 版本表中的记录名, 多个 MetaData 共用一个库时需区分
+        :param workers: 并行执行 DDL 的线程数, 无依赖关系的表同时创建, SQLite 始终串行
+        :param migrate: 增量迁移, 为已存在的表补充缺少的列与索引, 不修改或删除已有的列
+        """
+        self.metadata = metadata
+        self.name = name
+        self.workers = workers
+        self.migrate = migrate
+
+    @classmethod
+    def from_settings(cls, metadata: MetaData, settings: Dict[str, Any]) -> 'SchemaManager':
+        """根据 DB.schema 配置创建"""
+        return cls(metadata, workers=int(settings.get('workers', 1)), migrate=bool(settings.get('migrate', False)))
+
+    def fingerprint(self, dialect: Dialect) -> str:
+        """按表名排序拼接各表的建表与建索引语句, 返回 sha256 摘要"""
+        digest = hashlib.sha256()
+        for name in sorted(self.metadata.tables):
+            table = self.metadata.tables[name]
+            digest.update(str(CreateTable(table).compile(dialect=dialect)).encode('utf-8'))
+            for index in sorted(table.indexes, key=lambda x: x.name or ''):
+                digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode('utf-8'))
+        return digest.hexdigest()
+
+    def sync(self, engine: Engine, drop: bool = False, force: bool = False) -> bool:
+        """
+        同步表结构, workers > 1 时按依赖层级并行建表
+        :param drop: 先删除全部表
+        :param force: 忽略版本表中的指纹, 总是执行建表
+        :return: 是否执行了建表, 指纹未变化时为 False
+        """
+        if self.workers <= 1 or engine.dialect.name == 'sqlite':
+            with engine.begin() as conn:
+                return self.sync_connection(conn, drop, force)
+
+        fingerprint = self.fingerprint(engine.dialect)
+        with engine.begin() as conn:
+            if drop:
+                self.drop(conn)
+            elif not force and self._stored(conn) == fingerprint:
+                return False
+        with ThreadPoolExecutor(self.workers) as executor:
+            for tables in self._levels():
+                list(executor.map(lambda x: self._create_table(engine, x), tables))
+        with engine.begin() as conn:
+            if self.migrate:
+                self._migrate(conn)
+            self._store(conn, fingerprint)
+        return True
+
+    def sync_connection(self, conn: Connection, drop: bool = False, force: bool = False) -> bool:
+        """在同一连接中串行同步表结构, 参数同 sync, 供 AsyncConnection.run_sync 使用"""
+        fingerprint = self.fingerprint(conn.dialect)
+        if drop:
+            self.drop(conn)
+        elif not force and self._stored(conn) == fingerprint:
+            return False
+        self.metadata.create_all(conn)
+        if self.migrate:
+            self._migrate(conn)
+        self._store(conn, fingerprint)
+        return True
+
+    def drop(self, conn: Connection) -> None:
+        """删除全部表并清除版本记录"""
+        self.metadata.drop_all(conn)
+        SCHEMA_VERSION.create(conn, checkfirst=True)
+        conn.execute(SCHEMA_VERSION.delete().where(SCHEMA_VERSION.c.name == self.name))
+
+    def _stored(self, conn: Connection) -> Optional[str]:
+        """版本表中记录的指纹, 只检查版本表是否存在, 不反射模型的表"""
+        SCHEMA_VERSION.create(conn, checkfirst=True)
+        return conn.scalar(select(SCHEMA_VERSION.c.fingerprint).where(SCHEMA_VERSION.c.name == self.name))
+
+    def _store(self, conn: Connection, fingerprint: str) -> None:
+        """
+        先 UPDATE, 无记录时 INSERT; 多个实例同时启动时, INSERT 可能与其他实例冲突,
+        在保存点中执行, 冲突时回滚保存点并改为 UPDATE, 不影响外层事务
+        """
+        values = {'fingerprint': fingerprint, 'updated_at': datetime.now()}
+        update = SCHEMA_VERSION.update().where(SCHEMA_VERSION.c.name == self.name).values(values)
+        if conn.execute(update).rowcount:
+            return
+        try:
+            with conn.begin_nested():
+                conn.execute(SCHEMA_VERSION.insert().values(name=self.name, **values))
+        except IntegrityError:
+            conn.execute(update)
+
+    def _levels(self) -> List[List[Table]]:
+        """按外键依赖分层, 同一层的表互不依赖, 可并行创建"""
+        depth: Dict[Table, int] = {}
+        for table in self.metadata.sorted_tables:
+            parents = [
+                x.referred_table for x in table.foreign_key_constraints
+                if x.referred_table is not table and x.referred_table in depth
+            ]
+            depth[table] = max((depth[x] + 1 for x in parents), default=0)
+        levels: List[List[Table]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for table, level in depth.items():
+            levels[level].append(table)
+        return levels
+
+    @staticmethod
+    def _create_table(engine: Engine, table: Table) -> None:
+        with engine.begin() as conn:
+            table.create(conn, checkfirst=True)
+
+    def _migrate(self, conn: Connection) -> None:
+        """建表后执行, 为已存在的表补充模型中新增的列与索引"""
+        inspector = inspect(conn)
+        for table in self.metadata.sorted_tables:
+            columns = {x['name'] for x in inspector.get_columns(table.name, schema=table.schema)}
+            for column in table.columns:
+                if column.name not in columns:
+                    table_name = conn.dialect.identifier_preparer.format_table(table)
+                    column_ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                    conn.exec_driver_sql(f'ALTER TABLE {table_name} ADD COLUMN {column_ddl}')
+            indexes = {x['name'] for x in inspector.get_indexes(table.name, schema=table.schema)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(conn)
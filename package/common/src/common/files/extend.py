@@ -1,5 +1,6 @@
 __all__ = [
     "JsonFile",
+    "JsonLinesFile",
     "IniFile",
     "XmlFile",
     "YamlFile",
@@ -7,13 +8,13 @@ __all__ = [
 
 import json
 from configparser import ConfigParser
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 import yaml
 from defusedxml import ElementTree
 
 from .base import FileException, File
-from ..data.encoder import JsonEncoder
+from ..data.encoder import DEFAULT_BUFFER_SIZE, JsonStreamWriter, get_json_backend
 
 
 class JsonFile(File):
@@ -30,9 +31,53 @@ class JsonFile(File):
                 data = hook(data)
         return data
 
-    def dump(self, data: Dict[str, Any], encoding: str = "utf-8"):
+    def dump(self, data: Dict[str, Any], encoding: str = "utf-8", backend: Optional[str] = "json"):
+        # backend 为 JSON 编码后端, 见 get_json_backend, 为 None 时自动选择; DataFrame / ndarray 分块写入, 不缩进
+        with self.open("w", encoding=encoding) as fp:
+            get_json_backend(backend).dump(data, fp, indent=4)
+
+    def dump_stream(
+        self,
+        records: Iterable[Any],
+        encoding: str = "utf-8",
+        compact: bool = False,
+        backend: Optional[str] = "json",
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> int:
+        """
+        流式写入记录为 JSON 数组, records 可为生成器, 其中的 DataFrame 按行展开
+        :param compact: 紧凑格式, 不缩进且不含空白
+        :param buffer_size: 缓冲区大小 (字符数), 超过时写入文件
+        :return: 写入的记录数
+        """
         with self.open("w", encoding=encoding) as fp:
-            json.dump(data, fp, indent=4, cls=JsonEncoder)
+            with self._stream_writer(fp, get_json_backend(backend), compact, buffer_size) as writer:
+                return writer.write_many(records)
+
+    def _stream_writer(self, fp, backend, compact: bool, buffer_size: int) -> JsonStreamWriter:
+        return JsonStreamWriter(fp, backend, indent=None if compact else 4, buffer_size=buffer_size)
+
+
+class JsonLinesFile(JsonFile):
+    """JSON Lines 文件, 每行一条记录"""
+
+    ALLOWED_SUFFIX = (".jsonl", ".ndjson")
+
+    def load(
+        self, encoding: str = "utf-8", hook: Optional[Callable] = None
+    ) -> List[Any]:
+        with self.open("r", encoding=encoding) as fp:
+            data = [json.loads(line) for line in fp if line.strip()]
+
+        if hook:
+            data = hook(data)
+        return data
+
+    def dump(self, data: Iterable[Any], encoding: str = "utf-8", backend: Optional[str] = "json"):
+        self.dump_stream(data, encoding=encoding, backend=backend)
+
+    def _stream_writer(self, fp, backend, compact: bool, buffer_size: int) -> JsonStreamWriter:
+        return JsonStreamWriter(fp, backend, lines=True, buffer_size=buffer_size)
 
 
 class IniFile(File):
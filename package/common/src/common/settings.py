@@ -4,7 +4,8 @@ from pathlib import Path
 from typing import Any, Dict, Union
 
 from .configs import FileConfigsDict
-from .db.base import DataBase
+from .db.base import AsyncDataBase, DataBase
+from .db.py4j_gateway import GatewayBalancer
 from .files.extend import YamlFile
 from .loggers.extend import AgentLogger, ApiLogger, OperateLogger, RunLogger
 
@@ -66,6 +67,7 @@ class AppSettings:
         self.connectors_settings: Dict[str, Any] = self.app_configs.get('Connectors', {})
 
         self.services_settings: Dict[str, Any] = self.app_configs.get('Services', {})
+        self._gateway_map: Dict[str, GatewayBalancer] = {}
 
     def _load_loggers(self):
         for key, logger_cls in self.LOGGER_CLS_MAP.items():
@@ -84,7 +86,8 @@ class AppSettings:
             self.run_logger.warning('not url')
             return
 
-        self._db = DataBase(url=url)
+        db_cls = AsyncDataBase if self.db_settings.get('async', False) else DataBase
+        self._db = db_cls.from_settings(self.db_settings, self._logger_map.get('run'))
 
     @property
     def host(self) -> str:
@@ -111,8 +114,17 @@ class AppSettings:
         return self._logger_map['agent']
 
     @property
-    def db(self) -> DataBase:
+    def db(self) -> Union[DataBase, AsyncDataBase]:
         return self._db
 
+    def gateway(self, name: str) -> GatewayBalancer:
+        """Services.Py4jdbcAgentServer 下指定服务的网关负载均衡器, 首次使用时创建"""
+        if name not in self._gateway_map:
+            agent_settings = self.services_settings.get('Py4jdbcAgentServer', {})
+            if name not in agent_settings:
+                raise KeyError(f'Py4jdbcAgentServer not configured: {name}')
+            self._gateway_map[name] = GatewayBalancer.from_settings(agent_settings[name])
+        return self._gateway_map[name]
+
 
 APP_SETTINGS = AppSettings('default')
@@ -1,10 +1,13 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
 
+import numpy as np
+import pandas as pd
 import pytest
-from pandas import DataFrame
+from pandas import DataFrame, Series
 
 from common.data.converter import (
     ConvertException,
+    DatetimeCodec,
     DatetimeConverter,
     FloatConverter,
     ListConverter,
@@ -23,6 +26,19 @@ class TestFloatConverter:
     def test_to_int_default(self):
         assert FloatConverter.to_int("abc", default=0) == 0
 
+    def test_to_ints_success(self):
+        result = FloatConverter.to_ints(np.array([123.45, -1.5, 0.0]))
+        assert result.dtype == "int64"
+        assert result.tolist() == [123, -1, 0]
+
+    def test_to_ints_failure(self):
+        with pytest.raises(ConvertException):
+            FloatConverter.to_ints([1.0, "abc", float("inf")])
+
+    def test_to_ints_default(self):
+        assert FloatConverter.to_ints([1.5, "abc", None], default=0).tolist() == [1, 0, 0]
+        assert FloatConverter.to_ints([1.5, "abc"], default=None).tolist() == [1, pd.NA]
+
 
 class TestStringConvert:
     def test_to_int_success(self):
@@ -42,6 +58,49 @@ class TestStringConvert:
         with pytest.raises(ConvertException):
             StringConverter.to_datetime("invalid date")
 
+    def test_to_ints_exact(self):
+        data = ["9007199254740993", "a"]
+        assert StringConverter.to_ints(data, default=None).tolist() == [9007199254740993, pd.NA]
+        assert StringConverter.to_ints(np.array([2**62 + 1, 3])).tolist() == [2**62 + 1, 3]
+
+    def test_to_ints_same_as_int(self):
+        data = ["3.7", "1e3", " 12 ", "+5", "1_000", "9" * 20, 2.5, None]
+        expected = [StringConverter.to_int(x, default=None) for x in data]
+        expected[5] = None  # 超出 int64 范围
+        assert StringConverter.to_ints(data, default=None).tolist() == [pd.NA if x is None else x for x in expected]
+        assert StringConverter.to_ints(data[:5], default=None).tolist() == [pd.NA, pd.NA, 12, 5, 1000]
+
+    def test_to_ints_uint64(self):
+        # 超出 int64 但在 uint64 范围内的值同样按元素视为转换失败
+        assert StringConverter.to_ints(["18446744073709551615", "1"], default=None).tolist() == [pd.NA, 1]
+        data = np.array([2**64 - 1, 2**63 - 1], dtype=np.uint64)
+        assert FloatConverter.to_ints(data, default=0).tolist() == [0, 2**63 - 1]
+        with pytest.raises(ConvertException):
+            FloatConverter.to_ints(data)
+
+    def test_to_datetimes_success(self):
+        data = Series(["2023-10-01 12:34:56", "2023-10-02 00:00:00"], index=[3, 4])
+        result = StringConverter.to_datetimes(data)
+        assert result.index.tolist() == [3, 4]
+        assert result.tolist() == [datetime(2023, 10, 1, 12, 34, 56), datetime(2023, 10, 2)]
+
+    def test_to_datetimes_failure(self):
+        with pytest.raises(ConvertException):
+            StringConverter.to_datetimes(["2023-10-01 12:34:56", "invalid date"])
+
+    def test_to_datetimes_default(self):
+        default = datetime(2000, 1, 1)
+        data = ["01/10/2023 12:34:56", "invalid date", None]
+        result = StringConverter.to_datetimes(data, format="%d/%m/%Y %H:%M:%S", default=default)
+        assert result.tolist() == [datetime(2023, 10, 1, 12, 34, 56), default, default]
+
+    def test_to_datetimes_out_of_ns_range(self):
+        data = ["0001-01-01 00:00:00", "2023-10-02 00:00:00", "invalid date"]
+        result = StringConverter.to_datetimes(data, default=None)
+        expected = [StringConverter.to_datetime(x, default=None) for x in data]
+        assert result.tolist()[:2] == expected[:2]
+        assert result.isna().tolist() == [False, False, True]
+
     def test_to_datetime_custom_format(self):
         data = "01/10/2023 12:34:56"
         _format = "%d/%m/%Y %H:%M:%S"
@@ -77,6 +136,14 @@ class TestListConverter:
         result = ListConverter.to_dataframe(data, columns=columns)
         assert result.equals(expected)
 
+    def test_to_dataframe_with_dtype(self):
+        data = [(1, "a"), (2, "b")]
+        result = ListConverter.to_dataframe(data, columns=["x", "y"], dtype={"x": "int32"})
+        assert result.dtypes.tolist() == [np.dtype("int32"), np.dtype("O")]
+        array = np.zeros((2, 2), dtype="float32")
+        result = ListConverter.to_dataframe(array, dtype="float32")
+        assert np.shares_memory(result.to_numpy(), array)
+
 
 class TestDatetimeConverter:
     def test_to_string_default_format(self):
@@ -92,6 +159,67 @@ class TestDatetimeConverter:
         result = DatetimeConverter.to_string(data, format=_format)
         assert result == expected
 
+    def test_to_strings(self):
+        data = [datetime(2023, 10, 1, 12, 34, 56), None]
+        with pytest.raises(ConvertException):
+            DatetimeConverter.to_strings(data)
+        assert DatetimeConverter.to_strings(data, format="%d/%m/%Y", default="").tolist() == ["01/10/2023", ""]
+
+    def test_to_strings_rejects_strings(self):
+        data = ["2023-10-01", np.datetime64("2023-02-01"), datetime(2023, 1, 1)]
+        with pytest.raises(ConvertException):
+            DatetimeConverter.to_string(data[0])
+        result = DatetimeConverter.to_strings(data, format="%Y-%m-%d", default=None).tolist()
+        assert result == [None, "2023-02-01", "2023-01-01"]
+
+    def test_to_strings_out_of_ns_range(self):
+        data = [datetime(1, 1, 1), np.datetime64("0001-01-01T00:00:00"), datetime(2023, 1, 1)]
+        result = DatetimeConverter.to_strings(data).tolist()
+        assert result == [DatetimeConverter.to_string(datetime(1, 1, 1))] * 2 + ["2023-01-01 00:00:00"]
+
+
+class TestDatetimeCodec:
+    FORMATS = [
+        "%Y-%m-%d %H:%M:%S",
+        "%Y-%m-%dT%H:%M:%S",
+        "%Y-%m-%d",
+        "%Y-%m-%dT%H:%M:%S.%f%z",
+        "%d/%m/%Y %H:%M:%S",
+        "%Y%m%d%H%M%S",
+        "%b %d %Y %%",
+    ]
+    VALUES = [
+        datetime(2023, 10, 1, 12, 34, 56, 120000, tzinfo=timezone(timedelta(hours=8))),
+        datetime(999, 1, 2, 3, 4, 5, tzinfo=timezone(-timedelta(hours=3, minutes=30, seconds=15))),
+        datetime(2023, 1, 1),
+    ]
+
+    @pytest.mark.parametrize("fmt", FORMATS)
+    def test_same_as_strftime_strptime(self, fmt):
+        for value in self.VALUES:
+            text = value.strftime(fmt)
+            assert DatetimeCodec.format(value, fmt) == text
+            for data in (text, text.lower(), text.replace(" ", "  "), text + "0", text[:-1]):
+                try:
+                    expected = datetime.strptime(data, fmt)
+                except ValueError:
+                    with pytest.raises(ValueError):
+                        DatetimeCodec.parse(data, fmt)
+                    continue
+                result = DatetimeCodec.parse(data, fmt)
+                assert result == expected
+                assert result.tzinfo == expected.tzinfo
+
+    def test_iso_fallback(self):
+        # 不符合 ISO 快速路径的字符串按 strptime 的规则解析
+        assert DatetimeCodec.parse("2023-1-2 3:4:5") == datetime(2023, 1, 2, 3, 4, 5)
+        assert DatetimeCodec.parse("2023-01-02t03:04:05", "%Y-%m-%dT%H:%M:%S") == datetime(2023, 1, 2, 3, 4, 5)
+        with pytest.raises(ValueError):
+            DatetimeCodec.parse("2023-01-02T03:04:05")
+
+    def test_format_date(self):
+        assert DatetimeCodec.format(date(2023, 1, 2), "%Y/%m/%d %H") == "2023/01/02 00"
+
 
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,156 @@
+import enum
+from datetime import date, datetime
+from typing import Literal, Optional
+from uuid import UUID
+
+import pytest
+from pydantic import BaseModel, Field
+from sqlalchemy import Boolean, Column, Date, Enum, Integer, LargeBinary, Numeric, String, create_engine, func, select
+from sqlalchemy.orm import Session
+
+from common.data.dataset import (
+    Choice,
+    Constant,
+    DatasetGenerator,
+    DatetimeRange,
+    Normal,
+    Nullable,
+    Serial,
+    Text,
+    UniformInt,
+    Uuids,
+)
+from common.data.schemes import AddressModel
+from common.db.models import BaseModel as ModelBase
+from common.db.models import PKMixin, TimeAtMixin
+from common.files.extend import JsonLinesFile
+
+
+class Level(enum.Enum):
+    LOW = "low"
+    HIGH = "high"
+
+
+class Order(PKMixin, TimeAtMixin, ModelBase):
+    __tablename__ = "test_dataset_order"
+
+    no = Column(Integer, unique=True)
+    name = Column(String(12))
+    amount = Column(Numeric(10, 2))
+    paid = Column(Boolean)
+    day = Column(Date)
+    level = Column(Enum(Level))
+
+
+class Item(BaseModel):
+    count: int = Field(ge=1, le=5)
+    price: Optional[float] = Field(default=None, gt=0, lt=1)
+    code: str = Field(min_length=2, max_length=4)
+    kind: Literal["a", "b"]
+    level: Level
+
+
+class TestDatasetGenerator:
+    def test_orm_model(self):
+        generator = DatasetGenerator(Order, seed=1, chunk_size=4)
+        rows = list(generator.records(10))
+        assert len(rows) == 10
+        assert [x["no"] for x in rows] == list(range(1, 11))
+        assert all(isinstance(x["id"], UUID) and x["id"].version == 4 for x in rows)
+        assert all(8 <= len(x["name"]) <= 12 for x in rows)
+        assert all(round(x["amount"], 2) == x["amount"] for x in rows)
+        assert all(isinstance(x["day"], date) and isinstance(x["created_at"], datetime) for x in rows)
+        assert {type(x["paid"]) for x in rows} == {bool}
+        assert {x["level"] for x in rows} <= set(Level)
+
+    def test_seed(self):
+        first = list(DatasetGenerator(Order, seed=1, chunk_size=4).records(10))
+        assert first == list(DatasetGenerator(Order, seed=1, chunk_size=4).records(10))
+        assert first != list(DatasetGenerator(Order, seed=2, chunk_size=4).records(10))
+        assert DatasetGenerator(Order).seed != DatasetGenerator(Order).seed
+
+    def test_workers(self):
+        generator = DatasetGenerator(Order, seed=1, chunk_size=3)
+        assert list(generator.records(20, workers=2)) == list(generator.records(20))
+
+    def test_frames(self):
+        generator = DatasetGenerator(Order, seed=1, chunk_size=4, exclude=["id"])
+        frames = list(generator.frames(10))
+        assert [len(x) for x in frames] == [4, 4, 2]
+        assert frames[-1].index.tolist() == [8, 9]
+        assert "id" not in frames[0].columns
+        assert frames[1]["no"].tolist() == [5, 6, 7, 8]
+
+    def test_pydantic_model(self):
+        rows = list(DatasetGenerator(Item, seed=1, validate=True).records(200))
+        assert {x["count"] for x in rows} == {1, 2, 3, 4, 5}
+        assert all(0 < x["price"] < 1 for x in rows)
+        assert {len(x["code"]) for x in rows} == {2, 3, 4}
+        assert {x["kind"] for x in rows} == {"a", "b"}
+        assert {x["level"] for x in rows} == set(Level)
+
+    def test_min_length_only(self):
+        class Token(BaseModel):
+            value: str = Field(min_length=40)
+
+        rows = list(DatasetGenerator(Token, seed=1, validate=True).records(5))
+        assert all(len(x["value"]) == 40 for x in rows)
+
+    def test_validate(self):
+        columns = {"ip": Choice(["127.0.0.1", "::1"]), "port": UniformInt(1, 65535)}
+        rows = list(DatasetGenerator(AddressModel, columns, seed=1, validate=True).records(20))
+        assert {x["ip"] for x in rows} == {"127.0.0.1", "0000:0000:0000:0000:0000:0000:0000:0001"}
+
+    def test_columns(self):
+        columns = {
+            "no": Serial(100, 10),
+            "name": Nullable(Text(4, 4), rate=0.5),
+            "amount": Normal(50, 10, low=0, high=100, integer=True),
+            "paid": Constant(True),
+            "day": DatetimeRange(date(2024, 1, 1), date(2024, 1, 3)),
+            "level": Choice([Level.HIGH]),
+            "id": Uuids(sortable=True),
+            "created_at": lambda random, start, count: [datetime(2024, 1, 1)] * count,
+        }
+        rows = list(DatasetGenerator(Order, columns, seed=1).records(100))
+        assert [x["no"] for x in rows[:3]] == [100, 110, 120]
+        assert {len(x["name"]) for x in rows if x["name"] is not None} == {4}
+        assert 0 < sum(x["name"] is None for x in rows) < 100
+        assert all(isinstance(x["amount"], int) and 0 <= x["amount"] <= 100 for x in rows)
+        assert {x["day"] for x in rows} == {date(2024, 1, 1), date(2024, 1, 2)}
+        assert [x["id"] for x in rows] == sorted(x["id"] for x in rows)
+        assert {x["created_at"] for x in rows} == {datetime(2024, 1, 1)}
+
+    def test_invalid(self):
+        class Blob(ModelBase):
+            __tablename__ = "test_dataset_blob"
+
+            id = Column(Integer, primary_key=True)
+            data = Column(LargeBinary)
+
+        with pytest.raises(TypeError):
+            DatasetGenerator(Blob)
+        with pytest.raises(TypeError):
+            DatasetGenerator(dict)
+        with pytest.raises(KeyError):
+            DatasetGenerator(Order, {"unknown": Constant(1)})
+        assert list(DatasetGenerator(Blob, {"data": Constant(b"x")}, seed=1).records(1)) == [{"id": 1, "data": b"x"}]
+
+    def test_dump_jsonl(self, tmp_path):
+        path = tmp_path / "items.jsonl"
+        assert DatasetGenerator(Item, seed=1, chunk_size=7).dump_jsonl(path, 20) == 20
+        rows = JsonLinesFile(path).load()
+        assert len(rows) == 20
+
+    def test_bulk_insert(self):
+        engine = create_engine("sqlite://")
+        ModelBase.metadata.create_all(engine, tables=[Order.__table__])
+        with Session(engine) as session:
+            assert DatasetGenerator(Order, seed=1, chunk_size=50).bulk_insert(session, 120) == 120
+            assert session.scalar(select(func.count()).select_from(Order)) == 120
+            assert session.scalar(select(func.max(Order.no))) == 120
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    pytest.main()
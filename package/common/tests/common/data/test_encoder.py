@@ -0,0 +1,227 @@
+import io
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+import numpy as np
+import pytest
+import pandas as pd
+from pandas import DataFrame
+
+from common.data.encoder import (
+    JsonEncoder,
+    JsonStreamWriter,
+    OrjsonBackend,
+    StdJsonBackend,
+    encode_default,
+    get_json_backend,
+    iter_dataframe_records,
+)
+
+
+@dataclass
+class Point:
+    x: int
+
+
+PAYLOAD = {
+    "time": datetime(2023, 10, 1, 12, 34, 56, 789, tzinfo=timezone.utc),
+    "naive": datetime(2023, 10, 1),
+    "day": date(2023, 10, 1),
+    "decimal": Decimal("1.25"),
+    "uuid": UUID("12345678-1234-5678-1234-567812345678"),
+    "bytes": "中文".encode("utf-8"),
+    "numpy": [np.int64(3), np.int32(4), np.float64(1.5), np.float32(2.5), np.bool_(True)],
+    "frame": DataFrame({"a": [1, 2]}),
+    "point": Point(1),
+    "nested": [{"name": "中文", "value": None}, 1, 2.5, True],
+    1: "int key",
+}
+
+
+class TestJsonEncoder:
+    def test_default(self):
+        assert encode_default(datetime(2023, 10, 1)) == "2023-10-01 00:00:00"
+        assert encode_default(Decimal("1.5")) == 1.5
+        assert encode_default(np.int64(3)) == 3.0
+        assert encode_default(np.int32(3)) == 3
+        assert encode_default(np.bool_(False)) == "False"
+        assert encode_default(Point(1)) == "Point(x=1)"
+
+    @pytest.mark.parametrize("name", ["json", "orjson"])
+    def test_backend_same_values(self, name):
+        if name == "orjson":
+            pytest.importorskip("orjson")
+        expected = json.loads(json.dumps(PAYLOAD, cls=JsonEncoder))
+        backend = get_json_backend(name)
+        assert json.loads(backend.dumps(PAYLOAD)) == expected
+        assert json.loads(backend.dumps(PAYLOAD, indent=4)) == expected
+        assert json.loads(backend.dumpb(PAYLOAD)) == expected
+
+    def test_std_backend_output(self):
+        assert StdJsonBackend().dumps(PAYLOAD, indent=4) == json.dumps(PAYLOAD, indent=4, cls=JsonEncoder)
+
+    def test_ndarray(self):
+        assert json.loads(json.dumps({"a": np.arange(4).reshape(2, 2)}, cls=JsonEncoder)) == {"a": [[0, 1], [2, 3]]}
+
+    def test_get_backend(self):
+        assert isinstance(get_json_backend("json"), StdJsonBackend)
+        assert get_json_backend("json") is get_json_backend("json")
+        with pytest.raises(ValueError):
+            get_json_backend("unknown")
+        pytest.importorskip("orjson")
+        assert isinstance(get_json_backend(), OrjsonBackend)
+
+
+class TestIterencode:
+    FRAME = DataFrame(
+        {
+            "id": np.arange(7),
+            "value": np.linspace(0, 1, 7),
+            "name": list("abcdefg"),
+            "time": pd.date_range("2024-01-01", periods=7),
+            "count": pd.array([1, None, 3, 4, None, 6, 7], dtype="Int64"),
+            5: ["中文"] * 7,
+        },
+        index=list(range(10, 17)),
+    )
+
+    @pytest.mark.parametrize("name", ["json", "orjson"])
+    @pytest.mark.parametrize("orient", ["dict", "list", "split", "records"])
+    def test_dataframe(self, name, orient):
+        if name == "orjson":
+            pytest.importorskip("orjson")
+        backend = get_json_backend(name)
+        expected = json.loads(json.dumps(self.FRAME.to_dict(orient=orient), cls=JsonEncoder))
+        for chunk_size in (1, 3, 100):
+            chunks = list(backend.iterencode(self.FRAME, orient, chunk_size))
+            assert json.loads("".join(chunks)) == expected
+
+    def test_default_orient(self):
+        backend = get_json_backend("json")
+        expected = json.loads(json.dumps(self.FRAME, cls=JsonEncoder))
+        assert json.loads("".join(backend.iterencode(self.FRAME, chunk_size=2))) == expected
+
+    def test_nested(self):
+        backend = get_json_backend("json")
+        data = {"frame": self.FRAME.iloc[:2], "array": np.arange(6).reshape(3, 2), "items": [np.arange(3), 1], "x": 1}
+        result = json.loads("".join(backend.iterencode(data, "records", chunk_size=1)))
+        assert result["frame"] == json.loads(json.dumps(self.FRAME.iloc[:2].to_dict("records"), cls=JsonEncoder))
+        assert result["array"] == [[0, 1], [2, 3], [4, 5]]
+        assert result["items"] == [[0, 1, 2], 1]
+        assert result["x"] == 1
+
+    def test_empty(self):
+        backend = get_json_backend("json")
+        assert "".join(backend.iterencode(DataFrame(), "records")) == "[]"
+        assert "".join(backend.iterencode(np.array([]))) == "[]"
+        assert "".join(backend.iterencode(np.array(3))) == "3"
+        with pytest.raises(ValueError):
+            list(backend.iterencode(self.FRAME, "index"))
+
+    def test_duplicate_index(self):
+        # 重复的索引会输出重复的键, 与 to_dict("index") 一样抛出 ValueError
+        frame = DataFrame({"a": [1, 2]}, index=[1, 1])
+        with pytest.raises(ValueError):
+            list(get_json_backend("json").iterencode(frame))
+        assert json.loads("".join(get_json_backend("json").iterencode(frame, "records"))) == [{"a": 1}, {"a": 2}]
+
+    def test_compact(self):
+        frame = self.FRAME.drop(columns="time")
+        expected = json.dumps(frame.to_dict(), separators=(",", ":"), cls=JsonEncoder)
+        assert "".join(StdJsonBackend().iterencode(frame, chunk_size=3, compact=True)) == expected
+
+    @pytest.mark.parametrize("name", ["json", "orjson"])
+    def test_ensure_ascii(self, name):
+        if name == "orjson":
+            pytest.importorskip("orjson")
+        backend = get_json_backend(name)
+        frame = DataFrame({"中文": ["值"]})
+        # 键与值的转义方式与 dumps 一致
+        assert "".join(backend.iterencode(frame, "list", compact=True)) == backend.dumps({"中文": ["值"]}, compact=True)
+
+    @pytest.mark.parametrize("name", ["json", "orjson"])
+    def test_dump(self, name, monkeypatch):
+        if name == "orjson":
+            pytest.importorskip("orjson")
+        backend = get_json_backend(name)
+        expected = json.loads(json.dumps(self.FRAME, cls=JsonEncoder))
+        # DataFrame 分块写入, 不调用 to_dict
+        monkeypatch.setattr(DataFrame, "to_dict", None)
+        fp = io.StringIO()
+        backend.dump(self.FRAME, fp, indent=4)
+        assert json.loads(fp.getvalue()) == expected
+
+
+class TestJsonStreamWriter:
+    RECORDS = [{"id": 1, "tags": ["a", "b"], "time": datetime(2023, 10, 1)}, {"id": 2, "tags": [], "time": None}]
+
+    def write(self, records, **kwargs):
+        fp = io.StringIO()
+        with JsonStreamWriter(fp, **kwargs) as writer:
+            writer.write_many(records)
+        return fp.getvalue(), writer.count
+
+    def test_array(self):
+        output, count = self.write(iter(self.RECORDS))
+        assert count == 2
+        assert output == json.dumps(self.RECORDS, indent=4, cls=JsonEncoder)
+
+    def test_compact(self):
+        output, _ = self.write(self.RECORDS, indent=None)
+        assert output == json.dumps(self.RECORDS, separators=(",", ":"), cls=JsonEncoder)
+
+    def test_lines(self):
+        output, _ = self.write(self.RECORDS, lines=True)
+        assert output.splitlines() == [json.dumps(x, separators=(",", ":"), cls=JsonEncoder) for x in self.RECORDS]
+
+    @pytest.mark.parametrize("indent", [4, None])
+    def test_empty(self, indent):
+        assert self.write([], indent=indent)[0] == "[]"
+        assert self.write([], lines=True)[0] == ""
+
+    def test_buffer(self):
+        fp = io.StringIO()
+        writer = JsonStreamWriter(fp, indent=None, buffer_size=10)
+        writer.write({"id": 1})
+        assert fp.getvalue() == ""
+        writer.write({"id": 22})
+        assert fp.getvalue() == '[{"id":1},{"id":22}'
+        writer.close()
+        writer.close()
+        assert json.loads(fp.getvalue()) == [{"id": 1}, {"id": 22}]
+
+    @pytest.mark.parametrize("name", ["json", "orjson"])
+    def test_dataframe_chunks(self, name):
+        backend = pytest.importorskip(name) and get_json_backend(name)
+        frame = DataFrame({"a": [1, 2, 3], "b": pd.array([1, None, 3], dtype="Int64")})
+        chunks = (frame.iloc[i:i + 2] for i in range(0, 3, 2))
+        output, count = self.write(chunks, backend=backend, lines=True)
+        assert count == 3
+        assert [json.loads(x) for x in output.splitlines()] == frame.to_dict(orient="records")
+
+    @pytest.mark.parametrize("kwargs", [{}, {"indent": None}, {"lines": True}])
+    def test_write_dataframe(self, kwargs):
+        frame = DataFrame({"a": [1, 2]})
+        fp = io.StringIO()
+        with JsonStreamWriter(fp, **kwargs) as writer:
+            writer.write(frame)
+            writer.write(np.arange(3))
+            writer.write({"id": 1})
+        values = [{"a": {"0": 1, "1": 2}}, [0, 1, 2], {"id": 1}]
+        if kwargs.get("lines"):
+            assert [json.loads(x) for x in fp.getvalue().splitlines()] == values
+        else:
+            assert json.loads(fp.getvalue()) == values
+
+    def test_iter_dataframe_records(self):
+        frame = DataFrame({"a": range(5), "b": list("abcde")})
+        chunks = list(iter_dataframe_records(frame, 2))
+        assert [len(x) for x in chunks] == [2, 2, 1]
+        assert sum(chunks, []) == frame.to_dict(orient="records")
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -1,12 +1,19 @@
+import os
+import signal
+import threading
 import time
+from datetime import datetime, timezone
 from uuid import UUID
 
+import numpy as np
 import pytest
 
+from common.data import generator
 from common.data.generator import (
     RandomFloatGenerator,
     RandomIntGenerator,
     RandomStringGenerator,
+    SortableIdGenerator,
     UuidGenerator,
 )
 
@@ -17,6 +24,21 @@ class TestRandomIntGenerator:
         assert isinstance(result, int)
         assert 0 <= result <= 100
 
+    @pytest.mark.parametrize("secure", [True, False])
+    def test_by_range_array(self, secure):
+        result = RandomIntGenerator.by_range_array(10000, -3, 3, secure=secure)
+        assert result.dtype == np.int64
+        assert set(result.tolist()) == set(range(-3, 4))
+
+    def test_by_range_array_bounds(self):
+        result = RandomIntGenerator.by_range_array(100, -(1 << 63), (1 << 63) - 1)
+        assert len(set(result.tolist())) == 100
+        assert set(RandomIntGenerator.by_range_array(10, 5, 5).tolist()) == {5}
+        with pytest.raises(ValueError):
+            RandomIntGenerator.by_range_array(10, 1, 0)
+        with pytest.raises(ValueError):
+            RandomIntGenerator.by_range_array(10, 0, 1 << 63)
+
 
 class TestRandomFloatGenerator:
     def test_by_range(self):
@@ -24,6 +46,12 @@ class TestRandomFloatGenerator:
         assert isinstance(result, float)
         assert 0.0 <= result <= 100.0
 
+    @pytest.mark.parametrize("secure", [True, False])
+    def test_by_range_array(self, secure):
+        result = RandomFloatGenerator.by_range_array(10000, -1.0, 1.0, secure=secure)
+        assert result.dtype == np.float64
+        assert -1.0 <= result.min() < -0.9 and 0.9 < result.max() < 1.0
+
 
 class TestRandomStringGenerator:
     def test_by_length(self):
@@ -31,6 +59,15 @@ class TestRandomStringGenerator:
         assert isinstance(result, str)
         assert len(result) == 15
 
+    @pytest.mark.parametrize("secure", [True, False])
+    def test_by_length_many(self, secure):
+        result = RandomStringGenerator.by_length_many(1000, 12, secure=secure)
+        assert len(result) == len(set(result)) == 1000
+        assert all(isinstance(x, str) and len(x) == 12 for x in result)
+        assert set("".join(result)) == set(generator.ALPHABET)
+        assert RandomStringGenerator.by_length_many(2, 0) == ["", ""]
+        assert RandomStringGenerator.by_length_many(0, 5) == []
+
 
 class TestUuidGenerator:
     def test_uuid_generator_by_value(self):
@@ -47,5 +84,73 @@ class TestUuidGenerator:
         assert result != new_result
 
 
+class TestSortableIdGenerator:
+    def test_format(self):
+        result = UuidGenerator.by_sortable()
+        assert isinstance(result, UUID)
+        assert result.version == 7
+        assert result.variant == "specified in RFC 4122"
+        assert abs(SortableIdGenerator.timestamp(result) - datetime.now(timezone.utc)).total_seconds() < 1
+
+    def test_monotonic(self):
+        id_generator = SortableIdGenerator(node=1)
+        results = id_generator.batch(10000)
+        assert results == sorted(results)
+        assert len(set(results)) == len(results)
+        assert all((x.int >> 32) & 0xFFFF == 1 for x in results)
+        assert id_generator.next_bytes() > results[-1].bytes
+
+    def test_threads(self):
+        id_generator = SortableIdGenerator()
+        results = []
+
+        def work():
+            results.extend(id_generator.batch(2000))
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(set(results)) == 8000
+
+    def test_clock_backwards(self, monkeypatch):
+        now = [1_700_000_000_000_000_000]
+        monkeypatch.setattr(generator.time, "time_ns", lambda: now[0])
+        id_generator = SortableIdGenerator()
+        first = id_generator.next()
+        now[0] -= 5_000_000_000
+        second = id_generator.next()
+        assert second > first
+        assert SortableIdGenerator.timestamp(second) == SortableIdGenerator.timestamp(first)
+
+    def test_counter_overflow(self, monkeypatch):
+        monkeypatch.setattr(generator.time, "time_ns", lambda: 1_700_000_000_000_000_000)
+        id_generator = SortableIdGenerator()
+        id_generator.next()
+        id_generator._counter = (1 << SortableIdGenerator.COUNTER_BITS) - 1
+        result = id_generator.next()
+        assert result.int >> 80 == 1_700_000_000_001
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_fork_with_lock_held(self):
+        id_generator = SortableIdGenerator()
+        with id_generator._lock:
+            pid = os.fork()
+            if pid == 0:
+                id_generator.next()
+                os._exit(0)
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                assert os.waitstatus_to_exitcode(status) == 0
+                return
+            time.sleep(0.01)
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+        pytest.fail("child process deadlocked on the generator lock")
+
+
 if __name__ == "__main__":
     pytest.main()
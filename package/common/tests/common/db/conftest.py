@@ -0,0 +1,326 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from py4j.protocol import Py4JNetworkError
+
+from common.db.py4j_codec import BatchCodec
+
+# java.sql.Types 中的部分类型码
+SQL_TYPES = {
+    'BIT': -7,
+    'TINYINT': -6,
+    'BIGINT': -5,
+    'LONGVARBINARY': -4,
+    'VARBINARY': -3,
+    'BINARY': -2,
+    'LONGVARCHAR': -1,
+    'NULL': 0,
+    'CHAR': 1,
+    'NUMERIC': 2,
+    'DECIMAL': 3,
+    'INTEGER': 4,
+    'SMALLINT': 5,
+    'FLOAT': 6,
+    'REAL': 7,
+    'DOUBLE': 8,
+    'VARCHAR': 12,
+    'BOOLEAN': 16,
+    'DATE': 91,
+    'TIME': 92,
+    'TIMESTAMP': 93,
+    'OTHER': 1111,
+    'BLOB': 2004,
+    'CLOB': 2005,
+}
+
+# 测试用列定义: (列名, 类型名, 批量编码标记)
+COLUMNS = [
+    ('id', 'BIGINT', 'q'),
+    ('name', 'VARCHAR', 's'),
+    ('score', 'DOUBLE', 'd'),
+    ('active', 'BIT', '?'),
+    ('birthday', 'DATE', 'D'),
+    ('created_at', 'TIMESTAMP', 'T'),
+    ('amount', 'DECIMAL', 'N'),
+]
+
+
+def make_rows(count: int):
+    return [
+        (
+            i,
+            f'name-{i}' if i % 5 else None,
+            i * 0.5,
+            bool(i % 2),
+            date(2024, 1, 1 + i % 28),
+            datetime(2024, 1, 1, 12, 0, i % 60, 123000),
+            Decimal(f'{i}.25'),
+        )
+        for i in range(count)
+    ]
+
+
+class FakeGateway:
+    """本地替身网关, 模拟 JVM 侧 JDBC 对象并统计网关调用次数"""
+
+    def __init__(self, rows=None, columns=None):
+        self.rows = rows if rows is not None else make_rows(10)
+        self.columns = columns if columns is not None else COLUMNS
+        self.calls = 0
+        self.executed = []  # 批处理执行过的参数
+        self.jvm = FakeJvm(self)
+        self.entry_point = FakeAgent(self)
+
+    def call(self):
+        self.calls += 1
+
+
+class FakeField:
+    def __init__(self, name: str, value: int):
+        self._name = name
+        self._value = value
+
+    def getName(self):
+        return self._name
+
+    def getInt(self, obj):
+        return self._value
+
+
+class FakeTypesClass:
+    def getFields(self):
+        return [FakeField(k, v) for k, v in SQL_TYPES.items()]
+
+
+class FakeJvm:
+    def __init__(self, gateway: FakeGateway):
+        self._gateway = gateway
+        self.Class = self
+        self.java = self
+        self.sql = self
+        self.lang = self
+        self.util = self
+        self.DriverManager = self
+        self.Arrays = self
+
+    def __getattr__(self, name):
+        # java.lang.Integer 等类引用
+        return name
+
+    def forName(self, name):
+        self._gateway.call()
+        if name == 'java.sql.Types':
+            return FakeTypesClass()
+        return None
+
+    def getConnection(self, url, username, password):
+        self._gateway.call()
+        return FakeJConnection(self._gateway, url)
+
+    def toString(self, values):
+        self._gateway.call()
+        return '[' + ', '.join(str(x) for x in values) + ']'
+
+
+class FakeJConnection:
+    def __init__(self, gateway: FakeGateway, url: str):
+        self._gateway = gateway
+        self.url = url
+        self.closed = False
+        self.committed = 0
+        self.rolled_back = 0
+        self.statements = []
+
+    def setAutoCommit(self, value):
+        self._gateway.call()
+
+    def prepareStatement(self, sql):
+        self._gateway.call()
+        stmt = FakePreparedStatement(self._gateway, sql)
+        self.statements.append(stmt)
+        return stmt
+
+    def commit(self):
+        self._gateway.call()
+        self.committed += 1
+
+    def rollback(self):
+        self._gateway.call()
+        self.rolled_back += 1
+
+    def close(self):
+        self._gateway.call()
+        self.closed = True
+
+    def isValid(self, timeout):
+        self._gateway.call()
+        return not self.closed
+
+
+class FakePreparedStatement:
+    def __init__(self, gateway: FakeGateway, sql: str):
+        self._gateway = gateway
+        self.sql = sql
+        self.params = {}
+        self.batches = []
+        self.fetch_sizes = []
+        self.closed = False
+
+    def setObject(self, index, value):
+        self._gateway.call()
+        self.params[index] = value
+
+    def setFetchSize(self, size):
+        self._gateway.call()
+        self.fetch_sizes.append(size)
+
+    def addBatch(self):
+        self._gateway.call()
+        self.batches.append(tuple(self.params[i] for i in sorted(self.params)))
+
+    def executeBatch(self):
+        self._gateway.call()
+        counts = [1] * len(self.batches)
+        self._gateway.executed.extend(self.batches)
+        self.batches = []
+        return counts
+
+    def clearParameters(self):
+        self._gateway.call()
+        self.params.clear()
+
+    def execute(self):
+        self._gateway.call()
+        return self.sql.strip().upper().startswith('SELECT')
+
+    def getResultSet(self):
+        self._gateway.call()
+        return FakeResultSet(self._gateway)
+
+    def getUpdateCount(self):
+        self._gateway.call()
+        return 1
+
+    def close(self):
+        self._gateway.call()
+        self.closed = True
+
+
+class FakeResultSet:
+    def __init__(self, gateway: FakeGateway):
+        self._gateway = gateway
+        self.rows = gateway.rows
+        self.columns = gateway.columns
+        self.index = -1
+        self.closed = False
+
+    def getMetaData(self):
+        self._gateway.call()
+        return FakeMetaData(self._gateway, self.columns)
+
+    def next(self):
+        self._gateway.call()
+        self.index += 1
+        return self.index < len(self.rows)
+
+    def getObject(self, i):
+        self._gateway.call()
+        return self.rows[self.index][i - 1]
+
+    def getString(self, i):
+        self._gateway.call()
+        value = self.rows[self.index][i - 1]
+        return None if value is None else str(value)
+
+    def getBytes(self, i):
+        self._gateway.call()
+        value = self.rows[self.index][i - 1]
+        return None if value is None else bytes(value)
+
+    def close(self):
+        self._gateway.call()
+        self.closed = True
+
+
+class FakeMetaData:
+    def __init__(self, gateway: FakeGateway, columns):
+        self._gateway = gateway
+        self.columns = columns
+
+    def getColumnCount(self):
+        self._gateway.call()
+        return len(self.columns)
+
+    def getColumnName(self, i):
+        self._gateway.call()
+        return self.columns[i - 1][0]
+
+    def getColumnTypeName(self, i):
+        self._gateway.call()
+        return self.columns[i - 1][1]
+
+    def getColumnType(self, i):
+        self._gateway.call()
+        return SQL_TYPES[self.columns[i - 1][1]]
+
+    def getColumnDisplaySize(self, i):
+        self._gateway.call()
+        return 20
+
+    def getPrecision(self, i):
+        self._gateway.call()
+        return 10 if self.columns[i - 1][1] == 'DECIMAL' else 0
+
+    def getScale(self, i):
+        self._gateway.call()
+        return 2 if self.columns[i - 1][1] == 'DECIMAL' else 0
+
+    def isNullable(self, i):
+        self._gateway.call()
+        return 0 if i == 1 else 1
+
+
+class FakeAgent:
+    """Py4jdbcAgentServer 入口对象替身"""
+
+    def __init__(self, gateway: FakeGateway):
+        self._gateway = gateway
+
+    def fetchBatch(self, rs: FakeResultSet, size: int) -> bytes:
+        self._gateway.call()
+        start = rs.index + 1
+        batch = rs.rows[start:start + size]
+        rs.index = start + len(batch) - 1
+        return BatchCodec.encode_rows([c[2] for c in rs.columns], batch)
+
+    def executeBatch(self, stmt: FakePreparedStatement, buffer: bytes) -> int:
+        self._gateway.call()
+        rows = BatchCodec.decode_rows(buffer)
+        self._gateway.executed.extend(rows)
+        return len(rows)
+
+
+@pytest.fixture
+def gateway():
+    return FakeGateway()
+
+
+@pytest.fixture
+def gateway_factory():
+    """创建替身网关的函数, down 中的端口模拟网关进程不可用"""
+
+    def make(down=()):
+        def factory(host, port):
+            fake = FakeGateway()
+            if port in down:
+                fake.jvm.getConnection = _raise_network_error
+            return fake
+
+        return factory
+
+    return make
+
+
+def _raise_network_error(url, username, password):
+    raise Py4JNetworkError('An error occurred while trying to connect to the Java server')
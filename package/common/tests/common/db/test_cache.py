@@ -0,0 +1,142 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String, event, insert, select, update
+
+from common.db.base import AsyncDataBase, Base, DataBase
+from common.db.cache import MemoryCacheBackend, QueryCache
+
+
+class Author(Base):
+    __tablename__ = 'test_cache_author'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(32))
+
+
+class Book(Base):
+    __tablename__ = 'test_cache_book'
+
+    id = Column(Integer, primary_key=True)
+    author_id = Column(Integer, ForeignKey(Author.id))
+    title = Column(String(32))
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DataBase.from_settings({'url': f'sqlite:///{tmp_path / "cache.db"}', 'query_cache': {'ttl': 60}})
+    with db.engine.begin() as conn:
+        Base.metadata.create_all(conn, tables=[Author.__table__, Book.__table__])
+        conn.execute(insert(Author), [{'id': i, 'name': f'a{i}'} for i in range(3)])
+        conn.execute(insert(Book), [{'id': i, 'author_id': i % 3, 'title': f'b{i}'} for i in range(6)])
+    statements = []
+    event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    db.statements = statements
+    yield db
+    db.dispose()
+
+
+def names(session):
+    return session.scalars(select(Author.name).order_by(Author.id)).all()
+
+
+class TestQueryCache:
+    def test_hit(self, db):
+        with db.session() as session:
+            assert names(session) == ['a0', 'a1', 'a2']
+        with db.session() as session:
+            assert names(session) == ['a0', 'a1', 'a2']
+            author = session.scalars(select(Author).where(Author.id == 1)).one()
+            assert session.scalars(select(Author).where(Author.id == 1)).one() is author
+            assert session.scalars(select(Author).where(Author.id == 2)).one().name == 'a2'
+        assert len(db.statements) == 3
+        assert db.query_cache.stats.as_dict() == {'hits': 2, 'misses': 3, 'stores': 3, 'skips': 0, 'invalidations': 0}
+
+    def test_flush_invalidates(self, db):
+        with db.session() as session:
+            names(session)
+            books = session.scalars(select(Book.title).where(Book.author_id == 0)).all()
+            author = session.get(Author, 1)
+            author.name = 'new'
+            session.flush()
+            # 本事务已写入, 读到最新数据且不写入缓存
+            assert names(session) == ['a0', 'new', 'a2']
+            session.commit()
+            assert session.scalars(select(Book.title).where(Book.author_id == 0)).all() == books
+        with db.session() as session:
+            assert names(session) == ['a0', 'new', 'a2']
+        stats = db.query_cache.stats
+        assert stats.skips == 1
+        assert stats.hits == 1  # Book 的查询不受影响
+
+    def test_dml_invalidates(self, db):
+        with db.session() as session:
+            joined = select(Book.title).join(Author).where(Author.name == 'a1')
+            assert session.scalars(joined).all() == ['b1', 'b4']
+            session.execute(update(Author).where(Author.id == 1).values(name='x'))
+            session.commit()
+        with db.session() as session:
+            assert session.scalars(joined).all() == []
+        assert db.query_cache.stats.hits == 0
+
+    def test_rollback(self, db):
+        with db.session() as session:
+            session.add(Author(id=10, name='tmp'))
+            session.flush()
+            session.rollback()
+            assert names(session) == ['a0', 'a1', 'a2']
+            assert names(session) == ['a0', 'a1', 'a2']
+        assert db.query_cache.stats.hits == 1
+
+    def test_options(self, db):
+        with db.session() as session:
+            stmt = select(Author.name).execution_options(query_cache=False)
+            session.scalars(stmt).all()
+            session.scalars(stmt).all()
+            stmt = select(Author.id).execution_options(query_cache_ttl=0.01)
+            session.scalars(stmt).all()
+            time.sleep(0.02)
+            session.scalars(stmt).all()
+        assert db.query_cache.stats.hits == 0
+        assert len(db.statements) == 4
+
+    def test_async(self, tmp_path):
+        async def main():
+            db = AsyncDataBase(f'sqlite+aiosqlite:///{tmp_path / "async.db"}', query_cache=QueryCache())
+            await db.create()
+            async with db.session() as session:
+                session.add(Author(id=1, name='a'))
+                await session.commit()
+                for _ in range(2):
+                    assert (await session.scalars(select(Author.name))).all() == ['a']
+                await session.execute(update(Author).values(name='b'))
+                assert (await session.scalars(select(Author.name))).all() == ['b']
+            await db.dispose()
+            return db.query_cache.stats
+
+        stats = asyncio.run(main())
+        assert stats.hits == 1
+        assert stats.invalidations == 1
+
+
+class TestMemoryCacheBackend:
+    def test_lru(self):
+        backend = MemoryCacheBackend(max_size=2)
+        backend.set('a', 1, 60, ['t1'])
+        backend.set('b', 2, 60, ['t2'])
+        assert backend.get('a') == 1
+        backend.set('c', 3, 60, ['t1', 't2'])
+        assert backend.get('b') is None
+        assert backend.invalidate(['t1']) == 2
+        assert len(backend) == 0
+
+    def test_manual_invalidate(self):
+        cache = QueryCache()
+        cache.backend.set('a', 1, 60, ['t'])
+        assert cache.invalidate('t') == 1
+        assert cache.stats.invalidations == 1
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,126 @@
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import Column, Integer, String, create_engine, create_mock_engine, event, select
+from sqlalchemy.orm import Session
+
+from common.db.crud import CRUDRepository
+from common.db.models import BaseModel as ModelBase
+from common.db.models import PKMixin
+
+
+class User(ModelBase):
+    __tablename__ = 'test_crud_user'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(32))
+    score = Column(Integer, default=0)
+
+
+class Tag(PKMixin, ModelBase):
+    __tablename__ = 'test_crud_tag'
+
+    name = Column(String(32))
+
+
+class AddUser(BaseModel):
+    id: int
+    name: str
+    score: int = 0
+
+
+class SetUser(BaseModel):
+    id: int
+    name: Optional[str] = None
+    score: Optional[int] = None
+
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite://')
+    ModelBase.metadata.create_all(engine, tables=[User.__table__, Tag.__table__])
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    with Session(engine) as session:
+        session.statements = statements
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def repo():
+    return CRUDRepository[User, AddUser, SetUser](User, chunk_size=4)
+
+
+class TestCRUDRepository:
+    def test_bulk_insert(self, session, repo):
+        count = repo.bulk_insert(session, [AddUser(id=i, name=f'u{i}') for i in range(10)])
+        assert count == 10
+        assert len(session.statements) == 3
+        assert session.scalars(select(User.name).order_by(User.id)).all() == [f'u{i}' for i in range(10)]
+
+    def test_bulk_insert_defaults(self, session):
+        repo = CRUDRepository(Tag)
+        repo.bulk_insert(session, [{'name': 'a'}, {'name': 'b'}, {'name': 'c', 'unknown': 1}])
+        assert len(session.statements) == 1
+        ids = session.scalars(select(Tag.id).order_by(Tag.name)).all()
+        assert len(set(ids)) == 3
+        assert ids == sorted(ids)
+
+    def test_mixed_fields(self, session, repo):
+        repo.bulk_insert(session, [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b', 'score': 5}, {'name': 'c', 'id': 3}])
+        assert session.scalars(select(User.score).order_by(User.id)).all() == [0, 5, 0]
+
+    def test_upsert(self, session, repo):
+        repo.bulk_insert(session, [AddUser(id=i, name=f'u{i}', score=i) for i in range(3)])
+        count = repo.upsert(session, [{'id': 1, 'name': 'new'}, {'id': 5, 'name': 'u5'}])
+        assert count == 2
+        rows = session.execute(select(User.id, User.name, User.score).order_by(User.id)).all()
+        assert rows == [(0, 'u0', 0), (1, 'new', 1), (2, 'u2', 2), (5, 'u5', 0)]
+
+        repo.upsert(session, [{'id': 2, 'name': 'ignored'}], update_columns=[])
+        assert session.get(User, 2).name == 'u2'
+
+    def test_upsert_mysql_ignore(self, monkeypatch, repo):
+        engine = create_mock_engine('mysql://', lambda *args, **kwargs: None)
+        session = Session()
+        statements = []
+        monkeypatch.setattr(session, 'get_bind', lambda *args, **kwargs: engine)
+        monkeypatch.setattr(session, 'execute', lambda stmt: statements.append(stmt))
+        repo.upsert(session, [{'id': 2, 'name': 'ignored'}], update_columns=[])
+        sql = str(statements[0].compile(dialect=engine.dialect))
+        assert 'IGNORE' not in sql
+        assert sql.endswith('ON DUPLICATE KEY UPDATE id = test_crud_user.id')
+
+    def test_bulk_update(self, session, repo):
+        repo.bulk_insert(session, [AddUser(id=i, name=f'u{i}', score=i) for i in range(6)])
+        session.statements.clear()
+        count = repo.bulk_update(session, [SetUser(id=i, score=i * 10) for i in range(5)])
+        assert count == 5
+        assert len(session.statements) == 2
+        rows = session.execute(select(User.name, User.score).order_by(User.id)).all()
+        assert rows == [(f'u{i}', i * 10) for i in range(5)] + [('u5', 5)]
+
+        with pytest.raises(ValueError):
+            repo.bulk_update(session, [{'name': 'x'}])
+
+    def test_page(self, session, repo):
+        repo.bulk_insert(session, [AddUser(id=i, name=f'u{i}', score=i % 2) for i in range(10)])
+        items, after = repo.page(session, size=4)
+        assert [x.id for x in items] == [0, 1, 2, 3]
+        items, after = repo.page(session, size=4, after=after)
+        assert [x.id for x in items] == [4, 5, 6, 7]
+        pages = list(repo.iter_pages(session, size=2, where=[User.score == 1]))
+        assert [[x.id for x in page] for page in pages] == [[1, 3], [5, 7], [9]]
+        # 最后一页恰好取满时仍返回游标, 下一次请求返回空页
+        assert repo.page(session, size=5, after=4)[1] == 9
+        assert repo.page(session, size=5, after=9) == ([], None)
+
+    def test_add(self, session, repo):
+        user = repo.add(session, AddUser(id=1, name='a'))
+        assert repo.get(session, 1) is user
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+from sqlalchemy import Column, Integer, String, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.db.base import AsyncDataBase, Base, DataBase, RoutingSession, _make_timeout_listener
+
+
+class Item(Base):
+    __tablename__ = 'test_database_item'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(32))
+
+
+@pytest.fixture
+def urls(tmp_path):
+    return [f'sqlite:///{tmp_path / name}.db' for name in ('primary', 'replica-1', 'replica-2')]
+
+
+@pytest.fixture
+def db(urls):
+    db = DataBase(urls[0], replicas=urls[1:])
+    for engine in [db.engine, *db.replicas]:
+        with engine.begin() as conn:
+            Base.metadata.create_all(conn, tables=[Item.__table__])
+            conn.execute(insert(Item), [{'name': engine.url.database.rsplit('/', 1)[-1]}])
+    yield db
+    db.dispose()
+
+
+class TestDataBase:
+    def test_engine_options(self, urls):
+        db = DataBase.from_settings({'url': urls[0], 'pool_size': 3, 'max_overflow': 1, 'statement_timeout': 100})
+        assert db.engine.echo is False
+        assert db.engine.pool.size() == 3
+        assert db.engine_options == {
+            'echo': False,
+            'pool_pre_ping': True,
+            'pool_recycle': 3600,
+            'pool_size': 3,
+            'max_overflow': 1,
+        }
+        assert db.statement_timeout == 100
+        db.dispose()
+
+    def test_session(self, db):
+        with db.session() as session:
+            assert isinstance(session, RoutingSession)
+            assert not session.readonly
+            assert session.scalar(select(Item.name)) == 'primary.db'
+
+    def test_readonly(self, db):
+        names = []
+        for _ in range(3):
+            with db.session(readonly=True) as session:
+                names.append(session.scalar(select(Item.name)))
+                assert session.scalar(select(Item.name)) == names[-1]
+        assert names == ['replica-1.db', 'replica-2.db', 'replica-1.db']
+
+    def test_readonly_writes(self, db):
+        with db.session(readonly=True) as session:
+            session.add(Item(name='new'))
+            session.commit()
+            session.execute(text('SELECT 1'))
+        with db.session() as session:
+            assert session.scalars(select(Item.name)).all() == ['primary.db', 'new']
+
+    def test_no_replicas(self, urls):
+        db = DataBase(urls[0])
+        with db.session(readonly=True) as session:
+            assert not session.readonly
+            assert session.get_bind() is db.engine
+        db.dispose()
+
+    def test_timeout_listener(self):
+        executed = []
+
+        class FakeCursor:
+            def execute(self, sql):
+                executed.append(sql)
+
+            def close(self):
+                executed.append('close')
+
+        class FakeConnection:
+            def cursor(self):
+                return FakeCursor()
+
+            def commit(self):
+                executed.append('commit')
+
+        _make_timeout_listener('SET statement_timeout = 100')(FakeConnection(), None)
+        assert executed == ['SET statement_timeout = 100', 'close', 'commit']
+
+
+class TestAsyncDataBase:
+    def test_session(self, db, urls):
+        async def main():
+            async_urls = [x.replace('sqlite', 'sqlite+aiosqlite') for x in urls]
+            async_db = AsyncDataBase.from_settings({'url': async_urls[0], 'replicas': async_urls[1:2]})
+            async with async_db.session() as session:
+                assert isinstance(session, AsyncSession)
+                item = Item(name='async')
+                session.add(item)
+                await session.commit()
+            names = [item.name]  # expire_on_commit=False, 提交后访问属性不触发数据库 I/O
+            async with async_db.session(readonly=True) as session:
+                names.append(await session.scalar(select(Item.name)))
+            await async_db.dispose()
+            return names
+
+        assert asyncio.run(main()) == ['async', 'replica-1.db']
+
+    def test_lifecycle(self, tmp_path):
+        async def main():
+            async_db = AsyncDataBase(f'sqlite+aiosqlite:///{tmp_path / "async.db"}')
+            await async_db.init(drop=True)
+            async with async_db.session() as session:
+                count = len((await session.scalars(select(Item))).all())
+            await async_db.drop()
+            await async_db.dispose()
+            return count
+
+        assert asyncio.run(main()) == 0
+
+
+if __name__ == '__main__':
+    pytest.main()
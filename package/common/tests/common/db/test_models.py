@@ -0,0 +1,64 @@
+from uuid import UUID
+
+import pytest
+from sqlalchemy import Column, String, create_engine, select
+from sqlalchemy.orm import Session
+
+from common.db.models import BaseModel, ModelSerializer, PKMixin
+
+
+class Record(PKMixin, BaseModel):
+    __tablename__ = 'test_models_record'
+
+    name = Column(String(32))
+
+
+class TestPKMixin:
+    def test_binary_uuid(self):
+        engine = create_engine('sqlite://')
+        BaseModel.metadata.create_all(engine, tables=[Record.__table__])
+        with Session(engine) as session:
+            session.add_all([Record(name=str(i)) for i in range(100)])
+            session.commit()
+            records = session.scalars(select(Record).order_by(Record.id)).all()
+            assert [x.name for x in records] == [str(i) for i in range(100)]
+            assert all(isinstance(x.id, UUID) and x.id.version == 7 for x in records)
+            assert session.get(Record, records[0].id) is records[0]
+            assert session.scalar(select(Record.name).where(Record.id == str(records[1].id))) == '1'
+            raw = session.connection().exec_driver_sql('SELECT id FROM test_models_record LIMIT 1').scalar()
+            assert isinstance(raw, bytes) and len(raw) == 16
+
+
+class TestModelSerializer:
+    def test_cached(self):
+        assert Record.serializer() is Record.serializer()
+        assert Record.serializer(['name']) is Record.serializer(('name',))
+        assert Record.serializer(['name']) is not Record.serializer()
+
+    def test_convert(self):
+        records = [Record(id=i, name=f'r{i}') for i in range(3)]
+        serializer = Record.serializer(['id', 'name'])
+        assert Record.serializer().keys == ('name', 'id')  # 与 __table__.columns 的顺序一致
+        assert records[0].as_dict() == {'id': 0, 'name': 'r0'}
+        assert serializer.to_dicts(records) == [{'id': i, 'name': f'r{i}'} for i in range(3)]
+        assert serializer.to_tuples(records) == [(i, f'r{i}') for i in range(3)]
+        assert serializer.to_columns(records) == {'id': [0, 1, 2], 'name': ['r0', 'r1', 'r2']}
+        assert serializer.to_columns([]) == {'id': [], 'name': []}
+        assert Record.serializer(['name']).to_tuples(records) == [('r0',), ('r1',), ('r2',)]
+
+    def test_rows(self):
+        engine = create_engine('sqlite://')
+        BaseModel.metadata.create_all(engine, tables=[Record.__table__])
+        with Session(engine) as session:
+            session.add_all([Record(name=str(i)) for i in range(3)])
+            session.commit()
+            rows = session.execute(select(Record.__table__).order_by(Record.id)).all()
+            assert Record.serializer(['name']).to_dicts(rows) == [{'name': str(i)} for i in range(3)]
+
+    def test_unknown(self):
+        with pytest.raises(KeyError):
+            ModelSerializer(Record, ['missing'])
+
+
+if __name__ == '__main__':
+    pytest.main()
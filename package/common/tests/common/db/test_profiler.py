@@ -0,0 +1,131 @@
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String, insert, select, text
+from sqlalchemy.orm import relationship
+
+from common.db.base import Base, DataBase
+from common.db.profiler import START_TIME_KEY, QueryProfiler, StatementStats, normalize_sql
+
+
+class Team(Base):
+    __tablename__ = 'test_profiler_team'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(32))
+
+
+class Member(Base):
+    __tablename__ = 'test_profiler_member'
+
+    id = Column(Integer, primary_key=True)
+    team_id = Column(Integer, ForeignKey(Team.id))
+    team = relationship(Team)
+
+
+class FakeLogger:
+    def __init__(self):
+        self.messages = []
+
+    def warning(self, message, *args):
+        self.messages.append(message.format(*args))
+
+
+@pytest.fixture
+def logger():
+    return FakeLogger()
+
+
+@pytest.fixture
+def db(tmp_path, logger):
+    db = DataBase.from_settings(
+        {'url': f'sqlite:///{tmp_path / "profiler.db"}', 'profiler': {'n_plus_one': 3}, 'query_cache': {}}, logger
+    )
+    with db.engine.begin() as conn:
+        Base.metadata.create_all(conn, tables=[Team.__table__, Member.__table__])
+        conn.execute(insert(Team), [{'id': i, 'name': f't{i}'} for i in range(4)])
+        conn.execute(insert(Member), [{'id': i, 'team_id': i} for i in range(4)])
+    db.profiler.reset()
+    yield db
+    db.dispose()
+
+
+class TestQueryProfiler:
+    def test_snapshot(self, db):
+        with db.session() as session:
+            for i in range(2):
+                session.execute(select(Team.name).where(Team.id == i)).all()
+            session.execute(text('SELECT 1'))
+        snapshot = db.profiler.snapshot()
+        assert snapshot['slow_queries'] == 0
+        assert len(snapshot['statements']) == 2
+        stats = next(x for x in snapshot['statements'] if x['sql'].startswith('SELECT test_profiler_team.name'))
+        assert stats['sql'].endswith('WHERE test_profiler_team.id = ?')
+        assert stats['count'] == 2
+        assert sum(stats['histogram'].values()) == 2
+
+    def test_slow_query(self, db, logger):
+        db.profiler.slow_threshold = 0
+        with db.session() as session:
+            session.execute(text("SELECT 'a', 1"))
+        assert db.profiler.snapshot()['slow_queries'] == 1
+        assert logger.messages[0].startswith('slow query')
+        assert logger.messages[0].endswith('sql: SELECT ?, ?')
+
+    def test_n_plus_one(self, db, logger):
+        with db.session() as session:
+            for member in session.scalars(select(Member)).all():
+                assert member.team.name == f't{member.id}'
+        assert db.profiler.n_plus_one_queries == 1
+        assert len(logger.messages) == 1
+        assert logger.messages[0].startswith('N+1 query, executed 3 times in one session, sql: SELECT')
+        assert logger.messages[0].endswith('FROM test_profiler_team WHERE test_profiler_team.id = ?')
+
+    def test_error(self, db):
+        with db.engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(Exception):
+                    conn.execute(text('SELECT * FROM test_profiler_missing'))
+            assert not conn.info[START_TIME_KEY]
+
+    def test_affected_rows(self, db):
+        with db.engine.begin() as conn:
+            conn.execute(text("UPDATE test_profiler_team SET name = 'x' WHERE id < 3"))
+            conn.execute(select(Team)).all()
+        stats = {x['sql']: x['affected_rows'] for x in db.profiler.snapshot()['statements']}
+        assert stats['UPDATE test_profiler_team SET name = ? WHERE id < ?'] == 3
+        assert all(v == 0 for k, v in stats.items() if k.startswith('SELECT'))
+
+    def test_max_statements(self, db):
+        db.profiler.max_statements = 1
+        with db.session() as session:
+            session.execute(text('SELECT 1'))
+            session.execute(text('SELECT 1, 2 FROM test_profiler_team'))
+        assert {x['sql'] for x in db.profiler.snapshot()['statements']} == {'SELECT ?', '<other>'}
+
+    def test_normalize_sql(self):
+        assert normalize_sql("SELECT * FROM t1 WHERE a IN (?, ?)  AND b = 'x''y' AND c::int > 2.5") == (
+            'SELECT * FROM t1 WHERE a IN (?) AND b = ? AND c::int > ?'
+        )
+        assert normalize_sql('INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)') == 'INSERT INTO t (a, b) VALUES (?)'
+
+    def test_histogram(self):
+        stats = StatementStats()
+        for elapsed in (0.5, 1, 3, 6000):
+            stats.add(elapsed, 2)
+        result = stats.as_dict()
+        assert result['affected_rows'] == 8
+        assert result['max_ms'] == 6000
+        assert result['histogram']['<=1ms'] == 2
+        assert result['histogram']['<=5ms'] == 1
+        assert result['histogram']['>5000ms'] == 1
+
+    def test_without_cache(self, tmp_path):
+        profiler = QueryProfiler()
+        db = DataBase(f'sqlite:///{tmp_path / "plain.db"}', profiler=profiler)
+        with db.session() as session:
+            session.execute(text('SELECT 1'))
+        assert profiler.snapshot()['statements'][0]['count'] == 1
+        db.dispose()
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,279 @@
+from datetime import time
+
+import numpy as np
+import pytest
+
+from common.db import py4j_dbapi
+from common.db.py4j_codec import BatchCodec, CodecError
+
+
+def connect(gateway, **kwargs):
+    return py4j_dbapi.connect(gateway, 'mysql', 'localhost', 3306, 'root', '123456', 'test', **kwargs)
+
+
+class TestBatchCodec:
+    def test_round_trip(self, gateway):
+        tags = [c[2] for c in gateway.columns]
+        buffer = BatchCodec.encode_rows(tags, gateway.rows)
+        assert BatchCodec.decode_rows(buffer) == gateway.rows
+
+    def test_empty(self):
+        assert BatchCodec.decode_rows(BatchCodec.encode_rows(['q', 's'], [])) == []
+
+    def test_invalid(self):
+        with pytest.raises(CodecError):
+            BatchCodec.decode_rows(b'\x00\x00')
+
+
+class TestCursor:
+    def test_fetch_by_cell(self, gateway):
+        cursor = connect(gateway).cursor()
+        cursor.execute('SELECT * FROM t')
+        assert cursor.fetchone() == gateway.rows[0]
+        assert cursor.fetchmany(3) == gateway.rows[1:4]
+        assert cursor.fetchall() == gateway.rows[4:]
+        assert cursor.fetchone() is None
+
+    @pytest.mark.parametrize('batch_size', [1, 3, 10, 100])
+    def test_fetch_bulk(self, gateway, batch_size):
+        cursor = connect(gateway, bulk_fetch=True, fetch_batch_size=batch_size).cursor()
+        cursor.execute('SELECT * FROM t')
+        assert cursor.fetchone() == gateway.rows[0]
+        assert cursor.fetchmany(3) == gateway.rows[1:4]
+        assert cursor.fetchall() == gateway.rows[4:]
+        assert cursor.fetchone() is None
+
+    def test_fetch_bulk_calls(self, gateway):
+        gateway.rows = gateway.rows * 100
+        cursor = connect(gateway, bulk_fetch=True, fetch_batch_size=500).cursor()
+        cursor.execute('SELECT * FROM t')
+        calls = gateway.calls
+        assert len(cursor.fetchall()) == 1000
+        assert gateway.calls - calls == 3
+
+    def test_fetch_by_cell_calls(self, gateway):
+        cursor = connect(gateway).cursor()
+        cursor.execute('SELECT * FROM t')
+        cursor.fetchone()
+        calls = gateway.calls
+        cursor.fetchall()
+        assert gateway.calls - calls == 9 * (len(gateway.columns) + 1) + 1
+
+    def test_fetch_lob(self, gateway):
+        gateway.columns = [('data', 'BLOB', 'b'), ('text', 'CLOB', 's'), ('at', 'TIME', 's')]
+        gateway.rows = [(b'\x00\x01', 'long text', '12:30:00'), (None, None, None)]
+        cursor = connect(gateway).cursor()
+        cursor.execute('SELECT * FROM t')
+        assert cursor.fetchall() == [(b'\x00\x01', 'long text', time(12, 30)), (None, None, None)]
+
+
+class TestCursorMeta:
+    def test_description(self, gateway):
+        cursor = connect(gateway).cursor()
+        cursor.execute('SELECT * FROM t')
+        description = cursor.description
+        assert [x[0] for x in description] == [c[0] for c in gateway.columns]
+        assert description[0] == ('id', 'BIGINT', 20, None, 0, 0, False)
+        assert description[-1] == ('amount', 'DECIMAL', 20, None, 10, 2, True)
+
+        cursor.execute('UPDATE t SET name = ?', ['a'])
+        assert cursor.description is None
+
+    def test_meta_once(self, gateway):
+        conn = connect(gateway)
+        _ = conn.converter
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM t')
+        calls = gateway.calls
+        _ = cursor.description
+        cursor.fetchall()
+        # 取数期间不再访问 ResultSetMetaData: 每行 1 次 next + 每列 1 次取值, 以及结束时的 1 次 next
+        assert gateway.calls - calls == 10 * (len(gateway.columns) + 1) + 1
+
+    @pytest.mark.parametrize('kwargs', [{}, {'bulk_fetch': True, 'fetch_batch_size': 4}])
+    def test_row_factory(self, gateway, kwargs):
+        conn = connect(gateway, row_factory='namedtuple', **kwargs)
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM t')
+        row = cursor.fetchone()
+        assert row.id == 0 and row.amount == gateway.rows[0][6]
+        assert tuple(row) == gateway.rows[0]
+
+        cursor.row_factory = 'dict'
+        cursor.execute('SELECT * FROM t')
+        assert cursor.fetchmany(2)[1] == dict(zip([c[0] for c in gateway.columns], gateway.rows[1]))
+
+        cursor.row_factory = 'record'
+        cursor.execute('SELECT * FROM t')
+        rows = cursor.fetchall()
+        assert rows[3].name == 'name-3'
+        assert tuple(rows[3]) == gateway.rows[3]
+        assert not hasattr(rows[3], '__dict__')
+
+        cursor.row_factory = 'tuple'
+        cursor.execute('SELECT * FROM t')
+        assert list(cursor) == gateway.rows
+
+    def test_row_factory_rename(self, gateway):
+        gateway.columns = [('id', 'BIGINT', 'q'), ('count(*)', 'BIGINT', 'q'), ('id', 'BIGINT', 'q')]
+        gateway.rows = [(1, 2, 3)]
+        cursor = connect(gateway, row_factory='record').cursor()
+        cursor.execute('SELECT * FROM t')
+        assert cursor.fetchone().as_dict() == {'id': 1, '_1': 2, '_2': 3}
+
+    def test_row_factory_invalid(self, gateway):
+        cursor = connect(gateway, row_factory='list').cursor()
+        with pytest.raises(py4j_dbapi.ProgrammingError):
+            cursor.execute('SELECT * FROM t')
+        cursor.row_factory = 'tuple'
+        cursor.execute('SELECT * FROM t')
+        assert cursor.fetchone() == gateway.rows[0]
+
+
+class TestCursorColumns:
+    @pytest.mark.parametrize('kwargs', [{}, {'bulk_fetch': True, 'fetch_batch_size': 4}])
+    def test_fetch_arrays(self, gateway, kwargs):
+        cursor = connect(gateway, **kwargs).cursor()
+        cursor.execute('SELECT * FROM t')
+        arrays = cursor.fetch_arrays()
+        assert list(arrays) == [c[0] for c in gateway.columns]
+        assert arrays['id'].dtype == np.int64
+        assert arrays['id'].tolist() == [r[0] for r in gateway.rows]
+        assert arrays['score'].dtype == np.float64
+        assert arrays['active'].dtype == np.bool_
+        assert arrays['birthday'].dtype == np.dtype('datetime64[D]')
+        assert arrays['created_at'].dtype == np.dtype('datetime64[us]')
+        assert arrays['created_at'].tolist() == [r[5] for r in gateway.rows]
+        assert arrays['name'].tolist() == [r[1] for r in gateway.rows]
+        assert arrays['amount'].tolist() == [r[6] for r in gateway.rows]
+
+    @pytest.mark.parametrize('kwargs', [{}, {'bulk_fetch': True, 'fetch_batch_size': 3}])
+    def test_fetch_arrays_size(self, gateway, kwargs):
+        cursor = connect(gateway, **kwargs).cursor()
+        cursor.execute('SELECT * FROM t')
+        assert cursor.fetchone() == gateway.rows[0]
+        assert cursor.fetch_arrays(4)['id'].tolist() == [1, 2, 3, 4]
+        assert cursor.fetch_arrays()['id'].tolist() == [5, 6, 7, 8, 9]
+        assert len(cursor.fetch_arrays()['id']) == 0
+
+    @pytest.mark.parametrize('kwargs', [{}, {'bulk_fetch': True}])
+    def test_fetch_dataframe_nulls(self, gateway, kwargs):
+        gateway.rows = [(1, None, None, True), (None, 'a', 1.5, None)]
+        gateway.columns = gateway.columns[:4]
+        cursor = connect(gateway, **kwargs).cursor()
+        cursor.execute('SELECT * FROM t')
+        df = cursor.fetch_dataframe()
+        assert list(df.columns) == ['id', 'name', 'score', 'active']
+        assert str(df['id'].dtype) == 'Int64'
+        assert str(df['active'].dtype) == 'boolean'
+        assert df['id'].isna().tolist() == [False, True]
+        assert df['score'].isna().tolist() == [True, False]
+        assert df['name'].tolist() == [None, 'a']
+
+
+class TestExecuteMany:
+    def test_executemany(self, gateway):
+        conn = connect(gateway, execute_batch_size=4)
+        cursor = conn.cursor()
+        params = [(i, f'name-{i}') for i in range(10)]
+        calls = gateway.calls
+        cursor.executemany('INSERT INTO t (id, name) VALUES (?, ?)', params)
+        assert gateway.executed == params
+        assert cursor.rowcount == 10
+        # 每行 2 次 setObject + 1 次 addBatch, 每批 1 次 executeBatch + 1 次取计数, 以及 1 次 prepareStatement
+        assert gateway.calls - calls == 10 * 3 + 3 * 2 + 1
+
+    def test_executemany_bulk(self, gateway):
+        conn = connect(gateway, bulk_execute=True, execute_batch_size=4)
+        cursor = conn.cursor()
+        params = [row[:4] for row in gateway.rows]
+        calls = gateway.calls
+        cursor.executemany('INSERT INTO t (id, name, score, active) VALUES (?, ?, ?, ?)', params)
+        assert gateway.executed == params
+        assert cursor.rowcount == 10
+        assert gateway.calls - calls == 3 + 1
+
+    def test_executemany_invalid(self, gateway):
+        cursor = connect(gateway, bulk_execute=True).cursor()
+        with pytest.raises(py4j_dbapi.InterfaceError):
+            cursor.executemany('INSERT INTO t (id) VALUES (?)', [(2**70,)])
+
+    def test_infer_tags(self):
+        rows = [(1, 1, None, True, b'x', 'a'), (2, 2.5, None, False, bytearray(b'y'), 1)]
+        assert BatchCodec.infer_tags(rows) == ['q', 'd', 's', '?', 'b', 's']
+
+
+class TestStreamCursor:
+    def test_mysql_stream(self, gateway):
+        conn = connect(gateway, fetch_batch_size=4)
+        cursor = conn.cursor(stream=True)
+        cursor.execute('SELECT * FROM t')
+        assert [len(x) for x in cursor.iter_batches()] == [4, 4, 2]
+        cursor.execute('SELECT * FROM t')
+        assert list(cursor) == gateway.rows
+        cursor.close()
+        normal = conn.cursor()
+        normal.execute('SELECT * FROM t')
+        normal.close()
+        assert conn.j_connection.statements[0].fetch_sizes == [-(2**31), 0]
+
+    def test_fetch_size(self, gateway):
+        conn = py4j_dbapi.connect(gateway, 'gauss', 'localhost', 3306, 'root', '', 'test', fetch_batch_size=4)
+        cursor = conn.cursor(stream=True)
+        cursor.execute('SELECT * FROM t')
+        assert [len(x) for x in cursor.iter_batches(3)] == [3, 3, 3, 1]
+        assert conn.j_connection.statements[0].fetch_sizes == [4]
+
+
+class TestStatementCache:
+    def test_reuse_across_cursors(self, gateway):
+        conn = connect(gateway)
+        for _ in range(3):
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM t WHERE id = ?', [1])
+            cursor.fetchall()
+            cursor.close()
+        assert len(conn.j_connection.statements) == 1
+        stmt = conn.j_connection.statements[0]
+        assert not stmt.closed
+        assert stmt.params == {}
+        info = conn.statement_cache.info()
+        assert info['hits'] == 2
+        assert info['misses'] == 1
+        assert conn.statement_cache.hit_rate == pytest.approx(2 / 3)
+
+    def test_concurrent_cursors(self, gateway):
+        conn = connect(gateway)
+        cursor_a, cursor_b = conn.cursor(), conn.cursor()
+        cursor_a.execute('SELECT * FROM t')
+        cursor_b.execute('SELECT * FROM t')
+        assert cursor_a._prep_stmt is not cursor_b._prep_stmt
+        cursor_a.close()
+        cursor_b.close()
+        assert len(conn.statement_cache) == 1
+        assert [x.closed for x in conn.j_connection.statements] == [False, True]
+
+    def test_evict(self, gateway):
+        conn = connect(gateway, statement_cache_size=2)
+        cursor = conn.cursor()
+        for sql in ['SELECT 1', 'SELECT 2', 'SELECT 3', 'SELECT 1']:
+            cursor.execute(sql)
+        cursor.close()
+        statements = conn.j_connection.statements
+        assert [x.sql for x in statements] == ['SELECT 1', 'SELECT 2', 'SELECT 3', 'SELECT 1']
+        assert [x.closed for x in statements] == [True, True, False, False]
+        assert conn.statement_cache.evictions == 2
+        conn.close()
+        assert all(x.closed for x in statements)
+
+    def test_disabled(self, gateway):
+        conn = connect(gateway, statement_cache_size=0)
+        cursor = conn.cursor()
+        cursor.execute('SELECT 1')
+        cursor.execute('SELECT 1')
+        assert len(conn.j_connection.statements) == 2
+        assert conn.j_connection.statements[0].closed
+
+
+if __name__ == '__main__':
+    pytest.main()
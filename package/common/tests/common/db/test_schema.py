@@ -0,0 +1,100 @@
+import pytest
+from sqlalchemy import Column, ForeignKey, Index, Integer, MetaData, String, Table, create_engine, event, inspect
+
+from common.db.base import DataBase
+from common.db.schema import SchemaManager
+
+
+def make_metadata(extra: bool = False) -> MetaData:
+    metadata = MetaData()
+    Table('parent', metadata, Column('id', Integer, primary_key=True), Column('name', String(32)))
+    child = Table(
+        'child',
+        metadata,
+        Column('id', Integer, primary_key=True),
+        Column('parent_id', Integer, ForeignKey('parent.id')),
+    )
+    Table('other', metadata, Column('id', Integer, primary_key=True))
+    if extra:
+        child.append_column(Column('title', String(32), nullable=True))
+        Index('ix_child_title', child.c.title)
+    return metadata
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "schema.db"}')
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    engine.statements = statements
+    yield engine
+    engine.dispose()
+
+
+class TestSchemaManager:
+    def test_fingerprint(self, engine):
+        fingerprint = SchemaManager(make_metadata()).fingerprint(engine.dialect)
+        assert fingerprint == SchemaManager(make_metadata()).fingerprint(engine.dialect)
+        assert fingerprint != SchemaManager(make_metadata(extra=True)).fingerprint(engine.dialect)
+
+    def test_skip(self, engine):
+        manager = SchemaManager(make_metadata())
+        assert manager.sync(engine)
+        assert set(inspect(engine).get_table_names()) == {'parent', 'child', 'other', 'schema_version'}
+        engine.statements.clear()
+        assert not manager.sync(engine)
+        # 只检查版本表并读取指纹, 不反射模型的表
+        assert not any('parent' in x or 'child' in x for x in engine.statements)
+        assert manager.sync(engine, force=True)
+
+    def test_drop(self, engine):
+        manager = SchemaManager(make_metadata())
+        manager.sync(engine)
+        with engine.begin() as conn:
+            manager.drop(conn)
+        assert inspect(engine).get_table_names() == ['schema_version']
+        assert manager.sync(engine)
+        assert manager.sync(engine, drop=True)
+
+    def test_migrate(self, engine):
+        SchemaManager(make_metadata()).sync(engine)
+        assert SchemaManager(make_metadata(extra=True)).sync(engine)
+        assert 'title' not in {x['name'] for x in inspect(engine).get_columns('child')}
+
+        assert SchemaManager(make_metadata(extra=True), migrate=True).sync(engine, force=True)
+        inspector = inspect(engine)
+        assert 'title' in {x['name'] for x in inspector.get_columns('child')}
+        assert [x['name'] for x in inspector.get_indexes('child')] == ['ix_child_title']
+
+    def test_store_concurrent(self, engine):
+        # 模拟另一个实例在本实例 UPDATE 未命中之后、INSERT 之前写入了版本记录
+        manager = SchemaManager(make_metadata())
+
+        def insert_other(conn, cursor, statement, *args):
+            if statement.startswith('UPDATE schema_version') and not engine.inserted:
+                engine.inserted = True
+                conn.connection.cursor().execute("INSERT INTO schema_version VALUES ('default', 'other', '2024-01-01 00:00:00')")
+
+        engine.inserted = False
+        event.listen(engine, 'after_cursor_execute', insert_other)
+        assert manager.sync(engine)
+        assert engine.inserted
+        engine.statements.clear()
+        assert not manager.sync(engine)
+
+    def test_levels(self):
+        levels = SchemaManager(make_metadata(), workers=4)._levels()
+        assert [sorted(x.name for x in tables) for tables in levels] == [['other', 'parent'], ['child']]
+
+    def test_database(self, tmp_path):
+        db = DataBase(f'sqlite:///{tmp_path / "db.db"}', schema=SchemaManager(make_metadata()))
+        assert db.init()
+        assert not db.create()
+        assert db.init(drop=True)
+        db.drop()
+        assert db.create()
+        db.dispose()
+
+
+if __name__ == '__main__':
+    pytest.main()
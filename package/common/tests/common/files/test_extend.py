@@ -1,8 +1,12 @@
+import json
+from datetime import datetime
+from decimal import Decimal
 from pathlib import Path
 
 import pytest
+from pandas import DataFrame
 
-from common.files.extend import IniFile, JsonFile, YamlFile
+from common.files.extend import IniFile, JsonFile, JsonLinesFile, YamlFile
 
 CUR_DIR = Path(__file__).parent
 
@@ -37,6 +41,32 @@ class TestJsonFile:
 
         jf.remove()
 
+    @pytest.mark.parametrize("backend", ["json", "orjson", None])
+    def test_dump_backend(self, tmp_path, backend):
+        pytest.importorskip("orjson")
+        jf = JsonFile(tmp_path / "test.json")
+        data = {"key": "value", "time": datetime(2023, 10, 1, 12, 34, 56), "value": Decimal("1.5")}
+        jf.dump(data, backend=backend)
+        assert jf.load() == {"key": "value", "time": "2023-10-01 12:34:56", "value": 1.5}
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_dump_stream(self, tmp_path, compact):
+        jf = JsonFile(tmp_path / "test.json")
+        records = ({"id": i, "value": Decimal(i)} for i in range(5))
+        assert jf.dump_stream(records, compact=compact, buffer_size=16) == 5
+        with jf.open("r") as fp:
+            assert json.load(fp) == [{"id": i, "value": float(i)} for i in range(5)]
+
+
+class TestJsonLinesFile:
+    def test_base(self, tmp_path):
+        jf = JsonLinesFile(tmp_path / "test.jsonl")
+        frame = DataFrame({"id": [1, 2], "name": ["a", "b"]})
+        assert jf.dump_stream([frame, {"id": 3, "name": "c"}]) == 3
+        assert jf.load() == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 3, "name": "c"}]
+        jf.dump([{"id": 4}])
+        assert jf.load() == [{"id": 4}]
+
 
 class TestIniFile:
     def test_base(self):